@@ -0,0 +1,190 @@
+"""Admission control for backend jobs based on measured throughput.
+
+The controller tracks how much audio (seconds) and how many buffered bytes
+are waiting, plus the expected remaining work of running jobs, and learns
+the backend real-time factor (processing seconds per audio second) from
+finished jobs. ``check`` turns that into an estimated wait for a new job and
+refuses it up front when a queue cap is hit (429) or the job could not
+finish within the deadline (503), with a ``retry_after`` derived from how
+fast the queue is expected to drain.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+_RTF_ALPHA = 0.2
+
+
+@dataclass
+class Rejection:
+    status_code: int
+    message: str
+    retry_after: int
+
+
+class AdmissionRejected(Exception):
+    """Raised by the submitter when the controller refuses a job."""
+
+    def __init__(self, rejection: Rejection) -> None:
+        super().__init__(rejection.message)
+        self.rejection = rejection
+
+
+@dataclass
+class _Running:
+    started_at: float
+    expected_sec: float
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        *,
+        workers: int,
+        max_queued_audio_sec: float = 0.0,
+        max_queued_bytes: int = 0,
+        deadline_sec: float = 0.0,
+        initial_rtf: float = 0.5,
+        unknown_duration_sec: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.workers = max(1, int(workers))
+        self.max_queued_audio_sec = max(0.0, max_queued_audio_sec)
+        self.max_queued_bytes = max(0, int(max_queued_bytes))
+        self.deadline_sec = max(0.0, deadline_sec)
+        self.rtf = max(1e-3, initial_rtf)
+        self.rtf_samples = 0
+        self.unknown_duration_sec = unknown_duration_sec
+        self._clock = clock
+        self.queued_audio_sec = 0.0
+        self.queued_bytes = 0
+        self.queued_jobs = 0
+        self._running: dict[int, _Running] = {}
+        self.admitted = 0
+        self.rejected_429 = 0
+        self.rejected_503 = 0
+
+    # -- estimates --
+    def _duration(self, duration_sec: Optional[float]) -> float:
+        return duration_sec if duration_sec is not None and duration_sec > 0 else self.unknown_duration_sec
+
+    def _running_remaining(self) -> float:
+        now = self._clock()
+        return sum(max(0.0, r.expected_sec - (now - r.started_at)) for r in self._running.values())
+
+    def estimated_wait(self) -> float:
+        """Seconds before a job submitted now would start processing."""
+        if self.queued_jobs == 0 and len(self._running) < self.workers:
+            return 0.0
+        backlog = self.queued_audio_sec * self.rtf + self._running_remaining()
+        return backlog / self.workers
+
+    def remaining(self, job: Any) -> Optional[float]:
+        """Expected seconds left for a running job (None if it is not running)."""
+        running = self._running.get(id(job))
+        if running is None:
+            return None
+        return max(0.0, running.expected_sec - (self._clock() - running.started_at))
+
+    def eta(self, audio_ahead_sec: float, duration_sec: Optional[float]) -> float:
+        """Seconds until a queued job finishes, given the audio queued ahead of it."""
+        if audio_ahead_sec <= 0 and len(self._running) < self.workers:
+            start = 0.0
+        else:
+            start = (self._running_remaining() + audio_ahead_sec * self.rtf) / self.workers
+        return start + self._duration(duration_sec) * self.rtf
+
+    # -- decisions --
+    def check(self, duration_sec: Optional[float], nbytes: int) -> Optional[Rejection]:
+        """Return a Rejection if the job should not be queued, else None.
+
+        Nothing is refused while a worker is free, so a single long file
+        always gets a chance to run.
+        """
+        if self.queued_jobs == 0 and len(self._running) < self.workers:
+            return None
+        duration = self._duration(duration_sec)
+        wait = self.estimated_wait()
+
+        if self.max_queued_audio_sec and self.queued_audio_sec + duration > self.max_queued_audio_sec:
+            excess = self.queued_audio_sec + duration - self.max_queued_audio_sec
+            self.rejected_429 += 1
+            return Rejection(
+                429,
+                f"Too many queued requests: {self.queued_audio_sec:.0f}s of audio already waiting "
+                f"(limit {self.max_queued_audio_sec:.0f}s).",
+                # Queued audio only shrinks as running jobs finish and queued ones start
+                _ceil((self._running_remaining() + excess * self.rtf) / self.workers),
+            )
+        if self.max_queued_bytes and self.queued_bytes + nbytes > self.max_queued_bytes:
+            excess_fraction = (self.queued_bytes + nbytes - self.max_queued_bytes) / max(1, self.queued_bytes)
+            self.rejected_429 += 1
+            return Rejection(
+                429,
+                f"Too many queued requests: {self.queued_bytes / 1048576:.1f} MiB of audio already waiting "
+                f"(limit {self.max_queued_bytes / 1048576:.1f} MiB).",
+                _ceil(wait * min(1.0, excess_fraction)),
+            )
+        if self.deadline_sec:
+            finish = wait + duration * self.rtf
+            if finish > self.deadline_sec:
+                self.rejected_503 += 1
+                return Rejection(
+                    503,
+                    f"Backend busy: estimated completion in {finish:.1f}s exceeds the "
+                    f"{self.deadline_sec:.0f}s deadline.",
+                    _ceil(finish - self.deadline_sec),
+                )
+        return None
+
+    # -- bookkeeping (running jobs are keyed by id(job)) --
+    def enqueued(self, duration_sec: Optional[float], nbytes: int) -> None:
+        self.admitted += 1
+        self.queued_jobs += 1
+        self.queued_audio_sec += self._duration(duration_sec)
+        self.queued_bytes += nbytes
+
+    def dequeued(self, duration_sec: Optional[float], nbytes: int) -> None:
+        self.queued_jobs = max(0, self.queued_jobs - 1)
+        self.queued_audio_sec = max(0.0, self.queued_audio_sec - self._duration(duration_sec))
+        self.queued_bytes = max(0, self.queued_bytes - nbytes)
+
+    def started(self, job: Any, duration_sec: Optional[float]) -> None:
+        self._running[id(job)] = _Running(self._clock(), self._duration(duration_sec) * self.rtf)
+
+    def finished(self, job: Any, duration_sec: Optional[float], *, measure: bool) -> None:
+        """Forget a running job; with ``measure`` its elapsed time updates the RTF."""
+        running = self._running.pop(id(job), None)
+        if running is None or not measure or not duration_sec or duration_sec <= 0:
+            return
+        rtf = (self._clock() - running.started_at) / duration_sec
+        if self.rtf_samples == 0:
+            self.rtf = max(1e-3, rtf)
+        else:
+            self.rtf = max(1e-3, self.rtf + _RTF_ALPHA * (rtf - self.rtf))
+        self.rtf_samples += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "queued_jobs": self.queued_jobs,
+            "queued_audio_sec": round(self.queued_audio_sec, 1),
+            "queued_bytes": self.queued_bytes,
+            "running_jobs": len(self._running),
+            "estimated_wait_sec": round(self.estimated_wait(), 1),
+            "rtf": round(self.rtf, 4),
+            "rtf_samples": self.rtf_samples,
+            "max_queued_audio_sec": self.max_queued_audio_sec or None,
+            "max_queued_bytes": self.max_queued_bytes or None,
+            "deadline_sec": self.deadline_sec or None,
+            "admitted": self.admitted,
+            "rejected_429": self.rejected_429,
+            "rejected_503": self.rejected_503,
+        }
+
+
+def _ceil(seconds: float) -> int:
+    return max(1, int(math.ceil(seconds)))
@@ -0,0 +1,71 @@
+"""Cheap inspection of uploaded audio (no decoding)."""
+
+from __future__ import annotations
+
+import io
+import wave
+from typing import Optional
+
+# Bytes per second assumed for compressed containers whose duration cannot
+# be read from a header (~128 kbit/s, typical for mp3/m4a uploads).
+_COMPRESSED_BYTES_PER_SEC = 16000
+_PCM16_MONO_16K_BYTES_PER_SEC = 32000
+
+
+def sniff_format(data: bytes, filename: str = "") -> str:
+    """Identify an upload by its magic bytes.
+
+    Returns ``wav``, ``flac``, ``ogg``, ``webm``, ``mp4``, ``mpeg`` (MP3/ADTS),
+    ``pcm`` for headerless PCM16/16kHz/mono (only when named ``.raw`` and no
+    container signature or ID3 tag is present) or ``unknown``.
+    """
+    head = data[:16]
+    if head[:4] in (b"RIFF", b"RF64") and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    if head[:3] == b"ID3":
+        return "mpeg"
+    # Checked before the bare frame sync: PCM starting with a small negative
+    # sample (FF FF, FF F0, ...) would otherwise look like an MPEG frame
+    if (filename or "").lower().endswith(".raw"):
+        return "pcm"
+    if len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0:
+        return "mpeg"
+    return "unknown"
+
+
+def probe_duration_seconds(data: bytes, filename: str = "") -> Optional[float]:
+    """Estimate the duration of an upload in seconds.
+
+    WAV headers are read exactly, headerless ``.raw`` is taken as
+    PCM16/16kHz/mono and anything else is estimated from its size.
+    Returns None for empty input.
+    """
+    if not data:
+        return None
+    fmt = sniff_format(data, filename)
+    if fmt == "pcm":
+        return len(data) / _PCM16_MONO_16K_BYTES_PER_SEC
+    if fmt == "wav":
+        try:
+            with wave.open(io.BytesIO(data)) as wf:
+                rate = wf.getframerate()
+                if rate > 0:
+                    return wf.getnframes() / rate
+        except (wave.Error, EOFError):
+            pass
+    return len(data) / _COMPRESSED_BYTES_PER_SEC
+
+
+def estimate_duration_from_size(nbytes: Optional[int]) -> Optional[float]:
+    """Duration guess for streamed uploads from Content-Length, if known."""
+    if not nbytes or nbytes <= 0:
+        return None
+    return nbytes / _COMPRESSED_BYTES_PER_SEC
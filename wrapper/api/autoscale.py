@@ -0,0 +1,135 @@
+"""Sizing policy for the elastic backend worker pool.
+
+The pool runs between ``minimum`` and ``maximum`` workers. ``decide`` is
+called periodically with the queue depth and busy worker count and returns
+the new target:
+
+- grow by one while jobs are queued and every worker is busy, unless the
+  backend is known to be saturated at the next level;
+- shrink by one when the backend is saturated at the current level, or
+  when workers have been idle with an empty queue for ``idle_sec``.
+
+Saturation is judged from the per-job real-time factor (processing seconds
+per audio second) observed at each concurrency level: a level is saturated
+when running that many jobs at once processes less than ``min_gain`` more
+audio per second than one worker fewer did, i.e. per-job latency rose
+about as fast as concurrency. Observations older than ``memory_sec`` are
+ignored so the pool can probe again after the backend's load changes.
+Changes are at least ``cooldown_sec`` apart.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Optional
+
+
+class Autoscaler:
+    def __init__(
+        self,
+        *,
+        minimum: int,
+        maximum: int,
+        idle_sec: float = 30.0,
+        cooldown_sec: float = 5.0,
+        min_gain: float = 0.1,
+        memory_sec: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.minimum = self.maximum = self.target = 1
+        self.configure(minimum=minimum, maximum=maximum)
+        self.target = self.minimum
+        self.idle_sec = max(0.0, idle_sec)
+        self.cooldown_sec = max(0.0, cooldown_sec)
+        self.min_gain = max(0.0, min_gain)
+        self.memory_sec = max(1.0, memory_sec)
+        self._clock = clock
+        # Concurrency level -> (EWMA of per-job RTF, last update)
+        self._rtf: Dict[int, tuple[float, float]] = {}
+        self._last_change = float("-inf")
+        self._idle_since: Optional[float] = None
+        self.grown = 0
+        self.shrunk = 0
+        self.last_reason = ""
+
+    @property
+    def elastic(self) -> bool:
+        return self.minimum < self.maximum
+
+    def configure(self, *, minimum: Optional[int] = None, maximum: Optional[int] = None) -> None:
+        """Change the bounds; the target is clamped into them."""
+        lo = max(1, int(minimum if minimum is not None else self.minimum))
+        hi = max(1, int(maximum if maximum is not None else self.maximum))
+        if lo > hi:
+            raise ValueError(f"minimum ({lo}) exceeds maximum ({hi})")
+        self.minimum, self.maximum = lo, hi
+        self.target = min(hi, max(lo, self.target))
+
+    # -- observations --
+    def observe(self, rtf: float, concurrency: int) -> None:
+        """Record a finished job's real-time factor and how many jobs ran with it."""
+        if rtf <= 0 or concurrency < 1:
+            return
+        now = self._clock()
+        previous = self._fresh(concurrency, now)
+        self._rtf[concurrency] = (rtf if previous is None else previous * 0.7 + rtf * 0.3, now)
+
+    def _fresh(self, level: int, now: float) -> Optional[float]:
+        entry = self._rtf.get(level)
+        if entry is None or now - entry[1] > self.memory_sec:
+            return None
+        return entry[0]
+
+    def throughput(self, level: int) -> Optional[float]:
+        """Audio seconds processed per second with ``level`` jobs running (None if unknown)."""
+        rtf = self._fresh(level, self._clock())
+        return level / rtf if rtf else None
+
+    def saturated(self, level: int) -> bool:
+        if level <= 1:
+            return False
+        here, below = self.throughput(level), self.throughput(level - 1)
+        return here is not None and below is not None and here < below * (1.0 + self.min_gain)
+
+    # -- decisions --
+    def decide(self, queued: int, busy: int) -> int:
+        now = self._clock()
+        if queued == 0 and busy < self.target:
+            if self._idle_since is None:
+                self._idle_since = now
+        else:
+            self._idle_since = None
+        if now - self._last_change < self.cooldown_sec:
+            return self.target
+        if self.target > self.minimum and self.saturated(self.target):
+            return self._change(-1, "saturated", now)
+        if queued > 0 and busy >= self.target and self.target < self.maximum and not self.saturated(self.target + 1):
+            return self._change(1, "queue", now)
+        if self.target > self.minimum and self._idle_since is not None and now - self._idle_since >= self.idle_sec:
+            self._idle_since = now
+            return self._change(-1, "idle", now)
+        return self.target
+
+    def _change(self, step: int, reason: str, now: float) -> int:
+        self.target += step
+        if step > 0:
+            self.grown += 1
+        else:
+            self.shrunk += 1
+        self.last_reason = reason
+        self._last_change = now
+        return self.target
+
+    def snapshot(self) -> dict:
+        now = self._clock()
+        levels = sorted(level for level in self._rtf if self._fresh(level, now) is not None)
+        return {
+            "elastic": self.elastic,
+            "min": self.minimum,
+            "max": self.maximum,
+            "target": self.target,
+            "grown": self.grown,
+            "shrunk": self.shrunk,
+            "last_reason": self.last_reason or None,
+            "rtf_by_concurrency": {str(level): round(self._rtf[level][0], 4) for level in levels},
+        }
@@ -0,0 +1,468 @@
+"""Pre-warmed WebSocket sessions from the wrapper API to the backend.
+
+Opening ``/asr`` costs a handshake plus the backend's per-session setup
+(audio processor, FFmpeg pipe). The pool opens sessions ahead of time so a
+job can start streaming immediately. Backend sessions are single-use: once a
+job has sent EOF and received ``ready_to_stop`` the backend ends the stream,
+so connections are never returned to the pool; it refills in the background.
+
+Each endpoint is guarded by a circuit breaker. After ``failure_threshold``
+consecutive failures (refused or timed-out handshakes, sessions that fail or
+stay silent) it opens and jobs fail fast with ``BackendUnavailable`` instead
+of hanging on a dead or restarting backend. The router's prober checks the
+backend every ``probe_interval``; once it is back the endpoint is half-open
+and admits a single trial session, whose outcome closes or reopens the
+breaker.
+
+Checks use the backend launcher's ``GET /wrapper/health`` (200 once the
+model is loaded and warmed), which costs the backend nothing, unlike an
+``/asr`` handshake that sets up an audio processor. Backends without that
+route (started some other way) are checked with a handshake instead.
+
+A ``standby`` endpoint (a second, already warmed backend) only gets
+sessions when no active endpoint can take one, so a failed handshake on the
+active backend falls through to it within the same job. When an active
+endpoint's breaker opens, the two swap roles: the standby becomes active and
+the failed one, once restarted and recovered, is the new standby. A standby
+gets no trial sessions, so a successful probe closes its breaker directly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import websockets
+
+_MAX_RETRY_DELAY = 5.0
+_LATENCY_ALPHA = 0.3
+
+HEALTH_PATH = "/wrapper/health"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class BackendUnavailable(ConnectionError):
+    """No backend endpoint can take a session (breaker open or unreachable)."""
+
+    def __init__(self, message: str, retry_after: float = 1.0) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class PoolStats:
+    hits: int = 0
+    misses: int = 0
+    opened: int = 0
+    discarded: int = 0
+    failures: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class _IdleConnection:
+    ws: Any
+    opened_at: float
+
+
+def is_open(ws: Any) -> bool:
+    """Return True if the websocket still looks usable (legacy and new APIs)."""
+    if getattr(ws, "close_code", None) is not None:
+        return False
+    state = getattr(ws, "state", None)
+    if state is not None:
+        return getattr(state, "name", "OPEN") == "OPEN"
+    return bool(getattr(ws, "open", True))
+
+
+async def close_quietly(ws: Any) -> None:
+    try:
+        await ws.close()
+    except Exception:
+        pass
+
+
+def health_url(ws_url: str) -> str:
+    """The launcher's health route on the backend serving ``ws_url``."""
+    parts = urlsplit(ws_url)
+    return urlunsplit(("https" if parts.scheme == "wss" else "http", parts.netloc, HEALTH_PATH, "", ""))
+
+
+async def _http_status(url: str) -> int:
+    """Status code of a bare ``GET url`` (no body read)."""
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, parts.port or (443 if secure else 80), ssl=True if secure else None
+    )
+    try:
+        writer.write(f"GET {parts.path} HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: close\r\n\r\n".encode("ascii"))
+        await writer.drain()
+        status_line = await reader.readline()
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+    return int(status_line.split()[1])
+
+
+class BackendConnectionPool:
+    """Keep ``size`` idle backend sessions open and hand them out on demand."""
+
+    def __init__(
+        self,
+        url: str,
+        size: int,
+        *,
+        ping_interval: float = 10.0,
+        ping_timeout: float = 5.0,
+        max_idle_sec: float = 300.0,
+        connect_timeout: float = 10.0,
+    ) -> None:
+        self.url = url
+        self.size = max(0, int(size))
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.max_idle_sec = max_idle_sec
+        self.connect_timeout = connect_timeout
+        self.stats = PoolStats()
+        # EWMA of handshake and ping round-trip time in seconds
+        self.latency: Optional[float] = None
+        self._idle: Deque[_IdleConnection] = deque()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def _observe_latency(self, seconds: float) -> None:
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += _LATENCY_ALPHA * (seconds - self.latency)
+
+    def start(self) -> None:
+        if self.size <= 0 or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._maintain())
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        while self._idle:
+            await close_quietly(self._idle.popleft().ws)
+
+    async def connect(self) -> Any:
+        """Open a fresh session, bypassing the idle list."""
+        started = time.monotonic()
+        ws = await websockets.connect(self.url, open_timeout=self.connect_timeout)
+        self._observe_latency(time.monotonic() - started)
+        self.stats.opened += 1
+        return ws
+
+    async def acquire(self) -> Any:
+        """Return an open session; the caller owns it and must close it."""
+        now = time.monotonic()
+        while self._idle:
+            conn = self._idle.popleft()
+            self._wake.set()
+            if is_open(conn.ws) and now - conn.opened_at < self.max_idle_sec:
+                self.stats.hits += 1
+                return conn.ws
+            self.stats.discarded += 1
+            await close_quietly(conn.ws)
+        self.stats.misses += 1
+        return await self.connect()
+
+    async def _fill(self) -> None:
+        while len(self._idle) < self.size:
+            ws = await self.connect()
+            self._idle.append(_IdleConnection(ws=ws, opened_at=time.monotonic()))
+
+    async def _check_idle(self) -> None:
+        now = time.monotonic()
+        for conn in list(self._idle):
+            healthy = is_open(conn.ws) and now - conn.opened_at < self.max_idle_sec
+            if healthy:
+                try:
+                    started = time.monotonic()
+                    pong = await conn.ws.ping()
+                    await asyncio.wait_for(pong, timeout=self.ping_timeout)
+                    self._observe_latency(time.monotonic() - started)
+                except Exception:
+                    healthy = False
+            if not healthy and conn in self._idle:
+                self._idle.remove(conn)
+                self.stats.discarded += 1
+                await close_quietly(conn.ws)
+
+    async def _maintain(self) -> None:
+        delay = 0.0
+        while True:
+            try:
+                await self._fill()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.stats.failures += 1
+                delay = min(max(delay * 2, 0.5), _MAX_RETRY_DELAY)
+            else:
+                delay = 0.0
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay or self.ping_interval)
+            except asyncio.TimeoutError:
+                await self._check_idle()
+
+
+class BackendEndpoint:
+    """One backend instance: its session pool, load and breaker state."""
+
+    def __init__(self, url: str, pool: BackendConnectionPool, *, standby: bool = False) -> None:
+        self.url = url
+        self.pool = pool
+        self.standby = standby
+        self.in_flight = 0
+        self.state = CLOSED
+        self.jobs = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.opened = 0
+        self.opened_at: Optional[float] = None
+        # Half-open: a trial session is running, others are refused until it ends
+        self.trial = False
+        # Whether the backend serves HEALTH_PATH (None until the first check)
+        self.health_route: Optional[bool] = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.state == CLOSED
+
+    def admits(self) -> bool:
+        return self.state == CLOSED or (self.state == HALF_OPEN and not self.trial)
+
+    def mark_success(self) -> None:
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = None
+
+    def mark_failure(self, threshold: int) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= threshold:
+            if self.state != OPEN:
+                self.opened += 1
+                self.opened_at = time.monotonic()
+            self.state = OPEN
+
+    async def check(self, timeout: float) -> bool:
+        """True if the backend is up with its model warmed (health route, else a handshake)."""
+        if self.health_route is not False:
+            try:
+                status = await asyncio.wait_for(_http_status(health_url(self.url)), timeout)
+            except Exception:
+                return False
+            if status in (200, 503):
+                self.health_route = True
+                return status == 200
+            # 404 (or a plain WebSocket server's refusal): no launcher route
+            self.health_route = False
+        try:
+            ws = await asyncio.wait_for(self.pool.connect(), timeout=timeout)
+        except Exception:
+            return False
+        await close_quietly(ws)
+        return True
+
+    def snapshot(self) -> dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "standby": self.standby,
+            "state": self.state,
+            "in_flight": self.in_flight,
+            "jobs": self.jobs,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "open_sec": round(time.monotonic() - self.opened_at, 1) if self.opened_at is not None else None,
+            "latency_ms": round(self.pool.latency * 1000, 2) if self.pool.latency is not None else None,
+            "pool": {**self.pool.stats.as_dict(), "idle": self.pool.idle},
+        }
+
+
+class BackendRouter:
+    """Spread backend sessions over several endpoints by load.
+
+    ``least_inflight`` picks the endpoint with the fewest running jobs and
+    breaks ties on measured latency; ``latency`` does the reverse. Endpoints
+    whose breaker is open are skipped and re-added (half-open) once the
+    prober can connect again.
+    """
+
+    STRATEGIES = ("least_inflight", "latency")
+
+    def __init__(
+        self,
+        endpoints: list[BackendEndpoint],
+        *,
+        strategy: str = "least_inflight",
+        failure_threshold: int = 1,
+        probe_interval: float = 1.0,
+        probe_timeout: float = 2.0,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("at least one backend endpoint is required")
+        self.endpoints = endpoints
+        self.strategy = strategy if strategy in self.STRATEGIES else "least_inflight"
+        self.failure_threshold = max(1, failure_threshold)
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.rejected = 0
+        self.failovers = 0
+        self._task: Optional[asyncio.Task] = None
+        self._recovered = asyncio.Event()
+
+    def start(self) -> None:
+        for endpoint in self.endpoints:
+            endpoint.pool.start()
+        if self._task is None and self.probe_interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self._probe_loop())
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        for endpoint in self.endpoints:
+            await endpoint.pool.close()
+
+    def _sort_key(self, endpoint: BackendEndpoint) -> tuple:
+        latency = endpoint.pool.latency if endpoint.pool.latency is not None else float("inf")
+        if self.strategy == "latency":
+            return (endpoint.standby, latency, endpoint.in_flight)
+        return (endpoint.standby, endpoint.in_flight, latency)
+
+    def _mark_failure(self, endpoint: BackendEndpoint) -> None:
+        endpoint.mark_failure(self.failure_threshold)
+        if endpoint.state != OPEN or endpoint.standby:
+            return
+        replacement = next((ep for ep in self.endpoints if ep.standby and ep.admits()), None)
+        if replacement is not None:
+            replacement.standby = False
+            endpoint.standby = True
+            self.failovers += 1
+
+    def available(self) -> bool:
+        """True if some endpoint would take a session now."""
+        return any(ep.admits() for ep in self.endpoints)
+
+    def unavailable_error(self) -> BackendUnavailable:
+        self.rejected += 1
+        return BackendUnavailable("all backend endpoints are failing (circuit open)", retry_after=self.probe_interval)
+
+    async def acquire(self, *, wait: bool = False) -> tuple[BackendEndpoint, Any]:
+        """Pick an endpoint and open a session on it, failing over on errors.
+
+        Raises ``BackendUnavailable`` when every breaker is open, unless
+        ``wait`` is set: then it waits until the prober sees one recover.
+        """
+        tried: list[BackendEndpoint] = []
+        while True:
+            candidates = [ep for ep in self.endpoints if ep.admits() and ep not in tried]
+            if not candidates:
+                if tried or not wait:
+                    raise self.unavailable_error()
+                self._recovered.clear()
+                await self._recovered.wait()
+                continue
+            endpoint = min(candidates, key=self._sort_key)
+            if endpoint.state == HALF_OPEN:
+                endpoint.trial = True
+            try:
+                ws = await endpoint.pool.acquire()
+            except Exception as exc:
+                endpoint.trial = False
+                self._mark_failure(endpoint)
+                tried.append(endpoint)
+                if len(tried) == len(self.endpoints):
+                    raise BackendUnavailable(f"backend unreachable: {exc}", retry_after=self.probe_interval) from exc
+                continue
+            endpoint.in_flight += 1
+            endpoint.jobs += 1
+            return endpoint, ws
+
+    def release(self, endpoint: BackendEndpoint, *, failed: Optional[bool] = False) -> None:
+        """Return a session's slot; ``failed=None`` (job cancelled) leaves the breaker as it is."""
+        endpoint.in_flight = max(0, endpoint.in_flight - 1)
+        endpoint.trial = False
+        if failed is None:
+            return
+        if failed:
+            self._mark_failure(endpoint)
+        else:
+            endpoint.mark_success()
+            self._recovered.set()
+
+    def snapshot(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "failure_threshold": self.failure_threshold,
+            "rejected": self.rejected,
+            "failovers": self.failovers,
+            "endpoints": [ep.snapshot() for ep in self.endpoints],
+        }
+
+    async def _probe(self, endpoint: BackendEndpoint) -> None:
+        if not await endpoint.check(self.probe_timeout):
+            return
+        if endpoint.state != OPEN:
+            return
+        if endpoint.standby:
+            # A standby gets no trial jobs while an active endpoint serves
+            endpoint.mark_success()
+        else:
+            # Being up does not prove the backend transcribes: let one job through
+            endpoint.state = HALF_OPEN
+        self._recovered.set()
+
+    async def _probe_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            opened = [ep for ep in self.endpoints if ep.state == OPEN]
+            if opened:
+                await asyncio.gather(*(self._probe(ep) for ep in opened), return_exceptions=True)
+
+
+def parse_endpoint_urls(raw: str, *, scheme: str = "ws") -> list[str]:
+    """Parse a comma/whitespace separated list of ``host:port`` or ws URLs."""
+    urls: list[str] = []
+    for entry in raw.replace(",", " ").split():
+        if "://" not in entry:
+            entry = f"{scheme}://{entry}"
+        scheme_sep = entry.index("://") + 3
+        if "/" not in entry[scheme_sep:]:
+            entry = f"{entry}/asr"
+        if entry not in urls:
+            urls.append(entry)
+    return urls
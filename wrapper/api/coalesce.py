@@ -0,0 +1,92 @@
+"""Single-flight coalescing of identical concurrent backend jobs.
+
+A client retry storm can deliver the same file many times within seconds.
+Submissions that carry the same key (audio hash + backend configuration, see
+``server._prepare_upload``) while one is still queued or running attach to
+that ``Flight`` instead of becoming backend jobs of their own. Each caller
+then renders the shared ``(texts, lines)`` in its own response format.
+
+A flight counts its waiters so that one caller giving up (disconnect,
+timeout, cancelled async job) does not cancel the work for the others; the
+server cancels the backend job only when the last waiter leaves. Snapshot
+listeners (``stream=true``) are fanned out, and a late joiner first gets the
+latest snapshot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+SnapshotListener = Callable[[List[dict]], None]
+
+
+class Flight:
+    __slots__ = ("key", "job", "future", "waiters", "listeners", "last_snapshot")
+
+    def __init__(self, key: str, job: Any, future: asyncio.Future) -> None:
+        self.key = key
+        self.job = job
+        self.future = future
+        self.waiters = 0
+        self.listeners: List[SnapshotListener] = []
+        self.last_snapshot: Optional[List[dict]] = None
+
+    def publish(self, snapshot: List[dict]) -> None:
+        self.last_snapshot = snapshot
+        for listener in tuple(self.listeners):
+            listener(snapshot)
+
+    def subscribe(self, listener: SnapshotListener) -> None:
+        self.listeners.append(listener)
+        if self.last_snapshot is not None:
+            listener(self.last_snapshot)
+
+    def unsubscribe(self, listener: SnapshotListener) -> None:
+        try:
+            self.listeners.remove(listener)
+        except ValueError:
+            pass
+
+
+class SingleFlight:
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._flights: Dict[str, Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def join(self, key: Optional[str]) -> Optional[Flight]:
+        """The unfinished flight for ``key``, counted as a coalesced submission."""
+        if not self.enabled or key is None:
+            return None
+        flight = self._flights.get(key)
+        if flight is None or flight.future.done():
+            return None
+        self.coalesced += 1
+        return flight
+
+    def lead(self, key: Optional[str], job: Any, future: asyncio.Future) -> Optional[Flight]:
+        """Register a new flight for ``key`` (None when coalescing does not apply)."""
+        if not self.enabled or key is None:
+            return None
+        flight = Flight(key, job, future)
+        self._flights[key] = flight
+        self.leaders += 1
+        future.add_done_callback(lambda _f: self._land(flight))
+        return flight
+
+    def _land(self, flight: Flight) -> None:
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,283 @@
+"""Decode uploads to PCM16 / 16 kHz / mono inside the API process.
+
+WAV (PCM 8/16/24/32-bit, float 32/64, WAVE_FORMAT_EXTENSIBLE, any rate and
+channel count) is parsed here and FLAC goes through ``soundfile`` when it is
+installed. Downmixing and resampling are vectorized with numpy
+(``scipy.signal.resample_poly`` when scipy is available). Anything else is
+handed to ``FFmpegPool``, which runs a bounded number of FFmpeg processes
+through asyncio so the event loop never blocks on a decoder.
+
+The common case (16-bit mono 16 kHz WAV) is returned without conversion.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import struct
+from dataclasses import dataclass
+from typing import Optional
+
+from .audio import sniff_format
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy comes with the backend stack
+    np = None  # type: ignore[assignment]
+
+try:
+    from scipy.signal import resample_poly as _resample_poly
+except ImportError:
+    _resample_poly = None
+
+try:
+    import soundfile as _soundfile
+except Exception:  # ImportError, or OSError when libsndfile is missing
+    _soundfile = None
+
+TARGET_RATE = 16000
+# Formats this module decodes itself (the rest needs FFmpeg)
+IN_PROCESS_FORMATS = ("pcm", "wav", "flac")
+# Work above this size is moved off the event loop
+_THREAD_THRESHOLD = 1 << 20
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class DecodeError(Exception):
+    """The audio could not be decoded."""
+
+
+class NeedsFFmpeg(DecodeError):
+    """The format (or this variant of it) is not handled in-process."""
+
+
+class FFmpegNotFound(DecodeError):
+    pass
+
+
+@dataclass
+class DecodedAudio:
+    pcm: bytes
+    source_format: str
+    # passthrough (already 16k mono s16), inprocess or ffmpeg
+    path: str
+
+    @property
+    def duration_sec(self) -> float:
+        return len(self.pcm) / (2 * TARGET_RATE)
+
+
+# -- WAV --
+def _parse_wav(data: bytes) -> tuple[int, int, int, int, memoryview]:
+    """Return (format_tag, channels, rate, bits, sample data) of a RIFF/WAVE file."""
+    view = memoryview(data)
+    pos = 12
+    fmt: Optional[tuple[int, int, int, int]] = None
+    while pos + 8 <= len(data):
+        chunk_id = bytes(view[pos : pos + 4])
+        (size,) = struct.unpack_from("<I", data, pos + 4)
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            if size < 16:
+                raise DecodeError("WAV fmt chunk too short")
+            tag, channels, rate, _byte_rate, _align, bits = struct.unpack_from("<HHIIHH", data, body)
+            if tag == _WAVE_FORMAT_EXTENSIBLE and size >= 40:
+                (tag,) = struct.unpack_from("<H", data, body + 24)
+            fmt = (tag, channels, rate, bits)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise DecodeError("WAV data chunk before fmt chunk")
+            # Streaming writers leave 0 / 0xFFFFFFFF sizes; trust the file length
+            end = len(data) if size in (0, 0xFFFFFFFF) else min(len(data), body + size)
+            return (*fmt, view[body:end])
+        pos = body + size + (size & 1)
+    raise DecodeError("WAV file has no data chunk")
+
+
+def _wav_samples(tag: int, bits: int, raw: memoryview):
+    """Interleaved samples as float32 in [-1, 1]."""
+    if tag == _WAVE_FORMAT_PCM:
+        if bits == 16:
+            return np.frombuffer(raw, dtype="<i2", count=len(raw) // 2).astype(np.float32) / 32768.0
+        if bits == 8:
+            return (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+        if bits == 24:
+            b = np.frombuffer(raw, dtype=np.uint8, count=len(raw) // 3 * 3).reshape(-1, 3).astype(np.int32)
+            ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+            ints = np.where(ints >= 1 << 23, ints - (1 << 24), ints)
+            return ints.astype(np.float32) / float(1 << 23)
+        if bits == 32:
+            return np.frombuffer(raw, dtype="<i4", count=len(raw) // 4).astype(np.float32) / float(1 << 31)
+    if tag == _WAVE_FORMAT_IEEE_FLOAT:
+        if bits == 32:
+            return np.frombuffer(raw, dtype="<f4", count=len(raw) // 4).astype(np.float32)
+        if bits == 64:
+            return np.frombuffer(raw, dtype="<f8", count=len(raw) // 8).astype(np.float32)
+    raise NeedsFFmpeg(f"unsupported WAV encoding (format {tag:#06x}, {bits} bits)")
+
+
+def decode_wav(data: bytes) -> bytes:
+    tag, channels, rate, bits, raw = _parse_wav(data)
+    if channels <= 0 or rate <= 0:
+        raise DecodeError("WAV header has no channels or sample rate")
+    if tag == _WAVE_FORMAT_PCM and bits == 16 and channels == 1 and rate == TARGET_RATE:
+        return bytes(raw[: len(raw) // 2 * 2])
+    if np is None:
+        raise NeedsFFmpeg("numpy is not installed")
+    samples = _wav_samples(tag, bits, raw)
+    frames = len(samples) // channels
+    return to_pcm16_mono_16k(samples[: frames * channels].reshape(frames, channels), rate)
+
+
+# -- FLAC --
+def decode_flac(data: bytes) -> bytes:
+    if _soundfile is None or np is None:
+        raise NeedsFFmpeg("soundfile is not installed")
+    import io
+
+    try:
+        samples, rate = _soundfile.read(io.BytesIO(data), dtype="float32", always_2d=True)
+    except Exception as exc:  # soundfile raises RuntimeError/LibsndfileError
+        raise DecodeError(f"FLAC decode failed: {exc}") from exc
+    return to_pcm16_mono_16k(samples, rate)
+
+
+# -- conversion --
+def _box_smooth(x, width: int):
+    """Moving average of ``width`` samples via a cumulative sum (O(n))."""
+    if width <= 1:
+        return x
+    csum = np.cumsum(np.concatenate(([0.0], x.astype(np.float64))))
+    out = (csum[width:] - csum[:-width]) / width
+    pad = width - 1
+    return np.concatenate((np.full(pad // 2, out[0]), out, np.full(pad - pad // 2, out[-1]))).astype(np.float32)
+
+
+def resample(x, rate: int, target: int = TARGET_RATE):
+    """Resample a mono float32 signal from ``rate`` to ``target``."""
+    if rate == target or len(x) == 0:
+        return x
+    if _resample_poly is not None:
+        g = math.gcd(rate, target)
+        return _resample_poly(x, target // g, rate // g).astype(np.float32)
+    if rate > target:
+        # Two box passes (triangular kernel) as a cheap anti-alias filter
+        width = int(round(rate / target))
+        x = _box_smooth(_box_smooth(x, width), width)
+    n_out = int(len(x) * target / rate)
+    positions = np.arange(n_out, dtype=np.float64) * (rate / target)
+    return np.interp(positions, np.arange(len(x), dtype=np.float64), x).astype(np.float32)
+
+
+def to_pcm16_mono_16k(samples, rate: int) -> bytes:
+    """Downmix ``(frames, channels)`` float samples and resample to 16 kHz s16le."""
+    mono = samples.mean(axis=1, dtype=np.float32) if samples.ndim == 2 and samples.shape[1] > 1 else samples.reshape(-1)
+    mono = resample(mono.astype(np.float32, copy=False), int(rate))
+    return (np.clip(mono, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+
+
+def decode_in_process(data: bytes, fmt: str) -> bytes:
+    if fmt == "pcm":
+        return data[: len(data) // 2 * 2]
+    if fmt == "wav":
+        return decode_wav(data)
+    if fmt == "flac":
+        return decode_flac(data)
+    raise NeedsFFmpeg(f"{fmt} is decoded with FFmpeg")
+
+
+# -- FFmpeg --
+class FFmpegPool:
+    """Run at most ``max_procs`` FFmpeg conversions at once via asyncio.
+
+    FFmpeg is one-shot per input, so the pool bounds concurrency rather than
+    reusing processes; callers beyond the limit wait their turn.
+    """
+
+    def __init__(self, max_procs: int = 2, binary: str = "ffmpeg") -> None:
+        self.max_procs = max(1, int(max_procs))
+        self.binary = binary
+        self._sem: Optional[asyncio.Semaphore] = None
+        self.active = 0
+        self.conversions = 0
+        self.failures = 0
+
+    async def convert(self, data: bytes) -> bytes:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_procs)
+        async with self._sem:
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    self.binary,
+                    "-nostdin", "-hide_banner", "-loglevel", "error",
+                    "-i", "pipe:0",
+                    "-f", "s16le", "-ac", "1", "-ar", str(TARGET_RATE),
+                    "pipe:1",
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            except FileNotFoundError as exc:
+                raise FFmpegNotFound("ffmpeg is not installed or not in PATH") from exc
+            self.active += 1
+            try:
+                out, err = await proc.communicate(data)
+            except BaseException:
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+                raise
+            finally:
+                self.active -= 1
+            if proc.returncode != 0:
+                self.failures += 1
+                raise DecodeError(err.decode("utf-8", errors="replace").strip() or "ffmpeg failed")
+            self.conversions += 1
+            return out
+
+    def snapshot(self) -> dict:
+        return {
+            "max_procs": self.max_procs,
+            "active": self.active,
+            "conversions": self.conversions,
+            "failures": self.failures,
+        }
+
+
+async def decode_to_pcm16(
+    data: bytes,
+    filename: str = "",
+    ffmpeg: Optional[FFmpegPool] = None,
+) -> DecodedAudio:
+    """Decode ``data`` to PCM16/16kHz/mono, in-process when possible.
+
+    Without ``ffmpeg`` only in-process formats are accepted (``NeedsFFmpeg``
+    otherwise, ``DecodeError`` for input the in-process decoder rejects).
+    """
+    fmt = sniff_format(data, filename)
+    if fmt in IN_PROCESS_FORMATS:
+        try:
+            if len(data) >= _THREAD_THRESHOLD:
+                pcm = await asyncio.to_thread(decode_in_process, data, fmt)
+            else:
+                pcm = decode_in_process(data, fmt)
+            passthrough = fmt == "pcm" or (fmt == "wav" and _is_target_wav(data))
+            return DecodedAudio(pcm, fmt, "passthrough" if passthrough else "inprocess")
+        except DecodeError:
+            # Unsupported variant or malformed header: let FFmpeg have a go
+            if ffmpeg is None:
+                raise
+    if ffmpeg is None:
+        raise NeedsFFmpeg(f"{fmt} is decoded with FFmpeg")
+    return DecodedAudio(await ffmpeg.convert(data), fmt, "ffmpeg")
+
+
+def _is_target_wav(data: bytes) -> bool:
+    try:
+        tag, channels, rate, bits, _raw = _parse_wav(data)
+    except (DecodeError, struct.error):
+        return False
+    return tag == _WAVE_FORMAT_PCM and channels == 1 and rate == TARGET_RATE and bits == 16
@@ -0,0 +1,82 @@
+"""Frame sizing and timing bookkeeping for audio sent to the backend."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+class AdaptiveFrameSizer:
+    """Pick the next WebSocket frame size from how long the last send took.
+
+    ``ws.send`` returns as soon as the frame is buffered unless the write
+    buffer is above its high-water mark, in which case it waits for the
+    socket to drain. A fast send therefore means the backend keeps up and
+    larger frames save per-message overhead; a slow send means backpressure,
+    so frames shrink to keep latency per frame bounded.
+    """
+
+    def __init__(
+        self,
+        initial: int = 3200,
+        minimum: int = 3200,
+        maximum: int = 65536,
+        *,
+        fast_sec: float = 0.002,
+        slow_sec: float = 0.05,
+    ) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.size = min(self.maximum, max(self.minimum, initial))
+        self.fast_sec = fast_sec
+        self.slow_sec = slow_sec
+        self.bytes_sent = 0
+        self.frames = 0
+        self.peak = self.size
+
+    def observe(self, nbytes: int, elapsed: float) -> None:
+        self.bytes_sent += nbytes
+        self.frames += 1
+        if elapsed >= self.slow_sec:
+            self.size = max(self.minimum, self.size // 2)
+        elif elapsed <= self.fast_sec and nbytes >= self.size:
+            self.size = min(self.maximum, self.size * 2)
+            self.peak = max(self.peak, self.size)
+
+
+@dataclass
+class StreamTimings:
+    """Per-mode aggregates of send duration and time-to-first-snapshot."""
+
+    jobs: int = 0
+    send_sec_total: float = 0.0
+    first_snapshot_jobs: int = 0
+    first_snapshot_sec_total: float = 0.0
+    frames_total: int = 0
+    last_send_sec: Optional[float] = None
+    last_first_snapshot_sec: Optional[float] = None
+
+    def record(self, send_sec: float, first_snapshot_sec: Optional[float], frames: int) -> None:
+        self.jobs += 1
+        self.send_sec_total += send_sec
+        self.frames_total += frames
+        self.last_send_sec = send_sec
+        self.last_first_snapshot_sec = first_snapshot_sec
+        if first_snapshot_sec is not None:
+            self.first_snapshot_jobs += 1
+            self.first_snapshot_sec_total += first_snapshot_sec
+
+    def as_dict(self) -> dict:
+        return {
+            "jobs": self.jobs,
+            "avg_send_sec": round(self.send_sec_total / self.jobs, 4) if self.jobs else None,
+            "avg_first_snapshot_sec": (
+                round(self.first_snapshot_sec_total / self.first_snapshot_jobs, 4)
+                if self.first_snapshot_jobs else None
+            ),
+            "avg_frames": round(self.frames_total / self.jobs, 1) if self.jobs else None,
+            "last_send_sec": round(self.last_send_sec, 4) if self.last_send_sec is not None else None,
+            "last_first_snapshot_sec": (
+                round(self.last_first_snapshot_sec, 4) if self.last_first_snapshot_sec is not None else None
+            ),
+        }
@@ -0,0 +1,173 @@
+"""SQLite journal that lets asynchronous jobs survive an API restart.
+
+Each job is one row (metadata, options, final status and result) and its
+uploaded audio is spooled to ``<dir>/spool/<id>.bin`` until it finishes.
+The spool file is written (temp file + rename) before the row is committed,
+so a crash never leaves a row without audio. On startup ``records()``
+returns every journalled job so the server can restore finished results
+and queue unfinished jobs again, and ``purge`` drops finished rows older
+than the retention period.
+
+The database runs in WAL mode with ``synchronous=NORMAL``: a process crash
+or kill loses nothing that was committed; only an OS crash or power loss
+can drop the last few commits. All methods block, so call them through
+``asyncio.to_thread`` from the event loop (short single-row updates are
+cheap enough to run inline).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    response_format TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    duration_sec REAL,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, finished_at);
+"""
+
+# Rows are written "queued" and updated only with the final status; a job that
+# was running when the API stopped is still "queued" here and is requeued
+_UNFINISHED = "queued"
+
+
+@dataclass
+class JournalRecord:
+    id: str
+    filename: str
+    response_format: str
+    options: dict
+    status: str
+    created_at: float
+    finished_at: Optional[float]
+    duration_sec: Optional[float]
+    error: Optional[str]
+    result: Optional[dict]
+
+
+class JobJournal:
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.spool_dir = self.directory / "spool"
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.directory / "jobs.sqlite3", check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _spool_path(self, job_id: str) -> Path:
+        return self.spool_dir / f"{job_id}.bin"
+
+    # -- writes --
+    def add(self, job_id: str, filename: str, response_format: str, options: dict, created_at: float, audio: bytes) -> None:
+        path = self._spool_path(job_id)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(audio)
+        os.replace(tmp, path)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO jobs (id, filename, response_format, options, status, created_at)"
+                " VALUES (?, ?, ?, ?, 'queued', ?)",
+                (job_id, filename, response_format, json.dumps(options), created_at),
+            )
+
+    def finish(
+        self,
+        job_id: str,
+        status: str,
+        *,
+        finished_at: float,
+        duration_sec: Optional[float] = None,
+        error: Optional[str] = None,
+        result: Optional[dict] = None,
+    ) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, duration_sec = ?, error = ?, result = ? WHERE id = ?",
+                (
+                    status,
+                    finished_at,
+                    duration_sec,
+                    error,
+                    json.dumps(result, ensure_ascii=False) if result is not None else None,
+                    job_id,
+                ),
+            )
+        self._unlink_spool(job_id)
+
+    def forget(self, job_ids: List[str]) -> None:
+        if not job_ids:
+            return
+        with self._lock:
+            self._db.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in job_ids])
+        for job_id in job_ids:
+            self._unlink_spool(job_id)
+
+    def purge(self, ttl_sec: float) -> int:
+        """Drop finished jobs older than ``ttl_sec`` (0 keeps them) and orphaned spool files."""
+        removed = 0
+        with self._lock:
+            if ttl_sec > 0:
+                removed = self._db.execute(
+                    "DELETE FROM jobs WHERE status != ? AND finished_at < ?",
+                    (_UNFINISHED, time.time() - ttl_sec),
+                ).rowcount
+            live = {row[0] for row in self._db.execute("SELECT id FROM jobs WHERE status = ?", (_UNFINISHED,))}
+        for path in self.spool_dir.iterdir():
+            if path.stem not in live:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        return removed
+
+    # -- reads --
+    def load_audio(self, job_id: str) -> Optional[bytes]:
+        try:
+            return self._spool_path(job_id).read_bytes()
+        except OSError:
+            return None
+
+    def records(self) -> List[JournalRecord]:
+        """Every journalled job, oldest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, filename, response_format, options, status, created_at, finished_at,"
+                " duration_sec, error, result FROM jobs ORDER BY created_at"
+            ).fetchall()
+        records: List[JournalRecord] = []
+        for row in rows:
+            try:
+                options = json.loads(row[3])
+                result = json.loads(row[9]) if row[9] else None
+            except ValueError:
+                options, result = {}, None
+            records.append(JournalRecord(row[0], row[1], row[2], options, row[4], row[5], row[6], row[7], row[8], result))
+        return records
+
+    def _unlink_spool(self, job_id: str) -> None:
+        try:
+            self._spool_path(job_id).unlink()
+        except OSError:
+            pass
@@ -0,0 +1,175 @@
+"""Bookkeeping for asynchronous (submit now, fetch later) transcription jobs.
+
+``POST /v1/audio/transcriptions/jobs`` registers one ``TranscriptionJob``
+per uploaded file and returns immediately; the work itself runs as an
+asyncio task on the regular backend worker pool. ``JobStore`` keeps the
+records, expires finished ones after ``ttl_sec`` and caps how many exist at
+once so a bulk client cannot grow memory without bound. With a durable
+journal (``job_journal``) the store is rebuilt from disk on startup, and
+``on_forget`` tells the journal which records were dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+
+@dataclass
+class TranscriptionJob:
+    id: str
+    filename: str
+    response_format: str
+    created_at: float
+    duration_sec: Optional[float] = None
+    status: str = QUEUED
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    # Result of a completed job (same shape as the synchronous route uses)
+    texts: List[str] = field(default_factory=list)
+    lines: List[dict] = field(default_factory=list)
+    headers: Optional[dict] = None
+    # Backend jobs submitted for this upload (several in long-file mode)
+    backend_jobs: List[Any] = field(default_factory=list)
+    task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+
+class JobStoreFull(Exception):
+    """Raised when no more jobs may be registered."""
+
+
+class JobStore:
+    def __init__(
+        self,
+        *,
+        max_jobs: int = 10000,
+        ttl_sec: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+        on_forget: Optional[Callable[[List[str]], None]] = None,
+    ) -> None:
+        self.max_jobs = max(1, int(max_jobs))
+        self.ttl_sec = max(0.0, ttl_sec)
+        self._clock = clock
+        self.on_forget = on_forget
+        self._jobs: dict[str, TranscriptionJob] = {}
+        self.created = 0
+        self.expired = 0
+        self.resumed = 0
+        self.journal_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def reserve(self, count: int) -> None:
+        """Make room for ``count`` new jobs or raise ``JobStoreFull``."""
+        self.prune()
+        excess = len(self._jobs) + count - self.max_jobs
+        if excess > 0:
+            # Drop the oldest finished records before refusing new work
+            finished = sorted((j for j in self._jobs.values() if j.finished), key=lambda j: j.finished_at or 0.0)
+            dropped = [job.id for job in finished[:excess]]
+            for job_id in dropped:
+                del self._jobs[job_id]
+            self.expired += len(dropped)
+            excess -= len(dropped)
+            self._forgotten(dropped)
+        if excess > 0:
+            raise JobStoreFull(f"Too many unfinished jobs (limit {self.max_jobs}).")
+
+    def create(
+        self,
+        filename: str,
+        response_format: str,
+        duration_sec: Optional[float] = None,
+        *,
+        job_id: Optional[str] = None,
+        created_at: Optional[float] = None,
+    ) -> TranscriptionJob:
+        """Register a job; ``job_id``/``created_at`` are given when restoring one."""
+        job = TranscriptionJob(
+            id=job_id or f"job_{uuid.uuid4().hex}",
+            filename=filename,
+            response_format=response_format,
+            created_at=self._clock() if created_at is None else created_at,
+            duration_sec=duration_sec,
+        )
+        self._jobs[job.id] = job
+        self.created += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[TranscriptionJob]:
+        self.prune()
+        return self._jobs.get(job_id)
+
+    def discard(self, job_id: str) -> bool:
+        if self._jobs.pop(job_id, None) is None:
+            return False
+        self._forgotten([job_id])
+        return True
+
+    def unfinished(self) -> List[TranscriptionJob]:
+        return [job for job in self._jobs.values() if not job.finished]
+
+    def evict(self, job_id: str) -> None:
+        """Drop a record from memory only (its journal entry stays)."""
+        self._jobs.pop(job_id, None)
+
+    def prune(self) -> None:
+        if not self.ttl_sec:
+            return
+        cutoff = self._clock() - self.ttl_sec
+        stale = [j.id for j in self._jobs.values() if j.finished and (j.finished_at or 0.0) < cutoff]
+        for job_id in stale:
+            del self._jobs[job_id]
+        self.expired += len(stale)
+        self._forgotten(stale)
+
+    def _forgotten(self, job_ids: List[str]) -> None:
+        if job_ids and self.on_forget is not None:
+            try:
+                self.on_forget(job_ids)
+            except Exception:  # noqa: BLE001 - the journal must not break lookups
+                self.journal_errors += 1
+
+    # -- state transitions --
+    def mark_started(self, job: TranscriptionJob) -> None:
+        if job.status == QUEUED:
+            job.status = RUNNING
+            job.started_at = self._clock()
+
+    def mark_finished(self, job: TranscriptionJob, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.error = error
+        job.finished_at = self._clock()
+        job.backend_jobs = []
+        job.task = None
+
+    def snapshot(self) -> dict:
+        by_status: dict[str, int] = {}
+        for job in self._jobs.values():
+            by_status[job.status] = by_status.get(job.status, 0) + 1
+        return {
+            "jobs": len(self._jobs),
+            "by_status": by_status,
+            "max_jobs": self.max_jobs,
+            "ttl_sec": self.ttl_sec,
+            "created": self.created,
+            "expired": self.expired,
+            "resumed": self.resumed,
+            "journal_errors": self.journal_errors,
+        }
@@ -0,0 +1,144 @@
+"""Split long recordings at quiet points and stitch per-chunk results.
+
+A backend session consumes audio at roughly the model's pace, so one long
+upload keeps a single worker busy no matter how many are configured.
+``plan_chunks`` cuts 16-bit mono PCM into pieces of about ``target_sec``,
+moving every cut to the quietest stretch near the nominal boundary so words
+are not split. The chunks can then run on separate workers and
+``stitch_lines`` shifts each chunk's ``beg``/``end`` onto the original
+timeline and drops text repeated across a seam.
+
+numpy is optional (it ships with the backend requirements); without it
+``plan_chunks`` returns a single chunk and callers fall back to one session.
+"""
+
+from __future__ import annotations
+
+import datetime
+import re
+from typing import List, Sequence
+
+from .segments import parse_hms
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy comes with the backend stack
+    np = None  # type: ignore[assignment]
+
+_FRAME_SEC = 0.02
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def available() -> bool:
+    return np is not None
+
+
+def frame_rms(pcm: bytes, sample_rate: int = 16000, frame_sec: float = _FRAME_SEC):
+    """RMS level (0..1) of consecutive ``frame_sec`` frames of PCM16 mono."""
+    samples = np.frombuffer(pcm, dtype="<i2")
+    hop = max(1, int(sample_rate * frame_sec))
+    n = len(samples) // hop
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[: n * hop].reshape(n, hop).astype(np.float32) / 32768.0
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+def plan_chunks(
+    pcm: bytes,
+    *,
+    sample_rate: int = 16000,
+    target_sec: float = 180.0,
+    search_sec: float = 15.0,
+    quiet_sec: float = 0.4,
+) -> List[tuple[int, int]]:
+    """Return ``(start_byte, end_byte)`` ranges covering ``pcm``.
+
+    Each cut is placed in the middle of the lowest-energy ``quiet_sec``
+    window within ``search_sec`` of the nominal ``k * target_sec`` boundary.
+    """
+    total = len(pcm) // 2
+    target = int(target_sec * sample_rate)
+    if np is None or target <= 0 or total <= target + target // 4:
+        return [(0, total * 2)]
+    rms = frame_rms(pcm, sample_rate)
+    hop = max(1, int(sample_rate * _FRAME_SEC))
+    win = max(1, int(quiet_sec / _FRAME_SEC))
+    # Moving average of frame energy over the quiet window
+    energy = np.convolve(rms, np.ones(win, dtype=np.float32) / win, mode="same")
+    # Never search further than a quarter chunk, so every chunk keeps >= half its target
+    search = max(1, min(int(search_sec / _FRAME_SEC), target // hop // 4))
+    cuts: List[int] = []
+    nominal = target
+    while nominal < total - target // 4:
+        centre = nominal // hop
+        lo = max(0, centre - search)
+        hi = min(len(energy), centre + search + 1)
+        cut = (lo + int(np.argmin(energy[lo:hi]))) * hop if hi > lo else nominal
+        cuts.append(cut)
+        nominal = cut + target
+    bounds = [0] + cuts + [total]
+    return [(a * 2, b * 2) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def format_hms(seconds: float) -> str:
+    """Format like upstream timestamps (``H:MM:SS``, whole seconds)."""
+    return str(datetime.timedelta(seconds=max(0, int(round(seconds)))))
+
+
+def _words(text: str) -> List[str]:
+    return [w.lower() for w in _WORD_RE.findall(text)]
+
+
+def _trim_repeated_prefix(prev_text: str, text: str, min_words: int = 2) -> str:
+    """Drop the start of ``text`` that repeats the end of ``prev_text``."""
+    prev_words = _words(prev_text)
+    words = _words(text)
+    best = 0
+    for n in range(min(len(prev_words), len(words)), min_words - 1, -1):
+        if prev_words[-n:] == words[:n]:
+            best = n
+            break
+    if not best:
+        return text
+    # Cut after the best-th word in the original text, keeping its spelling
+    matches = list(_WORD_RE.finditer(text))
+    return text[matches[best - 1].end():].lstrip(" ,.;:、。")
+
+
+def stitch_lines(
+    chunks: Sequence[tuple[float, Sequence[dict]]],
+    *,
+    seam_sec: float = 2.0,
+) -> List[dict]:
+    """Merge per-chunk ``lines`` (``(offset_sec, lines)`` in order) into one list.
+
+    Times are shifted by the chunk offset. Near a seam, a segment identical
+    to the previous one is dropped and words repeating the previous
+    segment's tail are trimmed.
+    """
+    merged: List[dict] = []
+    for offset, lines in chunks:
+        first_in_chunk = True
+        for item in lines:
+            text = (item.get("text") or "").strip()
+            if not text:
+                continue
+            beg = parse_hms(item.get("beg")) + offset
+            end = parse_hms(item.get("end")) + offset
+            if first_in_chunk and merged:
+                prev = merged[-1]
+                if beg - parse_hms(prev["end"]) <= seam_sec:
+                    if _words(text) == _words(prev["text"]):
+                        continue
+                    text = _trim_repeated_prefix(prev["text"], text)
+                    if not text:
+                        continue
+            first_in_chunk = False
+            merged.append({**item, "text": text, "beg": format_hms(beg), "end": format_hms(max(beg, end))})
+    return merged
+
+
+def chunk_offsets(ranges: Sequence[tuple[int, int]], sample_rate: int = 16000) -> List[float]:
+    return [start / 2 / sample_rate for start, _end in ranges]
+
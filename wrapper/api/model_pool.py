@@ -0,0 +1,303 @@
+"""Backends for requested models other than the configured one.
+
+A request whose ``model`` names another model gets a backend process of its
+own (``command(model, port)``), started on first use on a free loopback
+port and kept warm afterwards; its sessions go through a ``BackendRouter``
+made by ``make_router(port)``. A backend is ready when its port accepts
+connections (the backend binds only after loading and warming the model).
+
+Backends share a memory budget (``budget_mb``, 0 = unlimited). Each counts
+with its measured resident size once running (Linux ``/proc``), or
+``estimate_mb(model)`` until then. Starting a model that does not fit
+evicts the least recently used backends with no job pinned to them; when
+nothing can be evicted the request is refused with ``BackendUnavailable``
+(or waits for a job to finish with ``wait=True``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import subprocess
+import time
+from typing import Callable, Dict, Optional
+
+from .backend_pool import BackendRouter, BackendUnavailable
+
+LOADING = "loading"
+READY = "ready"
+
+# Rough resident size of a backend process per Whisper model family (MB)
+_MEMORY_ESTIMATES_MB = (
+    ("tiny", 1000.0),
+    ("base", 1200.0),
+    ("small", 2000.0),
+    ("medium", 4000.0),
+    ("turbo", 4500.0),
+    ("large", 6500.0),
+)
+
+
+def estimate_memory_mb(model: str) -> float:
+    name = model.lower()
+    for family, size in _MEMORY_ESTIMATES_MB:
+        if family in name:
+            return size
+    return 4000.0
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class ModelBackend:
+    def __init__(self, model: str, port: int, proc: subprocess.Popen, router: BackendRouter, estimate_mb: float) -> None:
+        self.model = model
+        self.port = port
+        self.proc = proc
+        self.router = router
+        self.estimate_mb = estimate_mb
+        self.state = LOADING
+        self.error: Optional[str] = None
+        self.started_at = time.monotonic()
+        self.ready_at: Optional[float] = None
+        self.last_used = self.started_at
+        # Jobs queued or running on this backend; a pinned backend is never evicted
+        self.pinned = 0
+        self.jobs = 0
+        self.loaded = asyncio.Event()
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    @property
+    def evictable(self) -> bool:
+        return self.state == READY and self.pinned == 0
+
+    @property
+    def memory_mb(self) -> float:
+        measured = _rss_mb(self.proc.pid) if self.state == READY else None
+        return measured if measured is not None else self.estimate_mb
+
+    @property
+    def status(self) -> str:
+        if self.state == LOADING:
+            return "loading"
+        return "evictable" if self.pinned == 0 else "loaded"
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {
+            "model": self.model,
+            "status": self.status,
+            "port": self.port,
+            "pid": self.proc.pid,
+            "memory_mb": round(self.memory_mb, 1),
+            "pinned": self.pinned,
+            "jobs": self.jobs,
+            "load_sec": round(self.ready_at - self.started_at, 2) if self.ready_at is not None else None,
+            "idle_sec": round(now - self.last_used, 1),
+        }
+
+
+class ModelPool:
+    def __init__(
+        self,
+        *,
+        command: Callable[[str, int], list[str]],
+        make_router: Callable[[int], BackendRouter],
+        budget_mb: float = 0.0,
+        estimate_mb: Callable[[str], float] = estimate_memory_mb,
+        load_timeout: float = 600.0,
+        stop_timeout: float = 10.0,
+        env: Optional[dict[str, str]] = None,
+    ) -> None:
+        self.command = command
+        self.make_router = make_router
+        self.budget_mb = max(0.0, budget_mb)
+        self.estimate_mb = estimate_mb
+        self.load_timeout = load_timeout
+        self.stop_timeout = stop_timeout
+        self.env = env
+        self.backends: Dict[str, ModelBackend] = {}
+        self.started = 0
+        self.evicted = 0
+        self.load_failures = 0
+        self._lock = asyncio.Lock()
+        # Set whenever a job unpins a backend (room may have become evictable)
+        self._released = asyncio.Event()
+        # Background load/stop tasks, referenced until done so they are not collected
+        self._loading: set[asyncio.Task] = set()
+        self._stopping: set[asyncio.Task] = set()
+
+    @property
+    def used_mb(self) -> float:
+        return sum(backend.memory_mb for backend in self.backends.values())
+
+    async def acquire(self, model: str, *, wait: bool = False) -> ModelBackend:
+        """The ready backend for ``model``, started if needed, pinned for one job.
+
+        The caller must ``release`` it when the job is done.
+        """
+        while True:
+            async with self._lock:
+                backend = self.backends.get(model)
+                if backend is not None and not backend.alive and backend.state == READY:
+                    # Crashed since it was loaded: start a fresh one
+                    self._drop(backend)
+                    backend = None
+                if backend is None:
+                    try:
+                        backend = self._start(model)
+                    except BackendUnavailable:
+                        if not wait:
+                            raise
+                        self._released.clear()
+                        backend = None
+                if backend is not None:
+                    backend.pinned += 1
+            if backend is not None:
+                break
+            await self._released.wait()
+        try:
+            await backend.loaded.wait()
+            if backend.state != READY:
+                raise BackendUnavailable(f"model '{model}' failed to load: {backend.error}", retry_after=5.0)
+        except BaseException:
+            self.release(backend)
+            raise
+        backend.last_used = time.monotonic()
+        backend.jobs += 1
+        return backend
+
+    def release(self, backend: ModelBackend) -> None:
+        backend.pinned = max(0, backend.pinned - 1)
+        backend.last_used = time.monotonic()
+        self._released.set()
+
+    def _start(self, model: str) -> ModelBackend:
+        estimate = self.estimate_mb(model)
+        self._make_room(estimate, model)
+        port = _free_port()
+        try:
+            proc = subprocess.Popen(self.command(model, port), env=self.env)
+        except OSError as exc:
+            self.load_failures += 1
+            raise BackendUnavailable(f"cannot start a backend for model '{model}': {exc}", retry_after=5.0) from exc
+        backend = ModelBackend(model, port, proc, self.make_router(port), estimate)
+        self.backends[model] = backend
+        self.started += 1
+        self._spawn(self._loading, self._load(backend))
+        return backend
+
+    def _make_room(self, needed_mb: float, model: str) -> None:
+        if not self.budget_mb:
+            return
+        used = self.used_mb
+        candidates = sorted((b for b in self.backends.values() if b.evictable), key=lambda b: b.last_used)
+        while used + needed_mb > self.budget_mb:
+            if not candidates:
+                raise BackendUnavailable(
+                    f"model '{model}' (~{needed_mb:.0f} MB) does not fit the {self.budget_mb:.0f} MB model "
+                    f"memory budget ({used:.0f} MB held by models in use)",
+                    retry_after=5.0,
+                )
+            victim = candidates.pop(0)
+            used -= victim.memory_mb
+            self._drop(victim)
+            self.evicted += 1
+
+    def _drop(self, backend: ModelBackend) -> None:
+        if self.backends.get(backend.model) is backend:
+            del self.backends[backend.model]
+        self._spawn(self._stopping, self._stop(backend))
+
+    @staticmethod
+    def _spawn(tasks: set[asyncio.Task], coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    async def _load(self, backend: ModelBackend) -> None:
+        deadline = backend.started_at + self.load_timeout
+        try:
+            while True:
+                if not backend.alive:
+                    backend.error = f"backend exited with code {backend.proc.returncode}"
+                    break
+                if await _port_open(backend.port):
+                    backend.state = READY
+                    backend.ready_at = time.monotonic()
+                    backend.router.start()
+                    return
+                if time.monotonic() >= deadline:
+                    backend.error = f"not ready within {self.load_timeout:g}s"
+                    break
+                await asyncio.sleep(0.2)
+            self.load_failures += 1
+            async with self._lock:
+                self._drop(backend)
+        except asyncio.CancelledError:
+            backend.error = "the pool was closed while loading"
+            raise
+        finally:
+            backend.loaded.set()
+
+    async def _stop(self, backend: ModelBackend) -> None:
+        await backend.router.close()
+        if backend.alive:
+            backend.proc.terminate()
+            try:
+                await asyncio.to_thread(backend.proc.wait, self.stop_timeout)
+            except subprocess.TimeoutExpired:
+                backend.proc.kill()
+                await asyncio.to_thread(backend.proc.wait)
+
+    async def close(self) -> None:
+        # Cancel loads first so none finishes after shutdown and leaves a backend unowned
+        loading = list(self._loading)
+        for task in loading:
+            task.cancel()
+        if loading:
+            await asyncio.gather(*loading, return_exceptions=True)
+        for backend in list(self.backends.values()):
+            self._drop(backend)
+        if self._stopping:
+            await asyncio.gather(*self._stopping, return_exceptions=True)
+
+    def snapshot(self) -> dict:
+        return {
+            "budget_mb": self.budget_mb or None,
+            "used_mb": round(self.used_mb, 1),
+            "started": self.started,
+            "evicted": self.evicted,
+            "load_failures": self.load_failures,
+            "models": [backend.snapshot() for backend in self.backends.values()],
+        }
+
+
+async def _port_open(port: int, timeout: float = 0.5) -> bool:
+    try:
+        _reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
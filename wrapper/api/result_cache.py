@@ -0,0 +1,203 @@
+"""Content-addressed cache of transcription results.
+
+Entries are keyed by a hash of the uploaded bytes plus the backend
+configuration that produced them, and hold the cleaned ``lines`` snapshot so
+every ``response_format`` can be rendered from a single entry. A bounded
+in-memory LRU sits in front of an optional on-disk tier (one JSON file per
+entry) that evicts least recently used files once it exceeds its byte budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
+
+
+def make_key(audio_digest: str, config: dict) -> str:
+    """Combine the audio hash with the backend settings that affect output."""
+    h = hashlib.sha256(audio_digest.encode("ascii"))
+    h.update(json.dumps(config, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+    return h.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+    disk_errors: int = 0
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        data["hit_rate"] = round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else None
+        return data
+
+
+class ResultCache:
+    def __init__(
+        self,
+        max_entries: int,
+        *,
+        disk_dir: Optional[Path] = None,
+        disk_max_bytes: int = 0,
+    ) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.disk_dir = Path(disk_dir) if disk_dir is not None and disk_max_bytes > 0 else None
+        self.disk_max_bytes = max(0, int(disk_max_bytes))
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, List[dict]]" = OrderedDict()
+        # Disk index: key -> (size in bytes, last access time); guarded by _disk_lock
+        self._disk_index: dict[str, tuple[int, float]] = {}
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+        if self.disk_dir is not None:
+            self._load_disk_index()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or self.disk_dir is not None
+
+    # -- public API --
+    async def get(self, key: str) -> Optional[List[dict]]:
+        lines = self._memory.get(key)
+        if lines is not None:
+            self._memory.move_to_end(key)
+            self.stats.memory_hits += 1
+            return lines
+        if self.disk_dir is not None and key in self._disk_index:
+            lines = await asyncio.to_thread(self._disk_read, key)
+            if lines is not None:
+                self.stats.disk_hits += 1
+                self._remember(key, lines)
+                return lines
+        self.stats.misses += 1
+        return None
+
+    def contains(self, key: str) -> bool:
+        """Presence check that does not count as a lookup."""
+        return key in self._memory or key in self._disk_index
+
+    async def put(self, key: str, lines: List[dict]) -> None:
+        self.stats.stores += 1
+        self._remember(key, lines)
+        if self.disk_dir is not None:
+            await asyncio.to_thread(self._disk_write, key, lines)
+
+    def snapshot(self) -> dict:
+        return {
+            **self.stats.as_dict(),
+            "memory_entries": len(self._memory),
+            "memory_max_entries": self.max_entries,
+            "disk_entries": len(self._disk_index),
+            "disk_bytes": self._disk_bytes,
+            "disk_max_bytes": self.disk_max_bytes if self.disk_dir is not None else 0,
+        }
+
+    # -- memory tier --
+    def _remember(self, key: str, lines: List[dict]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = lines
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.memory_evictions += 1
+
+    # -- disk tier (runs in worker threads) --
+    def _path(self, key: str) -> Path:
+        assert self.disk_dir is not None
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _load_disk_index(self) -> None:
+        assert self.disk_dir is not None
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            for path in self.disk_dir.glob("*/*.json"):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                self._disk_index[path.stem] = (st.st_size, st.st_mtime)
+                self._disk_bytes += st.st_size
+        except OSError:
+            self.stats.disk_errors += 1
+            self.disk_dir = None
+            return
+        self._evict_disk()
+
+    def _disk_read(self, key: str) -> Optional[List[dict]]:
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf-8") as fh:
+                lines = json.load(fh).get("lines")
+            os.utime(path)
+        except (OSError, ValueError, AttributeError):
+            self.stats.disk_errors += 1
+            self._forget_disk(key)
+            return None
+        with self._disk_lock:
+            if key in self._disk_index:
+                self._disk_index[key] = (self._disk_index[key][0], time.time())
+        return lines if isinstance(lines, list) else None
+
+    def _disk_write(self, key: str, lines: List[dict]) -> None:
+        path = self._path(key)
+        payload = json.dumps({"lines": lines}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if len(payload) > self.disk_max_bytes:
+            return
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(payload)
+            os.replace(tmp, path)
+        except OSError:
+            self.stats.disk_errors += 1
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return
+        with self._disk_lock:
+            old = self._disk_index.get(key)
+            if old is not None:
+                self._disk_bytes -= old[0]
+            self._disk_index[key] = (len(payload), time.time())
+            self._disk_bytes += len(payload)
+        self._evict_disk()
+
+    def _forget_disk(self, key: str) -> None:
+        with self._disk_lock:
+            entry = self._disk_index.pop(key, None)
+            if entry is not None:
+                self._disk_bytes -= entry[0]
+
+    def _evict_disk(self) -> None:
+        with self._disk_lock:
+            if self._disk_bytes <= self.disk_max_bytes:
+                return
+            victims = sorted(self._disk_index.items(), key=lambda kv: kv[1][1])
+            doomed: list[str] = []
+            for key, (size, _atime) in victims:
+                if self._disk_bytes <= self.disk_max_bytes:
+                    break
+                del self._disk_index[key]
+                self._disk_bytes -= size
+                doomed.append(key)
+        for key in doomed:
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+            self.stats.disk_evictions += 1
@@ -0,0 +1,193 @@
+"""Pluggable ordering for queued backend jobs.
+
+``JobScheduler`` is a drop-in for the ``asyncio.Queue`` the workers used to
+read from (``put_nowait`` / ``get`` / ``task_done`` / ``qsize``) but decides
+which job runs next:
+
+- ``fifo``: arrival order (previous behaviour).
+- ``sjf``: shortest probed audio duration first. Waiting ages a job
+  (``aging`` seconds of audio per second waited) so long files still run.
+- ``wfq``: self-clocked weighted fair queuing per client (API key), with
+  audio seconds as the cost, so one noisy client cannot starve others.
+
+An explicit job ``priority`` (higher runs first) overrides every policy.
+Jobs are read through ``priority``, ``client`` and ``duration_sec``
+attributes; anything else about them is opaque to the scheduler.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Optional
+
+POLICIES = ("fifo", "sjf", "wfq")
+
+
+class JobScheduler:
+    def __init__(
+        self,
+        policy: str = "fifo",
+        *,
+        weights: Optional[dict[str, float]] = None,
+        unknown_duration_sec: float = 300.0,
+        aging: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.policy = policy if policy in POLICIES else "fifo"
+        self.weights = dict(weights or {})
+        self.unknown_duration_sec = unknown_duration_sec
+        self.aging = aging
+        self._clock = clock
+        self._epoch = clock()
+        self._heap: list[tuple[int, float, int, Any]] = []
+        self._seq = itertools.count()
+        self._getters: Deque[asyncio.Future] = deque()
+        self._unfinished = 0
+        self._removed: set[int] = set()
+        self._entries: dict[int, int] = {}
+        # WFQ state: virtual time, last finish tag per client (dropped once the
+        # virtual time passes it) and each queued job's charge (seq -> client, cost)
+        self._virtual_time = 0.0
+        self._last_finish: dict[str, float] = {}
+        self._charges: dict[int, tuple[str, float]] = {}
+
+    # -- ordering --
+    def _cost(self, job: Any) -> float:
+        duration = getattr(job, "duration_sec", None)
+        return float(duration) if duration is not None and duration > 0 else self.unknown_duration_sec
+
+    def _key(self, job: Any, seq: int) -> float:
+        now = self._clock() - self._epoch
+        if self.policy == "sjf":
+            return self._cost(job) + self.aging * now
+        if self.policy == "wfq":
+            client = getattr(job, "client", "") or ""
+            weight = max(self.weights.get(client, 1.0), 1e-6)
+            charge = self._cost(job) / weight
+            start = max(self._virtual_time, self._last_finish.get(client, 0.0))
+            finish = start + charge
+            self._last_finish[client] = finish
+            self._charges[seq] = (client, charge)
+            return finish
+        return now
+
+    # -- asyncio.Queue-compatible surface --
+    def qsize(self) -> int:
+        return len(self._heap) - len(self._removed)
+
+    def empty(self) -> bool:
+        return self.qsize() <= 0
+
+    def put_nowait(self, job: Any) -> None:
+        seq = next(self._seq)
+        priority = int(getattr(job, "priority", 0) or 0)
+        heapq.heappush(self._heap, (-priority, self._key(job, seq), seq, job))
+        self._entries[id(job)] = seq
+        self._unfinished += 1
+        while self._getters:
+            getter = self._getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+                break
+
+    def get_nowait(self) -> Any:
+        while self._heap:
+            _prio, key, seq, job = heapq.heappop(self._heap)
+            if seq in self._removed:
+                self._removed.discard(seq)
+                continue
+            self._entries.pop(id(job), None)
+            if self.policy == "wfq":
+                self._charges.pop(seq, None)
+                self._virtual_time = max(self._virtual_time, key)
+                # A tag at or below the virtual time no longer affects a client's
+                # next start; dropping it bounds the table by active clients
+                stale = [client for client, finish in self._last_finish.items() if finish <= self._virtual_time]
+                for client in stale:
+                    del self._last_finish[client]
+            return job
+        raise asyncio.QueueEmpty
+
+    async def get(self) -> Any:
+        while self.empty():
+            getter = asyncio.get_running_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            except BaseException:
+                getter.cancel()
+                try:
+                    self._getters.remove(getter)
+                except ValueError:
+                    pass
+                if not self.empty() and not getter.cancelled():
+                    self._wake_next()
+                raise
+        return self.get_nowait()
+
+    def _wake_next(self) -> None:
+        while self._getters:
+            getter = self._getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+                return
+
+    def task_done(self) -> None:
+        if self._unfinished > 0:
+            self._unfinished -= 1
+
+    def remove(self, job: Any) -> bool:
+        """Drop a queued job (e.g. its caller gave up). Returns True if found."""
+        seq = self._entries.pop(id(job), None)
+        if seq is None:
+            return False
+        self._removed.add(seq)
+        self.task_done()
+        charged = self._charges.pop(seq, None)
+        if charged is not None:
+            # Refund the cost of work that will never run
+            client, charge = charged
+            if client in self._last_finish:
+                self._last_finish[client] = max(self._virtual_time, self._last_finish[client] - charge)
+        return True
+
+    def reprioritize(self, job: Any) -> bool:
+        """Re-file a queued job after its ``priority`` changed. Returns True if it was queued."""
+        seq = self._entries.get(id(job))
+        if seq is None:
+            return False
+        key = next(entry[1] for entry in self._heap if entry[2] == seq)
+        self._removed.add(seq)
+        new_seq = next(self._seq)
+        heapq.heappush(self._heap, (-int(getattr(job, "priority", 0) or 0), key, new_seq, job))
+        self._entries[id(job)] = new_seq
+        if seq in self._charges:
+            self._charges[new_seq] = self._charges.pop(seq)
+        return True
+
+    # -- introspection --
+    def ordered(self) -> list[Any]:
+        """Queued jobs in the order they would be dispatched."""
+        return [job for _p, _k, seq, job in sorted(self._heap) if seq not in self._removed]
+
+    def snapshot(self) -> dict:
+        by_client = Counter(getattr(job, "client", "") or "anonymous" for job in self.ordered())
+        return {"policy": self.policy, "queued": self.qsize(), "queued_by_client": dict(by_client)}
+
+
+def parse_weights(raw: str) -> dict[str, float]:
+    """Parse ``client=weight`` pairs separated by commas."""
+    weights: dict[str, float] = {}
+    for entry in (raw or "").split(","):
+        name, sep, value = entry.strip().partition("=")
+        if not sep or not name:
+            continue
+        try:
+            weights[name.strip()] = max(0.0, float(value))
+        except ValueError:
+            continue
+    return weights
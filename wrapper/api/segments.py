@@ -0,0 +1,170 @@
+"""Transcript segments with times parsed once, and a fast JSON codec.
+
+The backend resends every line of the session in each snapshot, so long
+sessions turn into hundreds of identical dicts per message. ``SnapshotParser``
+turns a snapshot into ``Segment`` objects (``__slots__``, numeric
+``beg_sec``/``end_sec``) and reuses the previous message's object for every
+line that did not change, so a steady session allocates only for the lines
+at its tail. ``parse_hms`` is memoized because the same ``H:MM:SS`` strings
+recur across snapshots.
+
+``loads``/``dumps`` use orjson or msgspec when installed and fall back to the
+standard library. This module has no third-party requirements and is shared
+by the API and the GUI.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+try:
+    import msgspec as _msgspec
+except ImportError:
+    _msgspec = None
+
+if _orjson is not None:
+    JSON_CODEC = "orjson"
+    loads = _orjson.loads
+
+    def dumps(obj: Any) -> bytes:
+        return _orjson.dumps(obj)
+
+elif _msgspec is not None:
+    JSON_CODEC = "msgspec"
+    _decoder = _msgspec.json.Decoder()
+    _encoder = _msgspec.json.Encoder()
+
+    def loads(data: Any) -> Any:
+        return _decoder.decode(data.encode("utf-8") if isinstance(data, str) else data)
+
+    def dumps(obj: Any) -> bytes:
+        return _encoder.encode(obj)
+
+else:
+    JSON_CODEC = "json"
+    loads = json.loads
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=65536)
+def _parse_hms(value: str) -> float:
+    parts = value.split(":")
+    if len(parts) != 3:
+        return 0.0
+    try:
+        h, m, s = parts
+        return int(h) * 3600 + int(m) * 60 + float(s)
+    except ValueError:
+        return 0.0
+
+
+def parse_hms(value: object) -> float:
+    """Seconds of an upstream ``H:MM:SS`` timestamp (0.0 when malformed)."""
+    if isinstance(value, str):
+        return _parse_hms(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    return 0.0
+
+
+class Segment:
+    """One cleaned transcript line."""
+
+    __slots__ = ("speaker", "text", "beg", "end", "diff", "beg_sec", "end_sec", "_dict")
+
+    def __init__(self, speaker: Any, text: str, beg: Any, end: Any, diff: Any = None) -> None:
+        self.speaker = speaker
+        self.text = text
+        self.beg = beg
+        self.end = end
+        self.diff = diff
+        self.beg_sec = parse_hms(beg)
+        self.end_sec = parse_hms(end)
+        self._dict: Optional[dict] = None
+
+    @classmethod
+    def from_item(cls, item: Any) -> Optional["Segment"]:
+        """Segment for a backend line, or None for silence/loading/empty lines."""
+        if not isinstance(item, dict):
+            return None
+        text = (item.get("text") or "").strip()
+        if not text:
+            return None
+        speaker = item.get("speaker")
+        if isinstance(speaker, int) and speaker in (-2, 0):
+            return None
+        return cls(speaker, text, item.get("beg"), item.get("end"), item.get("diff"))
+
+    @property
+    def speaker_id(self) -> Optional[int]:
+        return self.speaker if isinstance(self.speaker, int) else None
+
+    def as_dict(self) -> dict:
+        """The plain-dict line used by caches and JSON output (built once; do not mutate)."""
+        if self._dict is None:
+            self._dict = {"speaker": self.speaker, "text": self.text, "beg": self.beg, "end": self.end, "diff": self.diff}
+        return self._dict
+
+    def __repr__(self) -> str:
+        return f"Segment({self.speaker!r}, {self.text!r}, {self.beg!r}, {self.end!r})"
+
+
+class SnapshotParser:
+    """Parse successive snapshots of one session, reusing unchanged segments.
+
+    A line is unchanged when its raw item equals the one at the same index in
+    the previous snapshot. After ``parse``, ``changed`` tells whether the
+    result differs from the previous snapshot.
+    """
+
+    __slots__ = ("_items", "_parsed", "segments", "changed")
+
+    def __init__(self) -> None:
+        # Raw items of the previous snapshot and their segments (None when skipped)
+        self._items: List[Any] = []
+        self._parsed: List[Optional[Segment]] = []
+        self.segments: List[Segment] = []
+        self.changed = False
+
+    def parse(self, items: Optional[Sequence[Any]]) -> List[Segment]:
+        items = items if isinstance(items, list) else list(items or ())
+        old_items, old_parsed = self._items, self._parsed
+        reusable = min(len(items), len(old_items))
+        parsed: List[Optional[Segment]] = []
+        changed = len(items) != len(old_items)
+        for idx, item in enumerate(items):
+            if idx < reusable and old_items[idx] == item:
+                parsed.append(old_parsed[idx])
+            else:
+                parsed.append(Segment.from_item(item))
+                changed = True
+        self._items, self._parsed = items, parsed
+        self.changed = changed
+        if changed or not self.segments:
+            self.segments = [segment for segment in parsed if segment is not None]
+        return self.segments
+
+
+def iter_segments(lines: Iterable[Any]) -> Iterator[Segment]:
+    """Segments for stored lines (dicts or segments), skipping unusable ones."""
+    for line in lines:
+        segment = line if isinstance(line, Segment) else Segment.from_item(line)
+        if segment is not None:
+            yield segment
+
+
+def as_segments(lines: Iterable[Any]) -> List[Segment]:
+    return list(iter_segments(lines))
+
+
+def as_dicts(segments: Sequence[Segment]) -> List[dict]:
+    return [segment.as_dict() for segment in segments]
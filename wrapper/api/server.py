@@ -1,23 +1,78 @@
 import asyncio
-import json
+import hashlib
+import hmac
+import itertools
+import logging
+import math
 import os
-import subprocess
+import sqlite3
+import time
 import io
 import wave
 from dataclasses import dataclass
-from typing import List, Optional
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
 
 from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Request
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.exceptions import RequestValidationError
 
 import websockets
 
+from .admission import AdmissionController, AdmissionRejected
+from .audio import estimate_duration_from_size, probe_duration_seconds, sniff_format
+from . import longform, silence
+from .decode import IN_PROCESS_FORMATS, DecodeError, DecodedAudio, FFmpegNotFound, FFmpegPool, decode_to_pcm16
+from . import jobs as async_jobs
+from .job_journal import JobJournal
+from .framing import AdaptiveFrameSizer, StreamTimings
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, RTF_BUCKETS, Registry
+from .result_cache import ResultCache, make_key
+from .scheduler import JobScheduler, parse_weights
+from .coalesce import SingleFlight
+from .autoscale import Autoscaler
+from .model_pool import ModelPool
+from .writers import MEDIA_TYPES, encode, iter_response, negotiate_encoding, verbose_segment
+from .segments import SnapshotParser, as_dicts, dumps as dumps_json, loads as loads_json
+from .uploads import StreamingMultipartUpload
+from .backend_pool import (
+    BackendConnectionPool,
+    BackendEndpoint,
+    BackendRouter,
+    BackendUnavailable,
+    close_quietly,
+    parse_endpoint_urls,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int, minimum: int = 0) -> int:
+    raw = os.getenv(name)
+    try:
+        return max(minimum, int(raw)) if raw else default
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float, minimum: float = 0.0) -> float:
+    raw = os.getenv(name)
+    try:
+        return max(minimum, float(raw)) if raw else default
+    except ValueError:
+        return default
+
+
 _RAW_MAX_CONCURRENCY = os.getenv("WRAPPER_BACKEND_MAX_CONCURRENCY")
 try:
     BACKEND_MAX_CONCURRENCY = max(1, int(_RAW_MAX_CONCURRENCY)) if _RAW_MAX_CONCURRENCY else 1
 except ValueError:
     BACKEND_MAX_CONCURRENCY = 1
+# Elastic pool: with a lower WRAPPER_BACKEND_MIN_CONCURRENCY the worker count
+# moves between MIN and MAX with queue depth and backend saturation
+BACKEND_MIN_CONCURRENCY = min(
+    BACKEND_MAX_CONCURRENCY, _env_int("WRAPPER_BACKEND_MIN_CONCURRENCY", BACKEND_MAX_CONCURRENCY, 1)
+)
 
 _RAW_QUEUE_TIMEOUT = os.getenv("WRAPPER_BACKEND_QUEUE_TIMEOUT_SEC")
 try:
@@ -26,17 +81,74 @@ try:
         _QUEUE_TIMEOUT = None
 except ValueError:
     _QUEUE_TIMEOUT = None
+# Default of _submit_backend_job(wait_timeout=...): the current _QUEUE_TIMEOUT,
+# which the admin endpoint can change at runtime
+_CONFIGURED_TIMEOUT: Any = object()
 
 
 @dataclass
 class BackendJob:
     audio_bytes: bytes
     future: asyncio.Future
-
-
-JOB_QUEUE: asyncio.Queue[BackendJob] = asyncio.Queue()
+    # Set for streamed uploads: audio is forwarded as it arrives instead of audio_bytes
+    audio_stream: Optional[AsyncIterator[bytes]] = None
+    # Called with every intermediate clean snapshot (used by stream=true)
+    on_snapshot: Optional[Callable[[List[dict]], None]] = None
+    # Scheduling hints: explicit priority (higher first), fairness identity,
+    # probed audio duration in seconds (None when unknown)
+    priority: int = 0
+    client: str = ""
+    duration_sec: Optional[float] = None
+    # Metrics only: label of the originating request and submission time
+    response_format: str = ""
+    enqueued_at: float = 0.0
+    # Set by the worker that takes the job (async job status)
+    started_at: float = 0.0
+    # False: wait for a backend to recover instead of failing while every breaker is open
+    fail_fast: bool = True
+    # Backend of a requested model (None: the configured backends)
+    router: Optional[BackendRouter] = None
+
+
+# Job ordering policy: fifo (default), sjf (shortest audio first) or wfq
+# (weighted fair queuing per client, weights as "client=weight,...")
+JOB_QUEUE = JobScheduler(
+    os.getenv("WRAPPER_SCHEDULER_POLICY", "fifo").strip().lower(),
+    weights=parse_weights(os.getenv("WRAPPER_SCHEDULER_WEIGHTS", "")),
+    unknown_duration_sec=_env_float("WRAPPER_SCHEDULER_UNKNOWN_DURATION_SEC", 300.0, 1.0),
+    aging=_env_float("WRAPPER_SCHEDULER_SJF_AGING", 1.0),
+)
+# Upper bound for the client-supplied 'priority' field (clamped to +/- this)
+SCHEDULER_MAX_PRIORITY = _env_int("WRAPPER_SCHEDULER_MAX_PRIORITY", 10)
+
+# Elastic worker pool: runs between the min/max concurrency, growing while jobs
+# queue and shrinking when idle or when the backend stops gaining throughput
+AUTOSCALER = Autoscaler(
+    minimum=BACKEND_MIN_CONCURRENCY,
+    maximum=BACKEND_MAX_CONCURRENCY,
+    idle_sec=_env_float("WRAPPER_AUTOSCALE_IDLE_SEC", 30.0),
+    cooldown_sec=_env_float("WRAPPER_AUTOSCALE_COOLDOWN_SEC", 5.0),
+    min_gain=_env_float("WRAPPER_AUTOSCALE_MIN_GAIN", 0.1),
+)
+AUTOSCALE_INTERVAL_SEC = _env_float("WRAPPER_AUTOSCALE_INTERVAL_SEC", 1.0, 0.1)
+
+# Admission control: caps on queued audio seconds / buffered megabytes and a
+# completion deadline (0 disables each); waits are estimated from the
+# real-time factor measured on recent jobs (INITIAL_RTF until the first one)
+ADMISSION = AdmissionController(
+    workers=AUTOSCALER.target,
+    max_queued_audio_sec=_env_float("WRAPPER_ADMISSION_MAX_QUEUED_AUDIO_SEC", 0.0),
+    max_queued_bytes=int(_env_float("WRAPPER_ADMISSION_MAX_QUEUED_MB", 1024.0) * 1024 * 1024),
+    deadline_sec=_env_float("WRAPPER_ADMISSION_DEADLINE_SEC", 0.0),
+    initial_rtf=_env_float("WRAPPER_ADMISSION_INITIAL_RTF", 0.5, 0.001),
+    unknown_duration_sec=JOB_QUEUE.unknown_duration_sec,
+)
 _WORKERS_STARTED = False
-_WORKERS: List[asyncio.Task] = []
+# Worker id (1..max) -> task; ids above AUTOSCALER.target retire
+_WORKERS: Dict[int, asyncio.Task] = {}
+_IDLE_WORKERS: set[int] = set()
+_BUSY_WORKERS = 0
+_AUTOSCALE_TASK: Optional[asyncio.Task] = None
 _WORKER_LOCK: Optional[asyncio.Lock] = None
 
 BACKEND_HOST = os.getenv("WRAPPER_BACKEND_HOST", "localhost")
@@ -54,9 +166,222 @@ BACKEND_SSL = os.getenv("WRAPPER_BACKEND_SSL", "0") == "1"
 BACKEND_WS_SCHEME = "wss" if BACKEND_SSL else "ws"
 BACKEND_WS_URL = f"{BACKEND_WS_SCHEME}://{BACKEND_CONNECT_HOST}:{BACKEND_PORT}/asr"
 
+# Idle backend sessions kept open per worker (0 disables pre-warming)
+BACKEND_POOL_SIZE = _env_int("WRAPPER_BACKEND_POOL_SIZE", 1)
+BACKEND_POOL_PING_SEC = _env_float("WRAPPER_BACKEND_POOL_PING_SEC", 10.0, 0.5)
+BACKEND_POOL_MAX_IDLE_SEC = _env_float("WRAPPER_BACKEND_POOL_MAX_IDLE_SEC", 300.0, 1.0)
+
+# Several backend instances may be listed (host:port or ws:// URLs); jobs are
+# routed to the least loaded healthy one. Defaults to the single URL above.
+BACKEND_WS_URLS = parse_endpoint_urls(os.getenv("WRAPPER_BACKEND_URLS", ""), scheme=BACKEND_WS_SCHEME) or [BACKEND_WS_URL]
+BACKEND_ROUTING = os.getenv("WRAPPER_BACKEND_ROUTING", "least_inflight").strip().lower()
+BACKEND_PROBE_SEC = _env_float("WRAPPER_BACKEND_PROBE_SEC", 1.0, 0.1)
+# Warm standby backends (also listed in WRAPPER_BACKEND_URLS, or appended):
+# used only while no active backend can take a session
+BACKEND_STANDBY_URLS = parse_endpoint_urls(os.getenv("WRAPPER_BACKEND_STANDBY_URLS", ""), scheme=BACKEND_WS_SCHEME)
+BACKEND_WS_URLS += [url for url in BACKEND_STANDBY_URLS if url not in BACKEND_WS_URLS]
+# Circuit breaker per endpoint: FAILURE_THRESHOLD consecutive failures open it
+# and requests get 503 until the prober reconnects. A handshake slower than
+# CONNECT_TIMEOUT_SEC, or a session with no backend message FIRST_MESSAGE_TIMEOUT_SEC
+# after audio started (0 disables), counts as a failure.
+BACKEND_FAILURE_THRESHOLD = _env_int("WRAPPER_BACKEND_FAILURE_THRESHOLD", 3, 1)
+BACKEND_CONNECT_TIMEOUT_SEC = _env_float("WRAPPER_BACKEND_CONNECT_TIMEOUT_SEC", 5.0, 0.1)
+BACKEND_FIRST_MESSAGE_TIMEOUT_SEC = _env_float("WRAPPER_BACKEND_FIRST_MESSAGE_TIMEOUT_SEC", 30.0)
+_ROUTER: Optional[BackendRouter] = None
+# Readiness (GET /readyz): a configured backend reports its model loaded and warmed
+# (launcher health route) or accepts sessions. Time to the first ready check since
+# the API process started is recorded (time-to-ready).
+READY_PROBE_TIMEOUT_SEC = _env_float("WRAPPER_READY_PROBE_TIMEOUT_SEC", 2.0, 0.1)
+_PROCESS_STARTED = time.monotonic()
+_READY_AFTER_SEC: Optional[float] = None
+_READY_TASK: Optional[asyncio.Task] = None
+# Last active readiness check (finished at, result) and the one in flight
+_READY_CHECKED: Optional[tuple[float, bool]] = None
+_READY_CHECK: Optional[asyncio.Task] = None
+
+# "concurrent" receives backend snapshots while audio is still being sent;
+# "sequential" sends the whole file first. Frame size adapts between MIN/MAX.
+BACKEND_STREAM_MODE = os.getenv("WRAPPER_BACKEND_STREAM_MODE", "concurrent").strip().lower()
+if BACKEND_STREAM_MODE not in ("concurrent", "sequential"):
+    BACKEND_STREAM_MODE = "concurrent"
+BACKEND_FRAME_BYTES = _env_int("WRAPPER_BACKEND_FRAME_BYTES", 3200, 320)
+BACKEND_FRAME_MIN_BYTES = _env_int("WRAPPER_BACKEND_FRAME_MIN_BYTES", 3200, 320)
+BACKEND_FRAME_MAX_BYTES = _env_int("WRAPPER_BACKEND_FRAME_MAX_BYTES", 65536, 320)
+_STREAM_TIMINGS: dict[str, StreamTimings] = {}
+
+# Backend settings that change transcription output (passed by the GUI);
+# part of the result cache key so a model/language switch never reuses results
+BACKEND_CONFIG = {
+    "model": os.getenv("WRAPPER_MODEL", ""),
+    "backend": os.getenv("WRAPPER_ASR_BACKEND", ""),
+    "language": os.getenv("WRAPPER_LANGUAGE", ""),
+    "task": os.getenv("WRAPPER_TASK", ""),
+    "diarization": os.getenv("WRAPPER_DIARIZATION", "0") == "1",
+}
+# Model routing (WRAPPER_MODEL_ROUTING=1): a request 'model' other than the
+# configured one (or whisper-1) gets a backend of its own, started on first
+# use with the configured backend's launch settings (WRAPPER_BACKEND_SETTINGS,
+# JSON from the GUI/serve) and kept warm. Backends stay within
+# MEMORY_BUDGET_MB (0 = unlimited) by evicting the least recently used idle
+# ones. WRAPPER_MODEL_ALLOWED (comma separated) restricts the names.
+MODEL_ROUTING = os.getenv("WRAPPER_MODEL_ROUTING", "0") == "1"
+MODEL_ALLOWED = {name.strip() for name in os.getenv("WRAPPER_MODEL_ALLOWED", "").split(",") if name.strip()}
+MODEL_MEMORY_BUDGET_MB = _env_float("WRAPPER_MODEL_MEMORY_BUDGET_MB", 0.0)
+MODEL_LOAD_TIMEOUT_SEC = _env_float("WRAPPER_MODEL_LOAD_TIMEOUT_SEC", 600.0, 1.0)
+try:
+    MODEL_BACKEND_SETTINGS = loads_json(os.getenv("WRAPPER_BACKEND_SETTINGS") or "{}")
+except ValueError:
+    MODEL_BACKEND_SETTINGS = {}
+# 'model' values that mean the configured backend
+_DEFAULT_MODEL_NAMES = {"", "whisper-1", "default"}
+MODELS: Optional[ModelPool] = None
+# Result cache: in-memory LRU entries (0 disables) plus an optional disk tier
+# of DISK_MB megabytes under WRAPPER_RESULT_CACHE_DIR (default <cache>/results)
+RESULT_CACHE_SIZE = _env_int("WRAPPER_RESULT_CACHE_SIZE", 256)
+RESULT_CACHE_DISK_MB = _env_float("WRAPPER_RESULT_CACHE_DISK_MB", 0.0)
+_CACHE_ROOT = Path(os.getenv("WRAPPER_CACHE_DIR") or Path.home() / ".cache" / "WhisperLiveKitWrapper")
+RESULT_CACHE_DIR = Path(os.getenv("WRAPPER_RESULT_CACHE_DIR") or _CACHE_ROOT / "results")
+RESULT_CACHE = ResultCache(
+    RESULT_CACHE_SIZE,
+    disk_dir=RESULT_CACHE_DIR,
+    disk_max_bytes=int(RESULT_CACHE_DISK_MB * 1024 * 1024),
+)
+
+# Long-file mode: buffered uploads of at least MIN_SEC audio are split at quiet
+# points into ~CHUNK_SEC pieces that run on several workers in parallel
+# (0 disables; needs WRAPPER_BACKEND_MAX_CONCURRENCY > 1, off with diarization
+# because speaker numbers are per backend session)
+LONGFORM_MIN_SEC = _env_float("WRAPPER_LONGFORM_MIN_SEC", 600.0)
+LONGFORM_CHUNK_SEC = _env_float("WRAPPER_LONGFORM_CHUNK_SEC", 180.0, 10.0)
+
+# Silence stripping (buffered uploads): frames below THRESHOLD_DB dBFS for at
+# least MIN_SEC are cut down to PAD_SEC on each side before the audio is sent,
+# and result times are mapped back. Per request via the strip_silence field.
+SILENCE_STRIP = os.getenv("WRAPPER_SILENCE_STRIP", "0") == "1"
+SILENCE_OPTIONS = {
+    "threshold_db": _env_float("WRAPPER_SILENCE_THRESHOLD_DB", -45.0, -120.0),
+    "min_silence_sec": _env_float("WRAPPER_SILENCE_MIN_SEC", 2.0, 0.1),
+    "pad_sec": _env_float("WRAPPER_SILENCE_PAD_SEC", 0.3),
+}
+
+# Transcription responses longer than MIN_BYTES are streamed as they are
+# formatted and, unless WRAPPER_RESPONSE_COMPRESSION=0, gzip/zstd-encoded
+# when the client's Accept-Encoding allows it
+RESPONSE_COMPRESSION = os.getenv("WRAPPER_RESPONSE_COMPRESSION", "1") != "0"
+RESPONSE_COMPRESS_MIN_BYTES = _env_int("WRAPPER_RESPONSE_COMPRESS_MIN_BYTES", 1024, 1)
+
+# Asynchronous jobs (POST /v1/audio/transcriptions/jobs): at most MAX records,
+# finished ones are kept for TTL_SEC so clients can fetch their results
+JOBS = async_jobs.JobStore(
+    max_jobs=_env_int("WRAPPER_JOBS_MAX", 10000, 1),
+    ttl_sec=_env_float("WRAPPER_JOBS_TTL_SEC", 3600.0),
+)
+# WRAPPER_JOBS_DURABLE=1 journals async jobs in SQLite and spools their audio
+# under WRAPPER_JOBS_DIR (default <cache>/jobs); unfinished jobs resume on start
+JOBS_DURABLE = os.getenv("WRAPPER_JOBS_DURABLE", "0") == "1"
+JOBS_DIR = Path(os.getenv("WRAPPER_JOBS_DIR") or _CACHE_ROOT / "jobs")
+JOB_JOURNAL: Optional[JobJournal] = None
+
+# WAV/FLAC/PCM uploads are decoded in-process; other formats that must be
+# decoded here (long-file mode, silence stripping) use at most MAX_PROCS concurrent FFmpeg processes
+FFMPEG_POOL = FFmpegPool(_env_int("WRAPPER_FFMPEG_MAX_PROCS", 2, 1))
+
+# Prometheus metrics served at GET /metrics. The endpoint follows the API key
+# setting unless WRAPPER_METRICS_PUBLIC=1 (e.g. scraper on a trusted network).
+METRICS_PUBLIC = os.getenv("WRAPPER_METRICS_PUBLIC", "0") == "1"
+METRICS = Registry()
+_M_REQUESTS = METRICS.counter(
+    "wrapper_requests_total",
+    "Transcription requests by route, response_format and outcome.",
+    ("route", "response_format", "outcome"),
+)
+_M_REQUEST_SEC = METRICS.histogram(
+    "wrapper_request_duration_seconds",
+    "Time until response headers (streamed bodies continue after this).",
+    ("route", "response_format", "outcome"),
+)
+_M_JOBS = METRICS.counter(
+    "wrapper_backend_jobs_total",
+    "Backend jobs by response_format and outcome (ok, error, timeout, rejected, unavailable, cache_hit, coalesced).",
+    ("response_format", "outcome"),
+)
+_M_QUEUE_WAIT = METRICS.histogram(
+    "wrapper_queue_wait_seconds",
+    "Time from submission until a worker took the job (or it was given up).",
+    ("response_format", "outcome"),
+)
+_M_CONNECT = METRICS.histogram(
+    "wrapper_backend_connect_seconds",
+    "Time to obtain a backend session (pool hit or WebSocket handshake).",
+    ("outcome",),
+)
+_M_SEND = METRICS.histogram("wrapper_backend_send_seconds", "Time to send all audio frames and EOF.")
+_M_FIRST_SNAPSHOT = METRICS.histogram(
+    "wrapper_backend_first_snapshot_seconds", "Time from session start to the first non-empty snapshot."
+)
+_M_PROCESS = METRICS.histogram(
+    "wrapper_backend_processing_seconds",
+    "Worker time per job, from taking it to the final result.",
+    ("response_format", "outcome"),
+)
+_M_AUDIO = METRICS.counter(
+    "wrapper_audio_seconds_total", "Audio seconds transcribed by the backend.", ("response_format",)
+)
+_M_RTF = METRICS.histogram(
+    "wrapper_realtime_factor",
+    "Processing seconds per audio second for buffered uploads.",
+    ("response_format",),
+    RTF_BUCKETS,
+)
+_M_SILENCE = METRICS.counter(
+    "wrapper_silence_removed_seconds_total", "Audio seconds dropped by silence stripping before transcription."
+)
+_M_DECODE = METRICS.histogram(
+    "wrapper_decode_seconds",
+    "Time to decode an upload to 16 kHz mono PCM, by path (passthrough, inprocess, ffmpeg).",
+    ("path",),
+)
+METRICS.callback("wrapper_queue_depth", "Jobs waiting for a worker.", lambda: JOB_QUEUE.qsize())
+METRICS.callback("wrapper_queued_audio_seconds", "Audio seconds waiting for a worker.", lambda: ADMISSION.queued_audio_sec)
+METRICS.callback("wrapper_estimated_wait_seconds", "Estimated wait for a new job.", lambda: ADMISSION.estimated_wait())
+METRICS.callback(
+    "wrapper_time_to_ready_seconds",
+    "Seconds from API process start until a backend was first ready.",
+    lambda: _READY_AFTER_SEC,
+)
+# Identical buffered uploads submitted while one is in flight share its backend
+# job (WRAPPER_COALESCE=0 disables)
+COALESCER = SingleFlight(enabled=os.getenv("WRAPPER_COALESCE", "1") != "0")
+METRICS.callback("wrapper_workers", "Backend worker tasks (including draining ones).", lambda: len(_WORKERS))
+METRICS.callback("wrapper_workers_target", "Worker count the elastic pool is sized to.", lambda: AUTOSCALER.target)
+METRICS.callback("wrapper_workers_busy", "Workers currently running a job.", lambda: _BUSY_WORKERS)
+METRICS.callback(
+    "wrapper_backend_sessions_in_flight",
+    "Open backend sessions across endpoints.",
+    lambda: sum(ep.in_flight for ep in _ROUTER.endpoints) if _ROUTER is not None else 0,
+)
+METRICS.callback(
+    "wrapper_backend_circuit_open",
+    "Backend endpoints whose circuit breaker is open or half-open.",
+    lambda: sum(not ep.healthy for ep in _ROUTER.endpoints) if _ROUTER is not None else 0,
+)
+METRICS.callback(
+    "wrapper_result_cache_hits_total",
+    "Result cache hits (memory and disk).",
+    lambda: RESULT_CACHE.stats.memory_hits + RESULT_CACHE.stats.disk_hits,
+    kind="counter",
+)
+METRICS.callback(
+    "wrapper_result_cache_misses_total", "Result cache misses.", lambda: RESULT_CACHE.stats.misses, kind="counter"
+)
+
 # API key settings (provided by GUI via environment variables)
 REQUIRE_API_KEY = os.getenv("WRAPPER_REQUIRE_API_KEY", "0") == "1"
 API_KEY = os.getenv("WRAPPER_API_KEY", "")
+# /wrapper/admin/* always needs a key: WRAPPER_ADMIN_API_KEY, else WRAPPER_API_KEY
+ADMIN_API_KEY = os.getenv("WRAPPER_ADMIN_API_KEY", "")
+# Liveness/readiness probes never need a key (supervisors, load balancers)
+_PROBE_PATHS = {"/healthz", "/readyz"}
 
 
 def _extract_api_key_from_request(request: Request) -> str | None:
@@ -91,11 +416,14 @@ async def _startup_event() -> None:
 
 @app.on_event("shutdown")
 async def _shutdown_event() -> None:
+    await _shutdown_async_jobs()
     await _shutdown_backend_workers()
 
 
 @app.middleware("http")
 async def _api_key_middleware(request: Request, call_next):
+    if request.url.path in _PROBE_PATHS or (METRICS_PUBLIC and request.url.path == "/metrics"):
+        return await call_next(request)
     try:
         require_api_key_dep(request)
     except HTTPException as exc:
@@ -103,20 +431,70 @@ async def _api_key_middleware(request: Request, call_next):
     return await call_next(request)
 
 
+@app.middleware("http")
+async def _request_metrics_middleware(request: Request, call_next):
+    # Only transcription routes are recorded, keeping label cardinality fixed
+    if not request.url.path.startswith("/v1/audio/"):
+        return await call_next(request)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        path = request.url.path
+        rf = getattr(request.state, "response_format", "")
+        labels = {
+            "route": path if path in _METRIC_ROUTES else (
+                _JOB_ROUTE_PREFIX + "{id}" if path.startswith(_JOB_ROUTE_PREFIX) else "other"
+            ),
+            "response_format": rf if rf in _ALLOWED_RESPONSE_FORMATS or not rf else "invalid",
+            "outcome": _status_outcome(status),
+        }
+        _M_REQUESTS.inc(**labels)
+        _M_REQUEST_SEC.observe(time.perf_counter() - started, **labels)
+
+
+_METRIC_ROUTES = {
+    "/v1/audio/transcriptions",
+    "/v1/audio/transcriptions/stream",
+    "/v1/audio/transcriptions/raw",
+    "/v1/audio/transcriptions/jobs",
+}
+_JOB_ROUTE_PREFIX = "/v1/audio/transcriptions/jobs/"
+
+
+def _status_outcome(status: int) -> str:
+    if status < 400:
+        return "ok"
+    if status == 429:
+        return "rejected"
+    if status == 503:
+        return "unavailable"
+    return "client_error" if status < 500 else "error"
+
+
 # -----------------------------
 # OpenAI-style error formatting
 # -----------------------------
-def _openai_error_response(message: str, status_code: int) -> JSONResponse:
+def _openai_error_type(status_code: int) -> str:
     if status_code == 401:
-        err_type = "authentication_error"
-    elif status_code == 400:
-        err_type = "invalid_request_error"
-    else:
-        err_type = "server_error"
-    return JSONResponse(status_code=status_code, content={
+        return "authentication_error"
+    if status_code == 429:
+        return "rate_limit_error"
+    if status_code == 400:
+        return "invalid_request_error"
+    if status_code == 403:
+        return "permission_error"
+    return "server_error"
+
+
+def _openai_error_response(message: str, status_code: int, headers: Optional[dict] = None) -> JSONResponse:
+    return JSONResponse(status_code=status_code, headers=headers, content={
         "error": {
             "message": message,
-            "type": err_type,
+            "type": _openai_error_type(status_code),
             "code": None,
         }
     })
@@ -125,7 +503,7 @@ def _openai_error_response(message: str, status_code: int) -> JSONResponse:
 async def _ensure_backend_workers() -> None:
     """Start backend worker tasks on demand."""
 
-    global _WORKERS_STARTED, _WORKER_LOCK
+    global _WORKERS_STARTED, _WORKER_LOCK, _ROUTER, _AUTOSCALE_TASK, MODELS, _READY_TASK
     if _WORKERS_STARTED:
         return
 
@@ -135,71 +513,687 @@ async def _ensure_backend_workers() -> None:
     async with _WORKER_LOCK:
         if _WORKERS_STARTED:
             return
-        loop = asyncio.get_running_loop()
-        for idx in range(BACKEND_MAX_CONCURRENCY):
-            task = loop.create_task(_backend_worker(idx + 1))
-            _WORKERS.append(task)
+        _ROUTER = _build_backend_router()
+        _ROUTER.start()
+        if MODEL_ROUTING and MODELS is None:
+            MODELS = _build_model_pool()
+        _resize_workers()
+        _AUTOSCALE_TASK = asyncio.get_running_loop().create_task(_autoscale_loop())
+        if _READY_AFTER_SEC is None:
+            _READY_TASK = asyncio.get_running_loop().create_task(_watch_ready())
+        if JOBS_DURABLE and JOB_JOURNAL is None:
+            await _resume_async_jobs()
         _WORKERS_STARTED = True
 
 
 async def _shutdown_backend_workers() -> None:
     """Cancel worker tasks during application shutdown."""
 
-    global _WORKERS_STARTED
+    global _WORKERS_STARTED, _ROUTER, _AUTOSCALE_TASK, MODELS, _READY_TASK
     if not _WORKERS_STARTED:
         return
-    for task in _WORKERS:
+    tasks = list(_WORKERS.values())
+    for task in (_AUTOSCALE_TASK, _READY_TASK):
+        if task is not None and not task.done():
+            tasks.append(task)
+    _AUTOSCALE_TASK = _READY_TASK = None
+    for task in tasks:
         task.cancel()
-    for task in _WORKERS:
+    for task in tasks:
         try:
             await task
         except asyncio.CancelledError:
             continue
     _WORKERS.clear()
+    if _ROUTER is not None:
+        await _ROUTER.close()
+        _ROUTER = None
+    if MODELS is not None:
+        await MODELS.close()
+        MODELS = None
     _WORKERS_STARTED = False
 
 
-async def _backend_worker(worker_id: int) -> None:
+def _resize_workers() -> None:
+    """Start workers up to ``AUTOSCALER.target`` and retire the ones above it.
+
+    Idle workers above the target stop at once; busy ones finish their
+    current job first (draining) and then exit.
+    """
+    target = AUTOSCALER.target
+    ADMISSION.workers = target
+    loop = asyncio.get_running_loop()
+    for worker_id in range(1, target + 1):
+        task = _WORKERS.get(worker_id)
+        if task is None or task.done():
+            _WORKERS[worker_id] = loop.create_task(_backend_worker(worker_id))
+    for worker_id, task in list(_WORKERS.items()):
+        if worker_id > target and worker_id in _IDLE_WORKERS:
+            task.cancel()
+
+
+async def _autoscale_loop() -> None:
     while True:
-        job = await JOB_QUEUE.get()
-        future = job.future
-        try:
-            if future.cancelled():
-                continue
-            texts, lines = await _stream_to_backend(job.audio_bytes)
-        except asyncio.CancelledError:
-            if not future.done():
-                future.set_exception(asyncio.CancelledError())
-            raise
-        except Exception as exc:  # noqa: BLE001
-            if not future.done():
-                future.set_exception(exc)
-        else:
-            if not future.done():
-                future.set_result((texts, lines))
-        finally:
-            JOB_QUEUE.task_done()
+        await asyncio.sleep(AUTOSCALE_INTERVAL_SEC)
+        if not AUTOSCALER.elastic:
+            continue
+        before = AUTOSCALER.target
+        if AUTOSCALER.decide(JOB_QUEUE.qsize(), _BUSY_WORKERS) != before:
+            _resize_workers()
 
 
-async def _submit_backend_job(pcm_bytes: bytes) -> tuple[list[str], list[dict]]:
+async def _backend_reachable() -> bool:
+    """True when a configured backend accepts sessions (loaded and warmed).
+
+    An idle pooled session vouches for its endpoint; otherwise the admitting
+    endpoints are checked (the launcher's health route, else a handshake).
+    Once ready, that check is reused for ``WRAPPER_BACKEND_PROBE_SEC`` and
+    shared by concurrent callers, so polling /readyz while every session is
+    checked out (full load) does not add connections to a busy backend.
+    """
+    global _READY_CHECK
     await _ensure_backend_workers()
-    loop = asyncio.get_running_loop()
-    future: asyncio.Future = loop.create_future()
-    job = BackendJob(audio_bytes=pcm_bytes, future=future)
-    JOB_QUEUE.put_nowait(job)
+    endpoints = [endpoint for endpoint in _ROUTER.endpoints if endpoint.admits()]
+    if any(endpoint.pool.idle for endpoint in endpoints):
+        ready = True
+    elif (
+        _READY_AFTER_SEC is not None
+        and _READY_CHECKED is not None
+        and time.monotonic() - _READY_CHECKED[0] < BACKEND_PROBE_SEC
+    ):
+        ready = _READY_CHECKED[1]
+    else:
+        if _READY_CHECK is None or _READY_CHECK.done():
+            _READY_CHECK = asyncio.get_running_loop().create_task(_check_endpoints(endpoints))
+        ready = await asyncio.shield(_READY_CHECK)
+    _mark_ready(ready)
+    return ready
+
+
+async def _check_endpoints(endpoints: List[BackendEndpoint]) -> bool:
+    global _READY_CHECKED
+    checks = await asyncio.gather(*(endpoint.check(READY_PROBE_TIMEOUT_SEC) for endpoint in endpoints))
+    _READY_CHECKED = (time.monotonic(), any(checks))
+    return _READY_CHECKED[1]
+
+
+def _mark_ready(ready: bool) -> None:
+    global _READY_AFTER_SEC
+    if ready and _READY_AFTER_SEC is None:
+        _READY_AFTER_SEC = time.monotonic() - _PROCESS_STARTED
+
+
+async def _watch_ready() -> None:
+    """Record time-to-ready even when nothing polls /readyz."""
+    while not await _backend_reachable():
+        await asyncio.sleep(0.25)
+
+
+def _worker_stats() -> dict:
+    return {
+        **AUTOSCALER.snapshot(),
+        "running": len(_WORKERS),
+        "busy": _BUSY_WORKERS,
+        "draining": sum(1 for worker_id in _WORKERS if worker_id > AUTOSCALER.target),
+    }
+
+
+def _build_backend_router(urls: Optional[List[str]] = None) -> BackendRouter:
+    """Create one endpoint (with its idle session pool) per backend URL.
 
+    Idle sessions are sized per worker: each endpoint keeps
+    ``WRAPPER_BACKEND_POOL_SIZE`` sessions for every worker expected to route
+    to it. ``urls`` defaults to the configured backends.
+    """
+    urls = urls or BACKEND_WS_URLS
+    workers_per_endpoint = math.ceil(AUTOSCALER.maximum / len(urls))
+    endpoints = [
+        BackendEndpoint(
+            url,
+            BackendConnectionPool(
+                url,
+                BACKEND_POOL_SIZE * workers_per_endpoint,
+                ping_interval=BACKEND_POOL_PING_SEC,
+                max_idle_sec=BACKEND_POOL_MAX_IDLE_SEC,
+                connect_timeout=BACKEND_CONNECT_TIMEOUT_SEC,
+            ),
+            standby=url in BACKEND_STANDBY_URLS,
+        )
+        for url in urls
+    ]
+    return BackendRouter(
+        endpoints,
+        strategy=BACKEND_ROUTING,
+        failure_threshold=BACKEND_FAILURE_THRESHOLD,
+        probe_interval=BACKEND_PROBE_SEC,
+        probe_timeout=BACKEND_CONNECT_TIMEOUT_SEC,
+    )
+
+
+def _model_backend_command(model: str, port: int) -> List[str]:
+    """backend_launcher command for ``model``: the configured backend's settings, another model."""
+    from wrapper.app import launch  # GUI-side module (model paths); only needed with model routing
+
+    settings = {**launch.DEFAULT_SETTINGS, **MODEL_BACKEND_SETTINGS, "model": model, "backend_host": "127.0.0.1"}
+    if not MODEL_BACKEND_SETTINGS:
+        settings.update({key: BACKEND_CONFIG[key] for key in ("backend", "language", "task") if BACKEND_CONFIG[key]})
+    return launch.backend_command(settings, diarization=BACKEND_CONFIG["diarization"], port=port)
+
+
+def _build_model_pool() -> ModelPool:
+    return ModelPool(
+        command=_model_backend_command,
+        make_router=lambda port: _build_backend_router([f"{BACKEND_WS_SCHEME}://127.0.0.1:{port}/asr"]),
+        budget_mb=MODEL_MEMORY_BUDGET_MB,
+        load_timeout=MODEL_LOAD_TIMEOUT_SEC,
+    )
+
+
+async def _requested_model(name: Optional[str]) -> Optional[str]:
+    """Model a request is routed to, or None for the configured backend."""
+    name = (name or "").strip()
+    if not MODEL_ROUTING or name in _DEFAULT_MODEL_NAMES or name == BACKEND_CONFIG["model"]:
+        return None
+    if MODEL_ALLOWED and name not in MODEL_ALLOWED:
+        raise HTTPException(status_code=400, detail=f"Unknown model '{name}'. Available: {', '.join(sorted(MODEL_ALLOWED))}.")
+    if MODELS is None or name not in MODELS.backends:
+        from wrapper.app import model_manager
+
+        # Filesystem checks: keep them off the event loop
+        downloaded = await asyncio.to_thread(
+            model_manager.is_model_downloaded, name, backend=BACKEND_CONFIG["backend"] or None
+        )
+        if not downloaded:
+            raise HTTPException(status_code=400, detail=f"Model '{name}' is not downloaded.")
+    return name
+
+
+def _backend_pool_stats() -> dict:
+    """Aggregate connection pool counters across backend endpoints."""
+    totals: dict[str, int] = {"hits": 0, "misses": 0, "opened": 0, "discarded": 0, "failures": 0, "idle": 0}
+    if _ROUTER is not None:
+        for endpoint in _ROUTER.endpoints:
+            stats = {**endpoint.pool.stats.as_dict(), "idle": endpoint.pool.idle}
+            for key, value in stats.items():
+                totals[key] += value
+    return {"size_per_worker": BACKEND_POOL_SIZE, **totals}
+
+
+async def _backend_worker(worker_id: int) -> None:
     try:
-        if _QUEUE_TIMEOUT is None:
-            texts, lines = await future
-        else:
-            texts, lines = await asyncio.wait_for(future, timeout=_QUEUE_TIMEOUT)
-    except asyncio.TimeoutError as exc:
+        # Workers above the target retire; a busy one finishes its job first
+        while worker_id <= AUTOSCALER.target:
+            _IDLE_WORKERS.add(worker_id)
+            try:
+                job = await JOB_QUEUE.get()
+            except asyncio.CancelledError:
+                if worker_id > AUTOSCALER.target:
+                    return  # retired while idle
+                raise
+            finally:
+                _IDLE_WORKERS.discard(worker_id)
+            await _run_worker_job(job)
+    finally:
+        if _WORKERS.get(worker_id) is asyncio.current_task():
+            del _WORKERS[worker_id]
+
+
+async def _run_worker_job(job: BackendJob) -> None:
+    global _BUSY_WORKERS
+    future = job.future
+    ADMISSION.dequeued(job.duration_sec, len(job.audio_bytes))
+    rf = job.response_format
+    _M_QUEUE_WAIT.observe(
+        time.monotonic() - job.enqueued_at,
+        response_format=rf,
+        outcome="cancelled" if future.cancelled() else "started",
+    )
+    ok = False
+    ran = False
+    concurrency = 0
+    started = time.monotonic()
+    try:
+        if future.cancelled():
+            return
+        ADMISSION.started(job, job.duration_sec)
+        job.started_at = started
+        _BUSY_WORKERS += 1
+        concurrency = _BUSY_WORKERS
+        ran = True
+        session = asyncio.ensure_future(_stream_to_backend(
+            job.audio_bytes,
+            job.router or _ROUTER,
+            audio_stream=job.audio_stream,
+            on_snapshot=job.on_snapshot,
+            wait_for_backend=not job.fail_fast,
+        ))
+        # A submitter that gives up (cancelled async job, timeout) frees the worker
+        future.add_done_callback(lambda f: session.cancel() if f.cancelled() else None)
+        texts, lines = await session
+    except asyncio.CancelledError:
+        if future.cancelled() and not asyncio.current_task().cancelling():
+            return
+        if not future.done():
+            future.set_exception(asyncio.CancelledError())
+        raise
+    except Exception as exc:  # noqa: BLE001
+        if not future.done():
+            future.set_exception(exc)
+    else:
+        ok = True
         if not future.done():
+            future.set_result((texts, lines))
+    finally:
+        elapsed = time.monotonic() - started
+        if ran:
+            _BUSY_WORKERS -= 1
+            _record_job_metrics(job, elapsed, ok)
+        # Streamed uploads are paced by the client, so only buffered jobs measure RTF
+        measure = ok and job.audio_stream is None
+        ADMISSION.finished(job, job.duration_sec, measure=measure)
+        if measure and job.duration_sec:
+            AUTOSCALER.observe(elapsed / job.duration_sec, concurrency)
+        JOB_QUEUE.task_done()
+
+
+def _record_job_metrics(job: BackendJob, elapsed: float, ok: bool) -> None:
+    rf = job.response_format
+    _M_JOBS.inc(response_format=rf, outcome="ok" if ok else "error")
+    _M_PROCESS.observe(elapsed, response_format=rf, outcome="ok" if ok else "error")
+    if ok and job.duration_sec:
+        _M_AUDIO.inc(job.duration_sec, response_format=rf)
+        if job.audio_stream is None:
+            _M_RTF.observe(elapsed / job.duration_sec, response_format=rf)
+
+
+async def _submit_backend_job(
+    pcm_bytes: bytes,
+    audio_stream: Optional[AsyncIterator[bytes]] = None,
+    on_snapshot: Optional[Callable[[List[dict]], None]] = None,
+    *,
+    priority: int = 0,
+    client: str = "",
+    duration_sec: Optional[float] = None,
+    response_format: str = "",
+    admitted: bool = False,
+    wait_timeout: Optional[float] = _CONFIGURED_TIMEOUT,
+    on_queued: Optional[Callable[[BackendJob], None]] = None,
+    coalesce_key: Optional[str] = None,
+    fail_fast: bool = True,
+    router: Optional[BackendRouter] = None,
+) -> tuple[list[str], list[dict]]:
+    """Queue a backend job and wait for its ``(texts, lines)``.
+
+    With ``coalesce_key``, a submission identical to one still queued or
+    running waits for that job's result instead of queueing its own (raising
+    the job's priority and clearing ``fail_fast`` to cover the joiner). While
+    every backend breaker is open the job is refused with
+    ``BackendUnavailable`` unless ``fail_fast`` is False. ``router`` sends
+    the job to a requested model's backend instead of the configured ones.
+    """
+    await _ensure_backend_workers()
+    if wait_timeout is _CONFIGURED_TIMEOUT:
+        wait_timeout = _QUEUE_TIMEOUT
+    flight = COALESCER.join(coalesce_key if audio_stream is None else None)
+    if flight is not None:
+        # Shares work already admitted and queued
+        _M_JOBS.inc(response_format=response_format, outcome="coalesced")
+        job = flight.job
+        # The shared job serves its most demanding caller: wait out open
+        # breakers if anyone would, and run at the highest priority
+        job.fail_fast = job.fail_fast and fail_fast
+        if priority > job.priority:
+            job.priority = priority
+            JOB_QUEUE.reprioritize(job)
+    else:
+        # ``admitted``: the caller already passed admission for a larger unit (long-file chunks)
+        rejection = None if admitted else ADMISSION.check(duration_sec, len(pcm_bytes))
+        if rejection is not None:
+            _M_JOBS.inc(response_format=response_format, outcome="rejected")
+            raise AdmissionRejected(rejection)
+        target = router or _ROUTER
+        if fail_fast and target is not None and not target.available():
+            _M_JOBS.inc(response_format=response_format, outcome="unavailable")
+            raise target.unavailable_error()
+        loop = asyncio.get_running_loop()
+        job = BackendJob(
+            audio_bytes=pcm_bytes,
+            future=loop.create_future(),
+            audio_stream=audio_stream,
+            on_snapshot=on_snapshot,
+            priority=priority,
+            client=client,
+            duration_sec=duration_sec,
+            response_format=response_format,
+            enqueued_at=time.monotonic(),
+            fail_fast=fail_fast,
+            router=router,
+        )
+        flight = COALESCER.lead(coalesce_key if audio_stream is None else None, job, job.future)
+        if flight is not None:
+            job.on_snapshot = flight.publish
+        JOB_QUEUE.put_nowait(job)
+        ADMISSION.enqueued(duration_sec, len(pcm_bytes))
+    if on_queued is not None:
+        on_queued(job)
+    future = job.future
+    if flight is not None:
+        flight.waiters += 1
+        if on_snapshot is not None:
+            flight.subscribe(on_snapshot)
+
+    try:
+        # A shared job outlives callers that give up while others still wait
+        waiter = asyncio.shield(future) if flight is not None else future
+        if wait_timeout is None:
+            texts, lines = await waiter
+        else:
+            texts, lines = await asyncio.wait_for(waiter, timeout=wait_timeout)
+    except asyncio.CancelledError:
+        if flight is None or flight.waiters == 1:
+            # Do not leave a job nobody waits for in the queue
             future.cancel()
+            if JOB_QUEUE.remove(job):
+                ADMISSION.dequeued(job.duration_sec, len(job.audio_bytes))
+                _M_QUEUE_WAIT.observe(
+                    time.monotonic() - job.enqueued_at, response_format=job.response_format, outcome="cancelled"
+                )
+        raise
+    except asyncio.TimeoutError as exc:
+        if flight is None or flight.waiters == 1:
+            if not future.done():
+                future.cancel()
+            if JOB_QUEUE.remove(job):
+                ADMISSION.dequeued(job.duration_sec, len(job.audio_bytes))
+                _M_QUEUE_WAIT.observe(
+                    time.monotonic() - job.enqueued_at, response_format=job.response_format, outcome="timeout"
+                )
+        _M_JOBS.inc(response_format=response_format, outcome="timeout")
         raise exc
+    finally:
+        if flight is not None:
+            flight.waiters -= 1
+            if on_snapshot is not None:
+                flight.unsubscribe(on_snapshot)
     return texts, lines
 
 
+def _clamp_priority(value: object) -> int:
+    try:
+        prio = int(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return 0
+    return max(-SCHEDULER_MAX_PRIORITY, min(SCHEDULER_MAX_PRIORITY, prio))
+
+
+def _client_identity(request: Request, user: Optional[str] = None) -> str:
+    """Fairness identity: a hash of the API key, else the OpenAI 'user' field, else the peer address."""
+    key = _extract_api_key_from_request(request)
+    if key:
+        return "key:" + hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+    if user:
+        return f"user:{user}"
+    host = request.client.host if request.client else ""
+    return f"ip:{host}" if host else ""
+
+
+def _result_key(audio_digest: str, variant: str, model: Optional[str] = None) -> str:
+    """Identity of a result: upload hash, how the bytes are interpreted and the backend config."""
+    config = BACKEND_CONFIG if model is None else {**BACKEND_CONFIG, "model": model}
+    return make_key(audio_digest, {**config, "input": variant})
+
+
+def _result_cache_key(audio_digest: str, variant: str, model: Optional[str] = None) -> Optional[str]:
+    return _result_key(audio_digest, variant, model) if RESULT_CACHE.enabled else None
+
+
+async def _sha256_hex(data: bytes) -> str:
+    # hashlib releases the GIL on large buffers; keep big uploads off the event loop
+    if len(data) >= 1 << 20:
+        return await asyncio.to_thread(lambda: hashlib.sha256(data).hexdigest())
+    return hashlib.sha256(data).hexdigest()
+
+
+async def _hashing_stream(stream: AsyncIterator[bytes], digest) -> AsyncIterator[bytes]:
+    """Pass ``stream`` through while feeding every piece into ``digest``."""
+    async for piece in stream:
+        digest.update(piece)
+        yield piece
+
+
+async def _store_result(cache_key: Optional[str], lines: List[dict]) -> None:
+    # Empty results are not cached: they are as likely a hiccup as real silence
+    if cache_key is not None and lines:
+        await RESULT_CACHE.put(cache_key, lines)
+
+
+def _unavailable_http_error(exc: BackendUnavailable) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f"Backend unavailable: {exc}",
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
+def _admission_http_error(exc: AdmissionRejected) -> HTTPException:
+    rejection = exc.rejection
+    return HTTPException(
+        status_code=rejection.status_code,
+        detail=rejection.message,
+        headers={"Retry-After": str(rejection.retry_after)},
+    )
+
+
+async def _check_admission(
+    cache_key: Optional[str], duration_sec: Optional[float], nbytes: int, *, model: Optional[str] = None
+) -> None:
+    """Refuse a job before a streaming response starts (cache hits always pass)."""
+    if cache_key is not None and RESULT_CACHE.contains(cache_key):
+        return
+    if model is None and _ROUTER is not None and not _ROUTER.available():
+        raise _unavailable_http_error(_ROUTER.unavailable_error())
+    rejection = ADMISSION.check(duration_sec, nbytes)
+    if rejection is not None:
+        raise _admission_http_error(AdmissionRejected(rejection))
+
+
+async def _cached_result(cache_key: Optional[str], response_format: str) -> Optional[tuple[list[str], list[dict]]]:
+    if cache_key is None:
+        return None
+    cached = await RESULT_CACHE.get(cache_key)
+    if cached is None:
+        return None
+    _M_JOBS.inc(response_format=response_format, outcome="cache_hit")
+    return _texts_from_lines(cached), cached
+
+
+def _long_file_eligible(duration_sec: Optional[float]) -> bool:
+    return (
+        LONGFORM_MIN_SEC > 0
+        and AUTOSCALER.maximum > 1
+        and not BACKEND_CONFIG["diarization"]
+        and longform.available()
+        and duration_sec is not None
+        and duration_sec >= LONGFORM_MIN_SEC
+    )
+
+
+async def _run_long_file_job(
+    raw: bytes,
+    filename: str,
+    decoded: Optional[DecodedAudio],
+    *,
+    cache_key: Optional[str] = None,
+    duration_sec: Optional[float] = None,
+    offsets: Optional[silence.OffsetMap] = None,
+    **job_options,
+) -> Optional[tuple[list[str], list[dict]]]:
+    """Transcribe a long upload as silence-aligned chunks on parallel workers.
+
+    Admission is decided once for the whole file. ``decoded`` is reused when
+    the upload was already decoded in-process (``offsets`` maps it back to
+    the upload's timeline if silence was stripped). Returns None when the
+    audio cannot be decoded here (the caller then uses a single session).
+    """
+    cached = await _cached_result(cache_key, job_options.get("response_format", ""))
+    if cached is not None:
+        return cached
+    if not job_options.pop("admitted", False):
+        await _check_admission(None, duration_sec, len(raw), model=job_options.get("model"))
+    if decoded is None:
+        try:
+            decoded = await _decode_upload(raw, filename)
+        except HTTPException:
+            return None
+    pcm = decoded.pcm
+    ranges = await asyncio.to_thread(longform.plan_chunks, pcm, target_sec=LONGFORM_CHUNK_SEC)
+    # Chunking is deterministic, so a duplicate upload coalesces chunk by chunk
+    coalesce_key = job_options.pop("coalesce_key", None)
+    tasks = [
+        asyncio.ensure_future(
+            _run_backend_job(
+                _wrap_pcm16_as_wav(pcm[start:end], 16000, 1),
+                duration_sec=(end - start) / 32000,
+                admitted=True,
+                coalesce_key=f"{coalesce_key}:{start}-{end}" if coalesce_key else None,
+                **job_options,
+            )
+        )
+        for start, end in ranges
+    ]
+    try:
+        results = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+    chunk_starts = longform.chunk_offsets(ranges)
+    lines = longform.stitch_lines(list(zip(chunk_starts, (chunk_lines for _texts, chunk_lines in results))))
+    if offsets is not None:
+        lines = silence.remap_lines(lines, offsets)
+    await _store_result(cache_key, lines)
+    return _texts_from_lines(lines), lines
+
+
+async def _run_backend_job(
+    pcm_bytes: bytes,
+    *,
+    cache_key: Optional[str] = None,
+    offsets: Optional[silence.OffsetMap] = None,
+    **job_options,
+) -> tuple[list[str], list[dict]]:
+    """Submit a backend job, mapping queue/backend failures to HTTP errors.
+
+    With ``cache_key`` a cached result is returned without queueing, and a
+    fresh result is stored. ``offsets`` maps snapshot and result times of
+    silence-stripped audio back to the original timeline. ``model`` (see
+    ``_requested_model``) is loaded if needed and kept from eviction until
+    the job is done. ``job_options`` go to ``_submit_backend_job``.
+    """
+    cached = await _cached_result(cache_key, job_options.get("response_format", ""))
+    if cached is not None:
+        return cached
+    on_snapshot = job_options.get("on_snapshot")
+    if offsets is not None and on_snapshot is not None:
+        job_options["on_snapshot"] = lambda snapshot: on_snapshot(silence.remap_lines(snapshot, offsets))
+    model = job_options.pop("model", None)
+    backend = None
+    try:
+        if model is not None:
+            await _ensure_backend_workers()
+            backend = await MODELS.acquire(model, wait=not job_options.get("fail_fast", True))
+            job_options["router"] = backend.router
+        texts, lines = await _submit_backend_job(pcm_bytes, **job_options)
+    except AdmissionRejected as exc:
+        raise _admission_http_error(exc)
+    except BackendUnavailable as exc:
+        raise _unavailable_http_error(exc)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="Backend busy: queue wait time exceeded before processing could start.",
+        )
+    except Exception as e:  # noqa: BLE001
+        raise HTTPException(status_code=500, detail=f"Backend processing failed: {e}")
+    finally:
+        if backend is not None:
+            MODELS.release(backend)
+    if offsets is not None:
+        lines = silence.remap_lines(lines, offsets)
+    await _store_result(cache_key, lines)
+    return texts, lines
+
+
+async def _prepare_upload(
+    raw: bytes,
+    name: str,
+    *,
+    response_format: str,
+    priority: object,
+    client: str,
+    strip_silence: Optional[bool],
+    model: Optional[str] = None,
+) -> tuple[bytes, Optional[DecodedAudio], dict, Optional[dict]]:
+    """Decide what to send for a buffered upload.
+
+    Returns ``(to_send, decoded, job_options, headers)``; ``job_options`` go
+    to ``_run_buffered_job`` and ``headers`` onto the response. ``model`` is
+    a routed model (``_requested_model``) or None.
+    """
+    # Decide what to send to backend FFmpeg stdin (expects a recognizable container)
+    # - WAV/FLAC/PCM (sniffed by magic bytes): decoded here and sent as 16kHz/mono
+    #   WAV, so the backend FFmpeg only parses a header instead of resampling
+    # - Else: send original bytes (mp3/m4a/webm/ogg...)
+    fmt = sniff_format(raw, name)
+    decoded = await _decode_upload(raw, name, allow_ffmpeg=False) if fmt in IN_PROCESS_FORMATS else None
+    stripped: Optional[silence.StrippedAudio] = None
+    if (SILENCE_STRIP if strip_silence is None else strip_silence) and silence.available():
+        if decoded is None:
+            try:
+                decoded = await _decode_upload(raw, name)
+            except HTTPException:
+                pass  # FFmpeg unavailable or failed: let the backend try the original
+        if decoded is not None:
+            stripped = await asyncio.to_thread(silence.strip_silence, decoded.pcm, **SILENCE_OPTIONS)
+            _M_SILENCE.inc(stripped.removed_sec)
+            decoded = DecodedAudio(stripped.pcm, decoded.source_format, decoded.path)
+    if decoded is None or (decoded.path == "passthrough" and fmt == "wav" and not (stripped and stripped.removed_sec)):
+        to_send = raw
+    else:
+        to_send = _wrap_pcm16_as_wav(decoded.pcm, 16000, 1)
+    variant = "pcm16:16000:1" if fmt == "pcm" else "container"
+    if stripped is not None:
+        variant += ";silence={threshold_db}:{min_silence_sec}:{pad_sec}".format(**SILENCE_OPTIONS)
+    result_key = _result_key(await _sha256_hex(raw), variant, model)
+    job_options = {
+        "priority": _clamp_priority(priority),
+        "client": client,
+        "duration_sec": decoded.duration_sec if decoded is not None else probe_duration_seconds(raw, name),
+        "response_format": response_format,
+        "cache_key": result_key if RESULT_CACHE.enabled else None,
+        "coalesce_key": result_key if COALESCER.enabled else None,
+        "offsets": stripped.offsets if stripped is not None else None,
+        "model": model,
+    }
+    headers = {"X-Wrapper-Silence-Removed-Percent": f"{stripped.removed_percent:.1f}"} if stripped is not None else None
+    return to_send, decoded, job_options, headers
+
+
+async def _run_buffered_job(
+    raw: bytes,
+    name: str,
+    to_send: bytes,
+    decoded: Optional[DecodedAudio],
+    **job_options,
+) -> tuple[list[str], list[dict]]:
+    """Run a prepared upload, as parallel chunks when it is long enough."""
+    if _long_file_eligible(job_options.get("duration_sec")):
+        result = await _run_long_file_job(raw, name, decoded, **job_options)
+        if result is not None:
+            return result
+    return await _run_backend_job(to_send, **job_options)
+
+
 @app.exception_handler(HTTPException)
 async def _http_exception_handler(_request: Request, exc: HTTPException):
     detail = exc.detail if isinstance(exc.detail, str) else str(exc.detail)
@@ -212,7 +1206,7 @@ async def _http_exception_handler(_request: Request, exc: HTTPException):
         return _openai_error_response("FFmpeg is not installed or not in PATH.", 500)
     if detail == "ffmpeg_failed":
         return _openai_error_response("FFmpeg failed to decode the provided audio.", 400)
-    return _openai_error_response(detail or "Unhandled error.", exc.status_code)
+    return _openai_error_response(detail or "Unhandled error.", exc.status_code, getattr(exc, "headers", None))
 
 
 @app.exception_handler(Exception)
@@ -225,54 +1219,23 @@ async def _validation_exception_handler(_request: Request, exc: RequestValidatio
     return _openai_error_response(f"Invalid request: {exc}", 400)
 
 
-def _convert_to_pcm16(file_bytes: bytes) -> bytes:
-    """Convert arbitrary audio bytes to 16kHz mono PCM using ffmpeg."""
+async def _decode_upload(file_bytes: bytes, filename: str, *, allow_ffmpeg: bool = True) -> Optional[DecodedAudio]:
+    """Decode an upload to PCM16/16kHz/mono (WAV/FLAC/PCM in-process, else FFmpeg).
+
+    Without ``allow_ffmpeg`` returns None when the in-process decoder cannot
+    handle the input, so the caller can forward the original container.
+    """
+    started = time.perf_counter()
     try:
-        proc = subprocess.run(
-            [
-                "ffmpeg",
-                "-i",
-                "pipe:0",
-                "-f",
-                "s16le",
-                "-ac",
-                "1",
-                "-ar",
-                "16000",
-                "pipe:1",
-            ],
-            input=file_bytes,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True,
-        )
-    except FileNotFoundError as e:
+        decoded = await decode_to_pcm16(file_bytes, filename, FFMPEG_POOL if allow_ffmpeg else None)
+    except FFmpegNotFound as e:
         raise HTTPException(status_code=500, detail="ffmpeg_not_found") from e
-    except subprocess.CalledProcessError as e:
+    except DecodeError as e:
+        if not allow_ffmpeg:
+            return None
         raise HTTPException(status_code=400, detail="ffmpeg_failed") from e
-    return proc.stdout
-
-
-def _extract_pcm16(upload: UploadFile, file_bytes: bytes) -> bytes:
-    """Deprecated in route: prefer container bytes for FFmpeg stdin.
-
-    Kept for potential future use. Returns PCM16/16kHz/mono.
-    """
-    name = (upload.filename or "").lower()
-    if name.endswith(".raw"):
-        return file_bytes
-    if name.endswith(".wav"):
-        try:
-            with wave.open(io.BytesIO(file_bytes)) as wf:
-                if (
-                    wf.getframerate() == 16000
-                    and wf.getnchannels() == 1
-                    and wf.getsampwidth() == 2
-                ):
-                    return wf.readframes(wf.getnframes())
-        except wave.Error:
-            pass
-    return _convert_to_pcm16(file_bytes)
+    _M_DECODE.observe(time.perf_counter() - started, path=decoded.path)
+    return decoded
 
 
 def _wrap_pcm16_as_wav(pcm_bytes: bytes, sample_rate: int = 16000, channels: int = 1) -> bytes:
@@ -286,128 +1249,462 @@ def _wrap_pcm16_as_wav(pcm_bytes: bytes, sample_rate: int = 16000, channels: int
     return buf.getvalue()
 
 
-async def _stream_to_backend(pcm_bytes: bytes):
+def _streaming_wav_header(sample_rate: int = 16000, channels: int = 1) -> bytes:
+    """WAV header for PCM16 of unknown length (sizes set to the 0xFFFFFFFF sentinel)."""
+    byte_rate = sample_rate * channels * 2
+    return b"".join([
+        b"RIFF", (0xFFFFFFFF).to_bytes(4, "little"), b"WAVE",
+        b"fmt ", (16).to_bytes(4, "little"), (1).to_bytes(2, "little"), channels.to_bytes(2, "little"),
+        sample_rate.to_bytes(4, "little"), byte_rate.to_bytes(4, "little"),
+        (channels * 2).to_bytes(2, "little"), (16).to_bytes(2, "little"),
+        b"data", (0xFFFFFFFF).to_bytes(4, "little"),
+    ])
+
+
+def _content_length(request: Request) -> Optional[int]:
+    try:
+        return int(request.headers.get("content-length", ""))
+    except ValueError:
+        return None
+
+
+async def _prefixed_stream(prefix: bytes, stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    yield prefix
+    async for piece in stream:
+        yield piece
+
+
+async def _send_audio(
+    ws,
+    pcm_bytes: bytes,
+    audio_stream: Optional[AsyncIterator[bytes]],
+    sizer: AdaptiveFrameSizer,
+) -> None:
+    """Send audio in frames sized by ``sizer`` followed by the EOF frame."""
+    loop = asyncio.get_running_loop()
+
+    async def _send(frame: bytes) -> None:
+        started = loop.time()
+        await ws.send(frame)
+        sizer.observe(len(frame), loop.time() - started)
+
+    if audio_stream is not None:
+        pending = bytearray()
+        async for piece in audio_stream:
+            pending.extend(piece)
+            while len(pending) >= sizer.size:
+                frame = bytes(pending[: sizer.size])
+                del pending[: len(frame)]
+                await _send(frame)
+        if pending:
+            await _send(bytes(pending))
+    else:
+        view = memoryview(pcm_bytes)
+        pos = 0
+        while pos < len(view):
+            frame = view[pos : pos + sizer.size].tobytes()
+            pos += len(frame)
+            await _send(frame)
+    # Signal end of audio
+    await ws.send(b"")
+
+
+async def _stream_to_backend(
+    pcm_bytes: bytes,
+    router: Optional[BackendRouter] = None,
+    audio_stream: Optional[AsyncIterator[bytes]] = None,
+    on_snapshot: Optional[Callable[[List[dict]], None]] = None,
+    wait_for_backend: bool = False,
+):
     """Stream PCM audio to the backend WebSocket and collect results.
 
+    When a router is given it picks the backend endpoint and the session is
+    taken from that endpoint's pre-warmed pool (``wait_for_backend`` waits
+    for a breaker to recover instead of raising ``BackendUnavailable``). If ``audio_stream`` is given
+    its pieces are forwarded as they arrive instead of ``pcm_bytes``.
+    In ``concurrent`` stream mode snapshots are received while audio is still
+    being sent; ``sequential`` sends everything first (previous behaviour).
     Returns a tuple: (all_texts: List[str], lines: List[dict]) where lines
     are dicts with keys like: speaker, text, beg, end, diff.
     """
     # Use latest snapshot approach to avoid duplications from streaming updates
     latest_lines: List[dict] = []
-    async with websockets.connect(BACKEND_WS_URL) as ws:
-        chunk = 3200
-        for i in range(0, len(pcm_bytes), chunk):
-            await ws.send(pcm_bytes[i : i + chunk])
-        # Signal end of audio
-        await ws.send(b"")
+    parser = SnapshotParser()
+    first_snapshot_at: Optional[float] = None
+    endpoint: Optional[BackendEndpoint] = None
+    failed: Optional[bool] = False
+    loop = asyncio.get_running_loop()
+    sizer = AdaptiveFrameSizer(
+        initial=BACKEND_FRAME_BYTES,
+        minimum=BACKEND_FRAME_MIN_BYTES,
+        maximum=BACKEND_FRAME_MAX_BYTES,
+    )
+    connect_started = loop.time()
+    try:
+        if router is not None:
+            endpoint, ws = await router.acquire(wait=wait_for_backend)
+        else:
+            ws = await websockets.connect(BACKEND_WS_URL, open_timeout=BACKEND_CONNECT_TIMEOUT_SEC)
+    except Exception:
+        _M_CONNECT.observe(loop.time() - connect_started, outcome="error")
+        raise
+    _M_CONNECT.observe(loop.time() - connect_started, outcome="ok")
+    started = loop.time()
+    send_sec = 0.0
+
+    async def _first_message():
+        # A hung backend accepts the session but never answers; the deadline
+        # starts with the first audio frame (a streamed upload may begin late)
+        while True:
+            try:
+                return await asyncio.wait_for(ws.recv(), timeout=BACKEND_FIRST_MESSAGE_TIMEOUT_SEC)
+            except asyncio.TimeoutError:
+                if sizer.frames:
+                    raise BackendUnavailable(
+                        f"no backend message within {BACKEND_FIRST_MESSAGE_TIMEOUT_SEC:g}s of sending audio"
+                    ) from None
+
+    async def _receive() -> None:
+        nonlocal latest_lines, first_snapshot_at
+        first = BACKEND_FIRST_MESSAGE_TIMEOUT_SEC > 0
         while True:
-            message = await ws.recv()
-            data = json.loads(message)
+            message = await (_first_message() if first else ws.recv())
+            first = False
+            data = loads_json(message)
             if data.get("type") == "ready_to_stop":
-                break
-            lines = data.get("lines", []) or []
-            # Build a clean snapshot, skipping silence/loading and empty texts
-            snapshot: List[dict] = []
-            for item in lines:
-                if not isinstance(item, dict):
-                    continue
-                text_val = (item.get("text") or "").strip()
-                if not text_val:
-                    continue
-                spk = item.get("speaker")
-                if isinstance(spk, int) and spk in (-2, 0):
-                    continue
-                snapshot.append({
-                    "speaker": spk,
-                    "text": text_val,
-                    "beg": item.get("beg"),
-                    "end": item.get("end"),
-                    "diff": item.get("diff"),
-                })
-            if snapshot:
+                return
+            segments = parser.parse(data.get("lines"))
+            # Unchanged snapshots (the backend resends the whole session) need no work
+            if segments and parser.changed:
+                snapshot = as_dicts(segments)
                 latest_lines = snapshot
-        await ws.close()
-    # Aggregate final text from the latest snapshot only
-    texts: List[str] = [(it.get("text") or "").strip() for it in latest_lines if it.get("text")]
-    return texts, latest_lines
+                if first_snapshot_at is None:
+                    first_snapshot_at = loop.time()
+                if on_snapshot is not None:
+                    on_snapshot(snapshot)
 
-
-def _parse_hhmmss_to_seconds(value: str) -> float:
-    """Parse 'HH:MM:SS' string to seconds (float). Milliseconds are not provided upstream."""
     try:
-        parts = value.split(":")
-        if len(parts) != 3:
-            return 0.0
-        h, m, s = map(int, parts)
-        return float(h * 3600 + m * 60 + s)
+        if BACKEND_STREAM_MODE == "sequential":
+            await _send_audio(ws, pcm_bytes, audio_stream, sizer)
+            send_sec = loop.time() - started
+            await _receive()
+        else:
+            receiver = asyncio.ensure_future(_receive())
+            try:
+                sender = asyncio.ensure_future(_send_audio(ws, pcm_bytes, audio_stream, sizer))
+                try:
+                    done, _pending = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+                    if receiver in done and sender not in done:
+                        # Backend finished or failed before all audio was sent
+                        receiver.result()
+                        raise ConnectionError("backend closed the session before all audio was sent")
+                    await sender
+                    send_sec = loop.time() - started
+                finally:
+                    if not sender.done():
+                        sender.cancel()
+                await receiver
+            finally:
+                if not receiver.done():
+                    receiver.cancel()
+    except asyncio.CancelledError:
+        failed = None  # the caller gave up: no verdict on the backend
+        raise
     except Exception:
-        return 0.0
+        failed = True
+        raise
+    finally:
+        await close_quietly(ws)
+        if router is not None and endpoint is not None:
+            router.release(endpoint, failed=failed)
+    first_snapshot_sec = (first_snapshot_at - started) if first_snapshot_at is not None else None
+    _STREAM_TIMINGS.setdefault(BACKEND_STREAM_MODE, StreamTimings()).record(send_sec, first_snapshot_sec, sizer.frames)
+    _M_SEND.observe(send_sec)
+    if first_snapshot_sec is not None:
+        _M_FIRST_SNAPSHOT.observe(first_snapshot_sec)
+    # Aggregate final text from the latest snapshot only
+    return _texts_from_lines(latest_lines), latest_lines
 
 
-def _speaker_label(speaker: Optional[int]) -> str:
-    try:
-        if speaker is None:
-            return ""
-        if int(speaker) <= 0:
-            return ""
-        return f"Speaker {int(speaker)}: "
-    except Exception:
-        return ""
+def _texts_from_lines(lines: List[dict]) -> List[str]:
+    return [(it.get("text") or "").strip() for it in lines if it.get("text")]
 
 
-def _format_srt(lines: List[dict]) -> str:
-    out_lines: List[str] = []
-    idx = 1
-    for item in lines:
-        text = (item.get("text") or "").strip()
-        if not text:
-            continue
-        spk = item.get("speaker")
-        if isinstance(spk, int) and spk in (-2, 0):
+_ALLOWED_RESPONSE_FORMATS = {"json", "text", "srt", "vtt", "verbose_json", "jsonl", "tsv"}
+
+
+def _transcription_payload(rf: str, texts: List[str], lines: List[dict]) -> dict:
+    """JSON body for json (and verbose_json, which adds segments)."""
+    final_text = " ".join(t.strip() for t in texts if t).strip()
+    if rf != "verbose_json":
+        return {"text": final_text}
+    segments = [seg for seg in (verbose_segment(item) for item in lines) if seg is not None]
+    return {"text": final_text, "segments": segments}
+
+
+def _transcription_result(rf: str, texts: List[str], lines: List[dict]):
+    """Response body for ``response_format`` as a JSON-embeddable value."""
+    if rf in ("json", "verbose_json"):
+        return _transcription_payload(rf, texts, lines)
+    return b"".join(iter_response(rf, texts, lines)).decode("utf-8")
+
+
+def _render_transcription(
+    rf: str,
+    texts: List[str],
+    lines: List[dict],
+    headers: Optional[dict] = None,
+    accept_encoding: Optional[str] = None,
+):
+    """Build the HTTP response for ``response_format`` from backend results.
+
+    Bodies up to RESPONSE_COMPRESS_MIN_BYTES are sent whole; longer ones are
+    streamed from the writer as they are formatted, compressed when the
+    client accepts gzip/zstd.
+    """
+    media_type = MEDIA_TYPES[rf]
+    chunks = iter_response(rf, texts, lines)
+    head: List[bytes] = []
+    size = 0
+    for chunk in chunks:
+        head.append(chunk)
+        size += len(chunk)
+        if size >= RESPONSE_COMPRESS_MIN_BYTES:
+            break
+    else:
+        return Response(content=b"".join(head), media_type=media_type, headers=headers)
+    body: Iterator[bytes] = itertools.chain(head, chunks)
+    headers = dict(headers or {})
+    encoding = negotiate_encoding(accept_encoding) if RESPONSE_COMPRESSION else None
+    if RESPONSE_COMPRESSION:
+        headers["Vary"] = "Accept-Encoding"
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+        body = encode(body, encoding)
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
+
+_SSE_RESPONSE_FORMATS = {"json", "verbose_json", "text"}
+
+
+def _sse_event(payload: dict) -> bytes:
+    return b"data: " + dumps_json(payload) + b"\n\n"
+
+
+def _snapshot_deltas(previous: List[dict], snapshot: List[dict]) -> List[dict]:
+    """Events describing how ``snapshot`` differs from the previously sent one.
+
+    New segments and segments whose text only grew produce
+    ``transcript.text.delta`` with the appended text; segments the backend
+    rewrote produce ``transcript.segment.revised`` with the full segment.
+    """
+    events: List[dict] = []
+    for idx, item in enumerate(snapshot):
+        segment = verbose_segment(item)
+        if segment is None:
             continue
-        beg = _parse_hhmmss_to_seconds(item.get("beg", "00:00:00"))
-        end = _parse_hhmmss_to_seconds(item.get("end", "00:00:00"))
-        def to_ts(t: float) -> str:
-            h = int(t // 3600)
-            m = int((t % 3600) // 60)
-            s = int(t % 60)
-            return f"{h:02d}:{m:02d}:{s:02d},000"
-        out_lines.append(str(idx))
-        out_lines.append(f"{to_ts(beg)} --> {to_ts(end)}")
-        lbl = _speaker_label(spk)
-        out_lines.append(f"{lbl}{text}" if lbl else text)
-        out_lines.append("")
-        idx += 1
-    return "\n".join(out_lines).rstrip() + ("\n" if out_lines else "")
-
-
-def _format_vtt(lines: List[dict]) -> str:
-    out_lines: List[str] = ["WEBVTT", ""]
-    for item in lines:
-        text = (item.get("text") or "").strip()
-        if not text:
+        segment["id"] = idx
+        text = segment["text"]
+        old_text = (previous[idx].get("text") or "").strip() if idx < len(previous) else None
+        if old_text == text:
             continue
-        spk = item.get("speaker")
-        if isinstance(spk, int) and spk in (-2, 0):
+        if old_text is None:
+            delta = text if idx == 0 else f" {text}"
+        elif text.startswith(old_text):
+            delta = text[len(old_text):]
+        else:
+            events.append({"type": "transcript.segment.revised", "segment": segment})
             continue
-        beg = _parse_hhmmss_to_seconds(item.get("beg", "00:00:00"))
-        end = _parse_hhmmss_to_seconds(item.get("end", "00:00:00"))
-        def to_ts(t: float) -> str:
-            h = int(t // 3600)
-            m = int((t % 3600) // 60)
-            s = int(t % 60)
-            return f"{h:02d}:{m:02d}:{s:02d}.000"
-        out_lines.append(f"{to_ts(beg)} --> {to_ts(end)}")
-        lbl = _speaker_label(spk)
-        out_lines.append(f"{lbl}{text}" if lbl else text)
-        out_lines.append("")
-    return "\n".join(out_lines).rstrip() + ("\n" if len(out_lines) > 2 else "")
+        events.append({"type": "transcript.text.delta", "delta": delta, "segment": segment})
+    return events
+
+
+async def _sse_transcription(rf: str, pcm_bytes: bytes, **job_options) -> AsyncIterator[bytes]:
+    """Run a backend job and report its snapshots as Server-Sent Events.
+
+    Snapshots supersede each other, so only the latest unsent one is kept
+    while the client is slow; the final ``transcript.text.done`` event
+    carries the same payload as the non-streaming json/verbose_json reply.
+    """
+    latest: List[Optional[List[dict]]] = [None]
+    changed = asyncio.Event()
+
+    def _on_snapshot(snapshot: List[dict]) -> None:
+        latest[0] = snapshot
+        changed.set()
+
+    job = asyncio.ensure_future(_run_backend_job(pcm_bytes, on_snapshot=_on_snapshot, **job_options))
+    sent: List[dict] = []
+    try:
+        while True:
+            waiter = asyncio.ensure_future(changed.wait())
+            await asyncio.wait({waiter, job}, return_when=asyncio.FIRST_COMPLETED)
+            waiter.cancel()
+            changed.clear()
+            snapshot, latest[0] = latest[0], None
+            if snapshot is not None:
+                for event in _snapshot_deltas(sent, snapshot):
+                    yield _sse_event(event)
+                sent = snapshot
+            if job.done():
+                break
+        try:
+            texts, lines = job.result()
+        except HTTPException as exc:
+            error = {"message": str(exc.detail), "type": _openai_error_type(exc.status_code), "code": None}
+            retry_after = (exc.headers or {}).get("Retry-After")
+            if exc.status_code in (429, 503) and retry_after is not None:
+                # The HTTP status and headers are already sent: pass the retry hint in the event
+                error["retry_after"] = max(1, math.ceil(float(retry_after)))
+            yield _sse_event({"type": "error", "error": error})
+            return
+        for event in _snapshot_deltas(sent, lines):
+            yield _sse_event(event)
+        yield _sse_event({"type": "transcript.text.done", **_transcription_payload(rf, texts, lines)})
+    finally:
+        if not job.done():
+            job.cancel()
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition of request, queue and backend stage metrics."""
+    return Response(content=METRICS.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/wrapper/stats")
+async def wrapper_stats():
+    """Runtime counters for the wrapper API (connection pool, backend load)."""
+    return JSONResponse({
+        "backend_pool": _backend_pool_stats(),
+        "backends": _ROUTER.snapshot() if _ROUTER is not None else None,
+        "scheduler": JOB_QUEUE.snapshot(),
+        "admission": ADMISSION.snapshot(),
+        "workers": _worker_stats(),
+        "coalescing": COALESCER.snapshot(),
+        "startup": _startup_stats(),
+        "models": MODELS.snapshot() if MODELS is not None else None,
+        "jobs": {**JOBS.snapshot(), "durable": JOB_JOURNAL is not None},
+        "ffmpeg_pool": FFMPEG_POOL.snapshot(),
+        "result_cache": RESULT_CACHE.snapshot() if RESULT_CACHE.enabled else None,
+        "streaming": {
+            "mode": BACKEND_STREAM_MODE,
+            "timings": {mode: t.as_dict() for mode, t in _STREAM_TIMINGS.items()},
+        },
+    })
+
+
+def _startup_stats() -> dict:
+    return {
+        "uptime_sec": round(time.monotonic() - _PROCESS_STARTED, 2),
+        "time_to_ready_sec": round(_READY_AFTER_SEC, 2) if _READY_AFTER_SEC is not None else None,
+    }
+
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the API process serves requests (backend not checked)."""
+    return JSONResponse({"status": "ok", **_startup_stats()})
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: 200 once a configured backend accepts sessions, else 503."""
+    ready = await _backend_reachable()
+    return JSONResponse(
+        {"status": "ready" if ready else "starting" if _READY_AFTER_SEC is None else "unavailable", **_startup_stats()},
+        status_code=200 if ready else 503,
+        headers=None if ready else {"Retry-After": "1"},
+    )
+
+
+@app.get("/v1/models")
+async def list_models():
+    """OpenAI-style model list: the configured model plus routed ones.
+
+    Routed models carry ``status``: ``loading``, ``loaded`` (jobs pinned)
+    or ``evictable`` (idle; first to go when the memory budget is needed).
+    """
+    default = BACKEND_CONFIG["model"] or "whisper-1"
+    data = [{"id": default, "object": "model", "owned_by": "wrapper", "status": "loaded", "default": True}]
+    if MODELS is not None:
+        for entry in MODELS.snapshot()["models"]:
+            data.append({"id": entry.pop("model"), "object": "model", "owned_by": "wrapper", "default": False, **entry})
+    return JSONResponse({"object": "list", "data": data})
+
+
+def _admin_denied(request: Request) -> Optional[JSONResponse]:
+    """Error response unless the request carries the admin key."""
+    expected = ADMIN_API_KEY or API_KEY
+    if not expected:
+        return _openai_error_response("Admin endpoints are disabled: set WRAPPER_ADMIN_API_KEY.", 403)
+    provided = _extract_api_key_from_request(request) or ""
+    if not hmac.compare_digest(provided.encode("utf-8"), expected.encode("utf-8")):
+        return _openai_error_response("Invalid admin key.", 401)
+    return None
+
+
+def _admin_config() -> dict:
+    return {"workers": _worker_stats(), "queue_timeout_sec": _QUEUE_TIMEOUT}
+
+
+@app.get("/wrapper/admin/config")
+async def get_admin_config(request: Request):
+    """Worker pool bounds/state and queue timeout currently in effect."""
+    denied = _admin_denied(request)
+    return denied or JSONResponse(_admin_config())
+
+
+@app.put("/wrapper/admin/config")
+async def update_admin_config(request: Request):
+    """Change worker concurrency and the queue timeout without a restart.
+
+    JSON body, all fields optional: ``concurrency`` (fixed pool size),
+    ``min_concurrency`` / ``max_concurrency`` (elastic bounds) and
+    ``queue_timeout_sec`` (0 or null: wait indefinitely). Workers above a
+    lowered size finish their current job before exiting.
+    """
+    global _QUEUE_TIMEOUT
+    denied = _admin_denied(request)
+    if denied is not None:
+        return denied
+    try:
+        body = await request.json()
+    except ValueError:
+        return _openai_error_response("Expected a JSON object.", 400)
+    allowed = {"concurrency", "min_concurrency", "max_concurrency", "queue_timeout_sec"}
+    if not isinstance(body, dict) or not body or set(body) - allowed:
+        return _openai_error_response(f"Expected a JSON object with any of: {', '.join(sorted(allowed))}.", 400)
+    try:
+        minimum = body.get("min_concurrency", body.get("concurrency"))
+        maximum = body.get("max_concurrency", body.get("concurrency"))
+        for value in (minimum, maximum):
+            if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 1):
+                raise ValueError("concurrency values must be integers >= 1")
+        # Moving one bound past the other drags it along
+        if minimum is None and maximum is not None:
+            minimum = min(AUTOSCALER.minimum, maximum)
+        if maximum is None and minimum is not None:
+            maximum = max(AUTOSCALER.maximum, minimum)
+        timeout = body.get("queue_timeout_sec", _QUEUE_TIMEOUT)
+        if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout < 0):
+            raise ValueError("queue_timeout_sec must be a number >= 0 or null")
+        AUTOSCALER.configure(minimum=minimum, maximum=maximum)
+    except ValueError as exc:
+        return _openai_error_response(f"Invalid configuration: {exc}.", 400)
+    _QUEUE_TIMEOUT = float(timeout) if timeout else None
+    if _WORKERS_STARTED:
+        _resize_workers()
+    else:
+        ADMISSION.workers = AUTOSCALER.target
+    return JSONResponse(_admin_config())
 
 
 @app.post("/v1/audio/transcriptions")
 async def transcribe(
+    request: Request,
     file: UploadFile = File(...),
-    # OpenAI Whisper API requires 'model', but we ignore its value and always use GUI-configured backend
+    # OpenAI Whisper API requires 'model'; it selects a backend only with WRAPPER_MODEL_ROUTING=1
     model: str = Form(...),
     response_format: str = Form("json"),
     prompt: str | None = Form(None),
@@ -416,72 +1713,469 @@ async def transcribe(
     user: str | None = Form(None),
     timestamp_granularities_brackets: List[str] | None = Form(None, alias="timestamp_granularities[]"),
     timestamp_granularities: List[str] | None = Form(None),
+    stream: bool = Form(False),
+    priority: int = Form(0),
+    strip_silence: bool | None = Form(None),
 ):
     """OpenAI Whisper API compatible transcription endpoint.
 
     - Accepts multipart/form-data with 'file' and 'model' (required by spec).
-    - Uses GUI-configured model/settings via backend; ignores provided 'model' value.
-    - Supports response_format: json (default), text, srt, vtt, verbose_json.
+    - Uses the GUI-configured backend; with WRAPPER_MODEL_ROUTING=1 another
+      downloaded 'model' is served by a backend started for it (see /v1/models).
+    - Supports response_format: json (default), text, srt, vtt, verbose_json,
+      plus jsonl (one segment per line) and tsv (wrapper extensions).
+    - stream=true returns text/event-stream with incremental segment deltas
+      and a final transcript.text.done event (json, verbose_json, text).
+    - priority (wrapper extension): higher values are scheduled first.
+    - strip_silence (wrapper extension): overrides WRAPPER_SILENCE_STRIP; the
+      share of audio removed is reported in X-Wrapper-Silence-Removed-Percent.
     """
     # Validate response_format
     rf = (response_format or "json").lower()
-    allowed_rf = {"json", "text", "srt", "vtt", "verbose_json"}
-    if rf not in allowed_rf:
+    request.state.response_format = rf
+    if rf not in _ALLOWED_RESPONSE_FORMATS:
         return _openai_error_response("Invalid response_format.", 400)
+    if stream and rf not in _SSE_RESPONSE_FORMATS:
+        return _openai_error_response("stream=true supports response_format json, verbose_json or text.", 400)
+    routed_model = await _requested_model(model)
 
     # Ensure file content present
     raw = await file.read()
     if not raw:
         return _openai_error_response("No audio file provided or file is empty.", 400)
 
-    # Decide what to send to backend FFmpeg stdin (expects a recognizable container)
-    # - For .raw: wrap into WAV 16kHz/mono
-    # - Else: send original bytes (wav/mp3/m4a/webm...)
-    to_send = raw
     name = (file.filename or "").lower()
-    if name.endswith(".raw"):
-        # Assume already PCM16/16kHz/mono; if not, backend FFmpeg will still decode but timing may be off
-        to_send = _wrap_pcm16_as_wav(raw, 16000, 1)
+    to_send, decoded, job_options, headers = await _prepare_upload(
+        raw,
+        name,
+        response_format=rf,
+        priority=priority,
+        client=_client_identity(request, user),
+        strip_silence=strip_silence,
+        model=routed_model,
+    )
+
+    if stream:
+        # Errors after this point are reported as SSE events, so refuse overload up front
+        await _check_admission(
+            job_options["cache_key"], job_options["duration_sec"], len(to_send), model=routed_model
+        )
+        return StreamingResponse(
+            _sse_transcription(rf, to_send, **job_options),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **(headers or {})},
+        )
 
     # Queue backend processing so that audio submissions are handled sequentially
+    texts, lines = await _run_buffered_job(raw, name, to_send, decoded, **job_options)
+    return _render_transcription(
+        rf, texts, lines, headers=headers, accept_encoding=request.headers.get("accept-encoding")
+    )
+
+
+@app.post("/v1/audio/transcriptions/stream")
+async def transcribe_stream(request: Request):
+    """Streaming variant of /v1/audio/transcriptions for large uploads.
+
+    Takes the same multipart fields, but the 'file' part is forwarded to the
+    backend while it is still being uploaded instead of being buffered first.
+    Put the other fields before the file part: they are read and validated
+    before the backend job starts, and later fields are ignored.
+    """
+    boundary = StreamingMultipartUpload.boundary_from(request.headers.get("content-type", ""))
+    if not boundary:
+        return _openai_error_response("Expected multipart/form-data with a boundary.", 400)
+    upload = StreamingMultipartUpload(request, boundary)
+    reader = asyncio.create_task(upload.run())
     try:
-        texts, lines = await _submit_backend_job(to_send)
-    except asyncio.TimeoutError:
-        return _openai_error_response(
-            "Backend busy: queue wait time exceeded before processing could start.",
-            503,
+        await upload.file_started.wait()
+        if not upload.has_file:
+            await reader
+            return _openai_error_response("No audio file provided or file is empty.", 400)
+        rf = (upload.field("response_format") or "json").lower()
+        request.state.response_format = rf
+        if rf not in _ALLOWED_RESPONSE_FORMATS:
+            return _openai_error_response("Invalid response_format.", 400)
+        routed_model = await _requested_model(upload.field("model"))
+        digest = hashlib.sha256()
+        audio = _hashing_stream(upload.chunks(), digest)
+        is_pcm = (upload.filename or "").lower().endswith(".raw")
+        if is_pcm:
+            audio = _prefixed_stream(_streaming_wav_header(16000, 1), audio)
+        job_options = {
+            "priority": _clamp_priority(upload.field("priority")),
+            "client": _client_identity(request, upload.field("user")),
+            "duration_sec": estimate_duration_from_size(_content_length(request)),
+            "response_format": rf,
+            "model": routed_model,
+        }
+        try:
+            texts, lines = await _run_backend_job(b"", audio_stream=audio, **job_options)
+        except HTTPException:
+            if reader.done() and not reader.cancelled() and reader.exception() is not None:
+                return _openai_error_response(f"Upload interrupted or malformed: {reader.exception()}", 400)
+            raise
+        await reader
+    finally:
+        if not reader.done():
+            reader.cancel()
+    if upload.received == 0:
+        return _openai_error_response("No audio file provided or file is empty.", 400)
+    # The hash is only known once the upload ended: store for later buffered requests
+    variant = "pcm16:16000:1" if is_pcm else "container"
+    await _store_result(_result_cache_key(digest.hexdigest(), variant, routed_model), lines)
+    return _render_transcription(rf, texts, lines, accept_encoding=request.headers.get("accept-encoding"))
+
+
+@app.post("/v1/audio/transcriptions/raw")
+async def transcribe_raw(
+    request: Request,
+    response_format: str = "json",
+    input_format: str = "pcm16",
+    sample_rate: int = 16000,
+    channels: int = 1,
+    priority: int = 0,
+    user: str | None = None,
+):
+    """Transcribe a raw ``application/octet-stream`` body, typically sent chunked.
+
+    - input_format=pcm16 (default): s16le PCM at ``sample_rate``/``channels``.
+    - input_format=container: any container the backend FFmpeg can sniff
+      (Ogg/WebM Opus, WAV, MP3, ...), forwarded untouched.
+    Options are query parameters because there is no form body.
+    """
+    rf = (response_format or "json").lower()
+    request.state.response_format = rf
+    if rf not in _ALLOWED_RESPONSE_FORMATS:
+        return _openai_error_response("Invalid response_format.", 400)
+    fmt = (input_format or "pcm16").lower()
+    if fmt not in ("pcm16", "container"):
+        return _openai_error_response("Invalid input_format (expected pcm16 or container).", 400)
+    if sample_rate <= 0 or channels <= 0:
+        return _openai_error_response("Invalid sample_rate or channels.", 400)
+
+    received = 0
+
+    async def _body() -> AsyncIterator[bytes]:
+        nonlocal received
+        async for piece in request.stream():
+            if piece:
+                received += len(piece)
+                yield piece
+
+    digest = hashlib.sha256()
+    audio: AsyncIterator[bytes] = _hashing_stream(_body(), digest)
+    length = _content_length(request)
+    if fmt == "pcm16":
+        audio = _prefixed_stream(_streaming_wav_header(sample_rate, channels), audio)
+        duration = length / (sample_rate * channels * 2) if length else None
+    else:
+        duration = estimate_duration_from_size(length)
+    texts, lines = await _run_backend_job(
+        b"",
+        audio_stream=audio,
+        priority=_clamp_priority(priority),
+        client=_client_identity(request, user),
+        duration_sec=duration,
+        response_format=rf,
+    )
+    if received == 0:
+        return _openai_error_response("No audio provided or request body is empty.", 400)
+    variant = f"pcm16:{sample_rate}:{channels}" if fmt == "pcm16" else "container"
+    await _store_result(_result_cache_key(digest.hexdigest(), variant), lines)
+    return _render_transcription(rf, texts, lines, accept_encoding=request.headers.get("accept-encoding"))
+
+
+async def _run_async_job(
+    job: async_jobs.TranscriptionJob,
+    raw: Optional[bytes],
+    *,
+    priority: object,
+    client: str,
+    strip_silence: Optional[bool],
+    model: Optional[str] = None,
+) -> None:
+    """Body of an asynchronous job: same pipeline as the buffered route.
+
+    Admission, the queue timeout and open backend breakers do not apply;
+    the job simply waits for a worker and a working backend. ``raw`` is None for a job resumed from the journal (its audio
+    is read back from the spool).
+    """
+    name = job.filename.lower()
+    try:
+        if raw is None:
+            raw = await asyncio.to_thread(JOB_JOURNAL.load_audio, job.id) if JOB_JOURNAL is not None else None
+            if raw is None:
+                raise HTTPException(status_code=500, detail="Spooled audio for this job is missing.")
+        to_send, decoded, job_options, job.headers = await _prepare_upload(
+            raw,
+            name,
+            response_format=job.response_format,
+            priority=priority,
+            client=client,
+            strip_silence=strip_silence,
+            model=model,
         )
-    except Exception as e:  # noqa: BLE001
-        return _openai_error_response(f"Backend processing failed: {e}", 500)
+        job.duration_sec = job_options["duration_sec"]
+        texts, lines = await _run_buffered_job(
+            raw,
+            name,
+            to_send,
+            decoded,
+            admitted=True,
+            wait_timeout=None,
+            fail_fast=False,
+            on_queued=job.backend_jobs.append,
+            **job_options,
+        )
+    except asyncio.CancelledError:
+        if not job.finished:
+            JOBS.mark_finished(job, async_jobs.CANCELLED)
+        raise
+    except HTTPException as exc:
+        JOBS.mark_finished(job, async_jobs.FAILED, str(exc.detail))
+    except Exception as exc:  # noqa: BLE001
+        JOBS.mark_finished(job, async_jobs.FAILED, f"Backend processing failed: {exc}")
+    else:
+        job.texts, job.lines = texts, lines
+        JOBS.mark_finished(job, async_jobs.COMPLETED)
+    await _journal_finish(job)
+
+
+async def _journal(method: Callable, *args, **kwargs) -> None:
+    """Run a journal write off the event loop; failures are counted, not raised."""
+    try:
+        await asyncio.to_thread(method, *args, **kwargs)
+    except (OSError, sqlite3.Error):
+        JOBS.journal_errors += 1
 
-    final_text = " ".join(t.strip() for t in texts if t).strip()
 
-    # Build response
-    if rf == "json":
-        return JSONResponse({"text": final_text})
-    if rf == "text":
-        return PlainTextResponse(content=final_text)
-    if rf == "srt":
-        return PlainTextResponse(content=_format_srt(lines), media_type="text/srt")
-    if rf == "vtt":
-        return PlainTextResponse(content=_format_vtt(lines), media_type="text/vtt")
-    if rf == "verbose_json":
-        segments = []
-        for item in lines:
-            text = (item.get("text") or "").strip()
-            if not text:
-                continue
-            start = _parse_hhmmss_to_seconds(item.get("beg", "00:00:00"))
-            end = _parse_hhmmss_to_seconds(item.get("end", "00:00:00"))
-            spk = item.get("speaker")
-            segments.append({
-                "start": start,
-                "end": end,
-                "text": text,
-                "speaker": spk if isinstance(spk, int) else None,
-                "speaker_label": (_speaker_label(spk).rstrip() if _speaker_label(spk) else None),
-            })
-        return JSONResponse({"text": final_text, "segments": segments})
-
-    # Fallback (should not reach)
-    return JSONResponse({"text": final_text})
+async def _journal_finish(job: async_jobs.TranscriptionJob) -> None:
+    if JOB_JOURNAL is None:
+        return
+    result = None
+    if job.status == async_jobs.COMPLETED:
+        result = {"texts": job.texts, "lines": job.lines, "headers": job.headers}
+    await _journal(
+        JOB_JOURNAL.finish,
+        job.id,
+        job.status,
+        finished_at=job.finished_at or time.time(),
+        duration_sec=job.duration_sec,
+        error=job.error,
+        result=result,
+    )
+
+
+# Journal deletions for dropped job records, run off the event loop
+_FORGET_TASKS: set[asyncio.Task] = set()
+
+
+def _forget_journalled(job_ids: List[str]) -> None:
+    """``JobStore.on_forget``: delete the rows and spool files in the background.
+
+    The store drops records inside request handlers (TTL sweeps, DELETE), so
+    the blocking journal delete must not run inline.
+    """
+    if JOB_JOURNAL is None:
+        return
+    task = asyncio.get_running_loop().create_task(_journal(JOB_JOURNAL.forget, list(job_ids)))
+    _FORGET_TASKS.add(task)
+    task.add_done_callback(_FORGET_TASKS.discard)
+
+
+async def _resume_async_jobs() -> None:
+    """Open the job journal, restore finished results and requeue unfinished jobs."""
+    global JOB_JOURNAL
+    try:
+        journal = await asyncio.to_thread(JobJournal, JOBS_DIR)
+        await asyncio.to_thread(journal.purge, JOBS.ttl_sec)
+        records = await asyncio.to_thread(journal.records)
+    except (OSError, sqlite3.Error) as exc:
+        JOBS.journal_errors += 1
+        logger.warning(
+            "WRAPPER_JOBS_DURABLE=1 but the job journal in %s could not be opened (%s); "
+            "async jobs are kept in memory only and will not survive a restart",
+            JOBS_DIR,
+            exc,
+        )
+        return
+    JOB_JOURNAL = journal
+    JOBS.on_forget = _forget_journalled
+    for record in records:
+        if JOBS.get(record.id) is not None:
+            continue
+        job = JOBS.create(record.filename, record.response_format, record.duration_sec,
+                          job_id=record.id, created_at=record.created_at)
+        if record.status == async_jobs.QUEUED:
+            options = record.options
+            job.task = asyncio.ensure_future(_run_async_job(
+                job,
+                None,
+                priority=options.get("priority", 0),
+                client=options.get("client", ""),
+                strip_silence=options.get("strip_silence"),
+                model=options.get("model"),
+            ))
+            JOBS.resumed += 1
+            continue
+        job.status, job.finished_at, job.error = record.status, record.finished_at, record.error
+        if record.result:
+            job.texts = record.result.get("texts") or []
+            job.lines = record.result.get("lines") or []
+            job.headers = record.result.get("headers")
+
+
+async def _shutdown_async_jobs() -> None:
+    """Stop unfinished async jobs; journalled ones stay queued on disk for the next start."""
+    global JOB_JOURNAL
+    for job in JOBS.unfinished():
+        if job.task is not None:
+            job.task.cancel()
+            try:
+                await job.task
+            except (asyncio.CancelledError, Exception):  # noqa: BLE001
+                pass
+        if JOB_JOURNAL is not None:
+            JOBS.evict(job.id)
+    if JOB_JOURNAL is not None:
+        JOBS.on_forget = None
+        if _FORGET_TASKS:
+            await asyncio.gather(*_FORGET_TASKS, return_exceptions=True)
+        await asyncio.to_thread(JOB_JOURNAL.close)
+        JOB_JOURNAL = None
+
+
+def _job_progress(job: async_jobs.TranscriptionJob) -> tuple[Optional[int], Optional[float]]:
+    """Queue position (1 = next) and estimated seconds to completion."""
+    pending = [bj for bj in job.backend_jobs if not bj.started_at]
+    if job.status == async_jobs.RUNNING and not pending:
+        remaining = [ADMISSION.remaining(bj) for bj in job.backend_jobs if not bj.future.done()]
+        known = [r for r in remaining if r is not None]
+        return None, max(known) if known else None
+    if not pending:
+        return None, None
+    ordered = JOB_QUEUE.ordered()
+    index = {id(bj): i for i, bj in enumerate(ordered)}
+    positions = [index[id(bj)] for bj in pending if id(bj) in index]
+    if not positions:
+        return None, None
+    # The job is done when its last pending piece is
+    last = max(positions)
+    ahead = sum(bj.duration_sec or JOB_QUEUE.unknown_duration_sec for bj in ordered[:last])
+    return min(positions) + 1, ADMISSION.eta(ahead, ordered[last].duration_sec)
+
+
+def _job_payload(job: async_jobs.TranscriptionJob, response_format: Optional[str] = None) -> dict:
+    if job.status == async_jobs.QUEUED and any(bj.started_at for bj in job.backend_jobs):
+        JOBS.mark_started(job)
+    position, eta = _job_progress(job) if not job.finished else (None, None)
+    rf = response_format or job.response_format
+    payload = {
+        "id": job.id,
+        "object": "transcription.job",
+        "status": job.status,
+        "filename": job.filename,
+        "response_format": rf,
+        "created_at": int(job.created_at),
+        "started_at": int(job.started_at) if job.started_at else None,
+        "completed_at": int(job.finished_at) if job.finished_at else None,
+        "duration_sec": round(job.duration_sec, 3) if job.duration_sec is not None else None,
+        "queue_position": position,
+        "eta_sec": round(eta, 1) if eta is not None else None,
+        "error": job.error,
+    }
+    if job.headers:
+        payload["silence_removed_percent"] = float(job.headers["X-Wrapper-Silence-Removed-Percent"])
+    if job.status == async_jobs.COMPLETED:
+        payload["result"] = _transcription_result(rf, job.texts, job.lines)
+    return payload
+
+
+@app.post("/v1/audio/transcriptions/jobs", status_code=202)
+async def create_transcription_jobs(
+    request: Request,
+    file: List[UploadFile] = File(...),
+    model: str = Form(...),
+    response_format: str = Form("json"),
+    user: str | None = Form(None),
+    priority: int = Form(0),
+    strip_silence: bool | None = Form(None),
+):
+    """Queue one or more files (repeat the 'file' field) and return job IDs at once.
+
+    Jobs run on the same worker pool as synchronous requests; poll
+    GET /v1/audio/transcriptions/jobs/{id} for status and result.
+    """
+    rf = (response_format or "json").lower()
+    request.state.response_format = rf
+    if rf not in _ALLOWED_RESPONSE_FORMATS:
+        return _openai_error_response("Invalid response_format.", 400)
+    routed_model = await _requested_model(model)
+    uploads = [(upload.filename or "", await upload.read()) for upload in file]
+    if not uploads or any(not raw for _name, raw in uploads):
+        return _openai_error_response("No audio file provided or file is empty.", 400)
+    try:
+        JOBS.reserve(len(uploads))
+    except async_jobs.JobStoreFull as exc:
+        return _openai_error_response(str(exc), 429)
+    await _ensure_backend_workers()
+    client = _client_identity(request, user)
+    # Journal every upload before starting any job, so a failure leaves no
+    # running job whose ID the client never received
+    created = []
+    for filename, raw in uploads:
+        job = JOBS.create(filename, rf)
+        created.append(job)
+        if JOB_JOURNAL is not None:
+            options = {"priority": priority, "client": client, "strip_silence": strip_silence, "model": routed_model}
+            try:
+                await asyncio.to_thread(JOB_JOURNAL.add, job.id, filename, rf, options, job.created_at, raw)
+            except (OSError, sqlite3.Error) as exc:
+                JOBS.journal_errors += 1
+                for orphan in created:
+                    JOBS.evict(orphan.id)
+                try:
+                    await asyncio.to_thread(JOB_JOURNAL.forget, [orphan.id for orphan in created])
+                except (OSError, sqlite3.Error):
+                    pass
+                return _openai_error_response(f"Could not persist job: {exc}", 500)
+    for job, (_filename, raw) in zip(created, uploads):
+        job.task = asyncio.ensure_future(
+            _run_async_job(
+                job, raw, priority=priority, client=client, strip_silence=strip_silence, model=routed_model
+            )
+        )
+    return JSONResponse({"object": "list", "data": [_job_payload(job) for job in created]}, status_code=202)
+
+
+@app.get("/v1/audio/transcriptions/jobs/{job_id}")
+async def get_transcription_job(request: Request, job_id: str, response_format: str | None = None):
+    """Job status, queue position, ETA and (once completed) the result.
+
+    ``response_format`` overrides the format chosen at submission.
+    """
+    rf = (response_format or "").lower() or None
+    request.state.response_format = rf or ""
+    if rf is not None and rf not in _ALLOWED_RESPONSE_FORMATS:
+        return _openai_error_response("Invalid response_format.", 400)
+    job = JOBS.get(job_id)
+    if job is None:
+        return _openai_error_response("No such job.", 404)
+    return JSONResponse(_job_payload(job, rf))
+
+
+@app.delete("/v1/audio/transcriptions/jobs/{job_id}")
+async def delete_transcription_job(job_id: str):
+    """Cancel a queued or running job; a finished job is forgotten."""
+    job = JOBS.get(job_id)
+    if job is None:
+        return _openai_error_response("No such job.", 404)
+    if job.finished:
+        JOBS.discard(job_id)
+        return JSONResponse({"id": job_id, "object": "transcription.job.deleted", "deleted": True})
+    if job.task is not None:
+        job.task.cancel()
+    JOBS.mark_finished(job, async_jobs.CANCELLED)
+    await _journal_finish(job)
+    return JSONResponse(_job_payload(job))
@@ -0,0 +1,161 @@
+"""Drop long silent stretches before transcription and map times back.
+
+The backend works through silence at roughly the same pace as speech, so
+files that are mostly hold music gaps or pre-meeting quiet waste worker
+time. ``strip_silence`` finds runs of low-energy frames (frame RMS below
+``threshold_db`` dBFS for at least ``min_silence_sec``) in 16-bit mono PCM,
+cuts them down to ``pad_sec`` on each side so word edges and pauses
+survive, and returns the shortened audio with an ``OffsetMap``.
+``remap_lines`` moves backend ``beg``/``end`` values from the shortened
+timeline onto the original one.
+
+numpy is optional (it ships with the backend requirements); without it
+nothing is stripped.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from .longform import format_hms, frame_rms
+from .segments import parse_hms
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy comes with the backend stack
+    np = None  # type: ignore[assignment]
+
+_FRAME_SEC = 0.02
+
+
+def available() -> bool:
+    return np is not None
+
+
+class OffsetMap:
+    """Piecewise mapping from stripped-audio seconds to original seconds.
+
+    ``spans`` are the kept ``(start_sec, end_sec)`` ranges of the original
+    audio, in order.
+    """
+
+    def __init__(self, spans: Sequence[tuple[float, float]]) -> None:
+        self.original_starts = [start for start, _end in spans]
+        self.lengths = [end - start for start, end in spans]
+        self.stripped_starts: List[float] = []
+        position = 0.0
+        for length in self.lengths:
+            self.stripped_starts.append(position)
+            position += length
+
+    @property
+    def identity(self) -> bool:
+        return len(self.original_starts) <= 1 and (not self.original_starts or self.original_starts[0] == 0.0)
+
+    def to_original(self, seconds: float, *, is_end: bool = False) -> float:
+        """Original time of ``seconds`` in the stripped audio.
+
+        A time exactly on a cut belongs to the following span, or to the
+        preceding one when ``is_end`` (so an ending word is not pushed past
+        the removed silence).
+        """
+        if not self.stripped_starts:
+            return seconds
+        find = bisect.bisect_left if is_end else bisect.bisect_right
+        idx = max(0, find(self.stripped_starts, seconds) - 1)
+        offset = seconds - self.stripped_starts[idx]
+        if idx < len(self.lengths) - 1:
+            offset = min(offset, self.lengths[idx])
+        return self.original_starts[idx] + max(0.0, offset)
+
+
+@dataclass
+class StrippedAudio:
+    pcm: bytes
+    offsets: OffsetMap
+    original_sec: float
+
+    @property
+    def duration_sec(self) -> float:
+        return len(self.pcm) / 32000
+
+    @property
+    def removed_sec(self) -> float:
+        return max(0.0, self.original_sec - self.duration_sec)
+
+    @property
+    def removed_percent(self) -> float:
+        return 100.0 * self.removed_sec / self.original_sec if self.original_sec > 0 else 0.0
+
+
+def silent_runs(
+    pcm: bytes,
+    *,
+    sample_rate: int = 16000,
+    threshold_db: float = -45.0,
+    min_silence_sec: float = 2.0,
+) -> List[tuple[int, int]]:
+    """``(start_frame, end_frame)`` runs of at least ``min_silence_sec`` below ``threshold_db``."""
+    rms = frame_rms(pcm, sample_rate, _FRAME_SEC)
+    if len(rms) == 0:
+        return []
+    silent = rms < 10.0 ** (threshold_db / 20.0)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], silent.astype(np.int8), [0]))))
+    starts, ends = edges[::2], edges[1::2]
+    min_frames = max(1, int(math.ceil(min_silence_sec / _FRAME_SEC)))
+    long_runs = (ends - starts) >= min_frames
+    return list(zip(starts[long_runs].tolist(), ends[long_runs].tolist()))
+
+
+def strip_silence(
+    pcm: bytes,
+    *,
+    sample_rate: int = 16000,
+    threshold_db: float = -45.0,
+    min_silence_sec: float = 2.0,
+    pad_sec: float = 0.3,
+) -> StrippedAudio:
+    """Remove long silences from PCM16 mono, keeping ``pad_sec`` around speech."""
+    total = len(pcm) // 2
+    original_sec = total / sample_rate
+    if np is None or total == 0:
+        return StrippedAudio(pcm, OffsetMap([(0.0, original_sec)]), original_sec)
+    hop = max(1, int(sample_rate * _FRAME_SEC))
+    n_frames = total // hop
+    pad = int(round(pad_sec * sample_rate))
+    cuts: List[tuple[int, int]] = []
+    for start, end in silent_runs(pcm, sample_rate=sample_rate, threshold_db=threshold_db, min_silence_sec=min_silence_sec):
+        # Leading/trailing silence goes entirely; inner silence keeps a pause on both sides
+        cut_start = 0 if start == 0 else start * hop + pad
+        cut_end = total if end >= n_frames else end * hop - pad
+        if cut_end > cut_start:
+            cuts.append((cut_start, cut_end))
+    if not cuts:
+        return StrippedAudio(pcm, OffsetMap([(0.0, original_sec)]), original_sec)
+    kept: List[tuple[int, int]] = []
+    position = 0
+    for cut_start, cut_end in cuts:
+        if cut_start > position:
+            kept.append((position, cut_start))
+        position = cut_end
+    if position < total:
+        kept.append((position, total))
+    view = memoryview(pcm)
+    stripped = b"".join(view[a * 2 : b * 2] for a, b in kept)
+    spans = [(a / sample_rate, b / sample_rate) for a, b in kept]
+    return StrippedAudio(stripped, OffsetMap(spans), original_sec)
+
+
+def remap_lines(lines: Sequence[dict], offsets: OffsetMap) -> List[dict]:
+    """Copy of ``lines`` with ``beg``/``end`` moved onto the original timeline."""
+    if offsets.identity:
+        return list(lines)
+    remapped: List[dict] = []
+    for item in lines:
+        beg = offsets.to_original(parse_hms(item.get("beg")))
+        end = offsets.to_original(parse_hms(item.get("end")), is_end=True)
+        remapped.append({**item, "beg": format_hms(beg), "end": format_hms(max(beg, end))})
+    return remapped
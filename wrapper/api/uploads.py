@@ -0,0 +1,151 @@
+"""Incremental multipart parsing for streamed transcription uploads.
+
+``UploadFile`` only reaches a route after Starlette has read (and spooled)
+the whole body. ``StreamingMultipartUpload`` instead parses the request as it
+arrives and exposes the ``file`` part as an async iterator, so audio can be
+forwarded to the backend while the client is still uploading. Form fields
+sent before the file are available as soon as the file part starts; fields
+after it once the body has been fully read.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, Optional
+
+from starlette.requests import Request
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # pragma: no cover - older python-multipart
+    from multipart.multipart import MultipartParser, parse_options_header  # type: ignore
+
+_END = object()
+
+
+class StreamingMultipartUpload:
+    """Parse ``multipart/form-data`` from ``request.stream()`` on the fly."""
+
+    def __init__(self, request: Request, boundary: bytes, *, file_field: str = "file", max_queued: int = 16) -> None:
+        self.request = request
+        self.file_field = file_field
+        self.fields: dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self.has_file = False
+        self.received = 0
+        # Set once the file part begins (or the body ended without one)
+        self.file_started = asyncio.Event()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._pending: list[object] = []
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._part_headers: dict[bytes, bytes] = {}
+        self._part_name: Optional[str] = None
+        self._part_is_file = False
+        self._field_buf = bytearray()
+        self._file_done = False
+        self._parser = MultipartParser(
+            boundary,
+            {
+                "on_part_begin": self._on_part_begin,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+            },
+        )
+
+    @staticmethod
+    def boundary_from(content_type: str) -> Optional[bytes]:
+        ctype, params = parse_options_header(content_type or "")
+        if ctype != b"multipart/form-data":
+            return None
+        return params.get(b"boundary") or None
+
+    def field(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.fields.get(name, default)
+
+    # -- parser callbacks (synchronous, called from ``write``) --
+    def _on_part_begin(self) -> None:
+        self._part_headers = {}
+        self._part_name = None
+        self._part_is_file = False
+        self._field_buf = bytearray()
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field.extend(data[start:end])
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value.extend(data[start:end])
+
+    def _on_header_end(self) -> None:
+        self._part_headers[bytes(self._header_field).lower()] = bytes(self._header_value)
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def _on_headers_finished(self) -> None:
+        _disp, options = parse_options_header(self._part_headers.get(b"content-disposition", b""))
+        self._part_name = options.get(b"name", b"").decode("utf-8", errors="replace")
+        filename = options.get(b"filename")
+        if self._part_name == self.file_field and not self._file_done:
+            self._part_is_file = True
+            self.has_file = True
+            self.filename = filename.decode("utf-8", errors="replace") if filename is not None else None
+            self.file_started.set()
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._part_is_file:
+            if end > start:
+                self._pending.append(bytes(data[start:end]))
+        elif self._part_name is not None:
+            self._field_buf.extend(data[start:end])
+
+    def _on_part_end(self) -> None:
+        if self._part_is_file:
+            self._file_done = True
+            self._pending.append(_END)
+        elif self._part_name:
+            self.fields[self._part_name] = self._field_buf.decode("utf-8", errors="replace")
+
+    # -- driver --
+    async def _flush_pending(self) -> None:
+        pending, self._pending = self._pending, []
+        for item in pending:
+            if isinstance(item, bytes):
+                self.received += len(item)
+            await self._queue.put(item)
+
+    async def run(self) -> None:
+        """Read the request body to the end, feeding file data to ``chunks()``."""
+        try:
+            async for chunk in self.request.stream():
+                if chunk:
+                    self._parser.write(chunk)
+                    await self._flush_pending()
+            self._parser.finalize()
+            await self._flush_pending()
+        except Exception as exc:
+            if self.has_file and not self._file_done:
+                self._file_done = True
+                await self._queue.put(exc)
+            raise
+        finally:
+            if self.has_file and not self._file_done:
+                self._file_done = True
+                try:
+                    self._queue.put_nowait(_END)
+                except asyncio.QueueFull:
+                    pass
+            self.file_started.set()
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Yield the file part's bytes as they are parsed."""
+        while True:
+            item = await self._queue.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item  # type: ignore[misc]
@@ -0,0 +1,265 @@
+"""Incremental writers for transcription responses.
+
+Each ``iter_*`` generator yields UTF-8 ``bytes`` in batches of about
+``CHUNK_BYTES`` while walking the transcript lines once, so a multi-hour
+result is never held as one formatted string or one list of segment dicts
+and the first bytes can leave before the last segment is formatted. The
+output is byte-for-byte what the previous join-based formatters produced.
+
+``negotiate_encoding`` picks gzip (stdlib ``zlib``) or zstd (Python 3.14
+``compression.zstd`` or the ``zstandard`` package, when installed) from an
+``Accept-Encoding`` header, and ``encode`` compresses a chunk stream.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from .segments import dumps, iter_segments, parse_hms
+
+try:
+    from compression import zstd as _zstd  # Python 3.14+
+
+    def _zstd_compressor():
+        return _zstd.ZstdCompressor(level=3)
+
+except ImportError:
+    try:
+        import zstandard as _zstd
+
+        def _zstd_compressor():
+            return _zstd.ZstdCompressor(level=3).compressobj()
+
+    except ImportError:
+        _zstd = None
+
+CHUNK_BYTES = 64 * 1024
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "verbose_json": "application/json",
+    "text": "text/plain",
+    "srt": "text/srt",
+    "vtt": "text/vtt",
+    "jsonl": "application/x-ndjson",
+    "tsv": "text/tab-separated-values",
+}
+
+
+def speaker_label(speaker: Optional[int]) -> str:
+    try:
+        if speaker is None:
+            return ""
+        if int(speaker) <= 0:
+            return ""
+        return f"Speaker {int(speaker)}: "
+    except Exception:
+        return ""
+
+
+def verbose_segment(item: dict) -> Optional[dict]:
+    text = (item.get("text") or "").strip()
+    if not text:
+        return None
+    spk = item.get("speaker")
+    return {
+        "start": parse_hms(item.get("beg", "00:00:00")),
+        "end": parse_hms(item.get("end", "00:00:00")),
+        "text": text,
+        "speaker": spk if isinstance(spk, int) else None,
+        "speaker_label": (speaker_label(spk).rstrip() if speaker_label(spk) else None),
+    }
+
+
+def _batched(pieces: Iterable[str | bytes]) -> Iterator[bytes]:
+    """Join small pieces into chunks of about ``CHUNK_BYTES``."""
+    buf: List[bytes] = []
+    size = 0
+    for piece in pieces:
+        data = piece.encode("utf-8") if isinstance(piece, str) else piece
+        buf.append(data)
+        size += len(data)
+        if size >= CHUNK_BYTES:
+            yield b"".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield b"".join(buf)
+
+
+def _text_pieces(texts: Sequence[str]) -> Iterator[str]:
+    first = True
+    for text in texts:
+        text = (text or "").strip()
+        if not text:
+            continue
+        yield text if first else " " + text
+        first = False
+
+
+def _timestamp(seconds: float, sep: str) -> str:
+    h = int(seconds // 3600)
+    m = int((seconds % 3600) // 60)
+    s = int(seconds % 60)
+    return f"{h:02d}:{m:02d}:{s:02d}{sep}000"
+
+
+def _labelled(speaker: object, text: str) -> str:
+    label = speaker_label(speaker)  # type: ignore[arg-type]
+    return f"{label}{text}" if label else text
+
+
+def iter_text(texts: Sequence[str]) -> Iterator[bytes]:
+    return _batched(_text_pieces(texts))
+
+
+def iter_srt(lines: Sequence[dict]) -> Iterator[bytes]:
+    def pieces() -> Iterator[str]:
+        idx = 0
+        for seg in iter_segments(lines):
+            idx += 1
+            sep = "" if idx == 1 else "\n\n"
+            yield (
+                f"{sep}{idx}\n"
+                f"{_timestamp(seg.beg_sec, ',')} --> {_timestamp(seg.end_sec, ',')}\n"
+                f"{_labelled(seg.speaker, seg.text)}"
+            )
+        if idx:
+            yield "\n"
+
+    return _batched(pieces())
+
+
+def iter_vtt(lines: Sequence[dict]) -> Iterator[bytes]:
+    def pieces() -> Iterator[str]:
+        yield "WEBVTT"
+        any_cue = False
+        for seg in iter_segments(lines):
+            yield (
+                f"\n\n{_timestamp(seg.beg_sec, '.')} --> {_timestamp(seg.end_sec, '.')}\n"
+                f"{_labelled(seg.speaker, seg.text)}"
+            )
+            any_cue = True
+        if any_cue:
+            yield "\n"
+
+    return _batched(pieces())
+
+
+def _json_text_pieces(texts: Sequence[str]) -> Iterator[bytes]:
+    """``"text":"..."`` member, encoding the transcript piece by piece."""
+    yield b'{"text":"'
+    for piece in _text_pieces(texts):
+        yield dumps(piece)[1:-1]
+    yield b'"'
+
+
+def iter_json(texts: Sequence[str]) -> Iterator[bytes]:
+    def pieces() -> Iterator[bytes]:
+        yield from _json_text_pieces(texts)
+        yield b"}"
+
+    return _batched(pieces())
+
+
+def iter_verbose_json(texts: Sequence[str], lines: Sequence[dict]) -> Iterator[bytes]:
+    def pieces() -> Iterator[bytes]:
+        yield from _json_text_pieces(texts)
+        yield b',"segments":['
+        first = True
+        for item in lines:
+            segment = verbose_segment(item)
+            if segment is None:
+                continue
+            yield dumps(segment) if first else b"," + dumps(segment)
+            first = False
+        yield b"]}"
+
+    return _batched(pieces())
+
+
+def iter_jsonl(lines: Sequence[dict]) -> Iterator[bytes]:
+    """One verbose_json segment per line, with its index as ``id``."""
+
+    def pieces() -> Iterator[bytes]:
+        idx = 0
+        for item in lines:
+            segment = verbose_segment(item)
+            if segment is None:
+                continue
+            yield dumps({"id": idx, **segment}) + b"\n"
+            idx += 1
+
+    return _batched(pieces())
+
+
+def iter_tsv(lines: Sequence[dict]) -> Iterator[bytes]:
+    """``start``/``end`` in integer milliseconds (as Whisper's tsv), speaker, text."""
+
+    def pieces() -> Iterator[str]:
+        yield "start\tend\tspeaker\ttext\n"
+        for seg in iter_segments(lines):
+            text = " ".join(seg.text.split())
+            speaker = seg.speaker if isinstance(seg.speaker, int) else ""
+            yield f"{int(round(seg.beg_sec * 1000))}\t{int(round(seg.end_sec * 1000))}\t{speaker}\t{text}\n"
+
+    return _batched(pieces())
+
+
+def iter_response(rf: str, texts: Sequence[str], lines: Sequence[dict]) -> Iterator[bytes]:
+    """Writer for ``response_format`` (one of ``MEDIA_TYPES``)."""
+    if rf == "text":
+        return iter_text(texts)
+    if rf == "srt":
+        return iter_srt(lines)
+    if rf == "vtt":
+        return iter_vtt(lines)
+    if rf == "verbose_json":
+        return iter_verbose_json(texts, lines)
+    if rf == "jsonl":
+        return iter_jsonl(lines)
+    if rf == "tsv":
+        return iter_tsv(lines)
+    return iter_json(texts)
+
+
+# -- content encoding --
+
+def available_encodings() -> List[str]:
+    """Supported encodings, most preferred first."""
+    return ["zstd", "gzip"] if _zstd is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported encoding the client accepts, or None for identity."""
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            weights[name] = q
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def encode(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Compress a chunk stream with ``encoding`` (gzip or zstd)."""
+    compressor = _zstd_compressor() if encoding == "zstd" else zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
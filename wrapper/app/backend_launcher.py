@@ -8,23 +8,83 @@ Silero VAD model. PyTorch 2.x defaults to trusting none which may raise
 an exception on first download. By monkeypatching ``torch.hub.load`` to
 set ``trust_repo=True`` when unspecified, the backend remains compatible
 without requiring upstream modification.
+
+Patches are applied by a ``sys.meta_path`` finder when their target module
+is first imported, so a backend that never loads torch or faster-whisper
+does not pay for importing them. Cold start is logged as a timeline
+(import, model load, warmup, listen).
+
+It also adds a cheap ``GET /wrapper/health`` route to the upstream app
+(model warmed, active sessions, RSS) for readiness checks.
 """
 
 import importlib
+import importlib.abc
 import sys
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
+from types import ModuleType
+from typing import Callable, Optional
+
+_LAUNCHED_AT = time.monotonic()
+
+
+def log(message: str) -> None:
+    print(f"[wrapper.backend_launcher] {message}", file=sys.stderr, flush=True)
+
+
+class _PatchOnImport(importlib.abc.MetaPathFinder):
+    """Run ``patch(module)`` right after a registered module is first executed."""
 
+    def __init__(self) -> None:
+        self._patches: dict[str, Callable[[ModuleType], None]] = {}
 
-def _patch_torch_hub() -> None:
+    def register(self, name: str, patch: Callable[[ModuleType], None]) -> None:
+        module = sys.modules.get(name)
+        if module is not None:
+            _apply(name, patch, module)
+        else:
+            self._patches[name] = patch
+
+    def find_spec(self, fullname, path, target=None):
+        patch = self._patches.pop(fullname, None)
+        if patch is None:
+            return None
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        if loader is None or not hasattr(loader, "exec_module"):
+            return spec
+        exec_module = loader.exec_module
+
+        def _exec_and_patch(module: ModuleType) -> None:
+            exec_module(module)
+            _apply(fullname, patch, module)
+
+        # File finders create a loader per spec, so this touches only this module
+        loader.exec_module = _exec_and_patch  # type: ignore[method-assign]
+        return spec
+
+
+def _apply(name: str, patch: Callable[[ModuleType], None], module: ModuleType) -> None:
     try:
-        import torch.hub as hub  # type: ignore
-    except ModuleNotFoundError:  # pragma: no cover - optional dependency
-        print("[wrapper.backend_launcher] torch not available; skipping torch.hub trust patch.", file=sys.stderr, flush=True)
-        return
+        patch(module)
     except Exception as exc:  # pragma: no cover - defensive
-        print(f"[wrapper.backend_launcher] failed to prepare torch.hub patch: {exc}", file=sys.stderr, flush=True)
-        return
+        log(f"failed to patch {name}: {exc}")
+
+
+_PATCHES = _PatchOnImport()
+
 
+def _patch_torch_hub(hub: ModuleType) -> None:
     _orig_load = hub.load
 
     def _load_with_trust_repo(repo_or_dir, model, *args, trust_repo=None, **kwargs):
@@ -35,19 +95,8 @@ def _patch_torch_hub() -> None:
     hub.load = _load_with_trust_repo
 
 
-_patch_torch_hub()
-
-
-def _patch_simulstreaming_fast_encoder() -> None:
+def _patch_simulstreaming_fast_encoder(faster_whisper: ModuleType) -> None:
     """Allow SimulStreaming to reuse FasterWhisper with wrapper-managed .pt files."""
-    try:
-        import faster_whisper  # type: ignore
-    except ModuleNotFoundError:  # pragma: no cover - optional dependency
-        return
-    except Exception as exc:  # pragma: no cover - defensive
-        print(f"[wrapper.backend_launcher] failed to prepare faster-whisper patch: {exc}", file=sys.stderr, flush=True)
-        return
-
     original_cls = faster_whisper.WhisperModel
 
     class _WrapperWhisperModel(original_cls):  # type: ignore[misc]
@@ -63,16 +112,89 @@ def _patch_simulstreaming_fast_encoder() -> None:
 
     faster_whisper.WhisperModel = _WrapperWhisperModel  # type: ignore[assignment]
 
-    try:
-        import faster_whisper.transcribe as _fw_transcribe  # type: ignore
-    except Exception:  # pragma: no cover - best effort
+    _fw_transcribe = sys.modules.get("faster_whisper.transcribe")
+    if getattr(_fw_transcribe, "WhisperModel", None) is original_cls:
+        _fw_transcribe.WhisperModel = _WrapperWhisperModel  # type: ignore[union-attr]
+
+
+class _Timeline:
+    """Backend cold-start phases, each logged when it ends."""
+
+    ORDER = ("import", "model load", "warmup", "listen")
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self.engine_started_at: Optional[float] = None
+        # Set when the upstream lifespan startup (engine load + warmup) has finished
+        self.warm_at: Optional[float] = None
+        self.listening_at: Optional[float] = None
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = round(seconds, 2)
+        log(f"startup: {phase} {seconds:.2f}s")
+
+    def ordered(self) -> dict[str, float]:
+        return {phase: self.phases[phase] for phase in self.ORDER if phase in self.phases}
+
+    def imported(self) -> None:
+        self.record("import", time.monotonic() - _LAUNCHED_AT)
+
+    def engine_starting(self) -> None:
+        self.engine_started_at = time.monotonic()
+
+    def warm(self) -> None:
+        self.warm_at = time.monotonic()
+        if self.engine_started_at is not None:
+            # The engine constructor loads the model and runs the warmup
+            engine = self.warm_at - self.engine_started_at
+            self.record("model load", engine - self.phases.get("warmup", 0.0))
+
+    def listening(self) -> None:
+        self.listening_at = time.monotonic()
+        if self.warm_at is not None:
+            self.record("listen", self.listening_at - self.warm_at)
+        summary = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.ordered().items())
+        log(f"startup timeline: {summary}; ready {self.listening_at - _LAUNCHED_AT:.2f}s after launch")
+
+
+_TIMELINE = _Timeline()
+
+
+def _time_warmup(whisper_online: ModuleType) -> None:
+    original = getattr(whisper_online, "warmup_asr", None)
+    if original is None:
         return
 
-    if getattr(_fw_transcribe, "WhisperModel", None) is original_cls:
-        _fw_transcribe.WhisperModel = _WrapperWhisperModel  # type: ignore[assignment]
+    def warmup_asr(*args, **kwargs):
+        started = time.monotonic()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            _TIMELINE.record("warmup", time.monotonic() - started)
+
+    whisper_online.warmup_asr = warmup_asr
 
 
-_patch_simulstreaming_fast_encoder()
+def _time_listen(uvicorn_server: ModuleType) -> None:
+    server_cls = uvicorn_server.Server
+    original = server_cls.startup
+
+    async def startup(self, *args, **kwargs):
+        await original(self, *args, **kwargs)
+        if not self.should_exit:
+            _TIMELINE.listening()
+
+    server_cls.startup = startup
+
+
+def _install_import_hooks() -> None:
+    if _PATCHES not in sys.meta_path:
+        sys.meta_path.insert(0, _PATCHES)
+    _PATCHES.register("torch.hub", _patch_torch_hub)
+    _PATCHES.register("faster_whisper", _patch_simulstreaming_fast_encoder)
+    _PATCHES.register("whisperlivekit.whisper_streaming_custom.whisper_online", _time_warmup)
+    _PATCHES.register("uvicorn.server", _time_listen)
+
 
 # Ensure upstream submodule is importable as `whisperlivekit`
 def _ensure_upstream_on_path() -> None:
@@ -112,13 +234,104 @@ def _ensure_upstream_on_path() -> None:
             sys.path.insert(0, upstream_str)
 
 
-_ensure_upstream_on_path()
+HEALTH_PATH = "/wrapper/health"
+
 
-# Defer import until after patching and sys.path setup
-basic_server = importlib.import_module("whisperlivekit.basic_server")
+class _HealthState:
+    def __init__(self) -> None:
+        self.active_sessions = 0
+        self.sessions_total = 0
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil  # type: ignore
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def _install_health_route(server) -> None:
+    """Add ``GET /wrapper/health`` to the upstream app without editing upstream.
+
+    Unlike a probe session on ``/asr`` (which makes the backend set up an
+    audio processor and FFmpeg), it only reads counters, so the GUI and the
+    API can poll it often. Returns 200 once the model is loaded and warmed,
+    503 before.
+    """
+    app = getattr(server, "app", None)
+    if app is None:
+        log("upstream app not found; health route not installed.")
+        return
+    state = _HealthState()
+    upstream_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def _lifespan(app_):
+        # The upstream lifespan builds the TranscriptionEngine, which loads and warms the model
+        _TIMELINE.engine_starting()
+        async with upstream_lifespan(app_) as lifespan_state:
+            _TIMELINE.warm()
+            yield lifespan_state
+
+    app.router.lifespan_context = _lifespan
+
+    class _SessionCounter:
+        def __init__(self, app_) -> None:
+            self.app = app_
+
+        async def __call__(self, scope, receive, send) -> None:
+            if scope["type"] != "websocket" or scope.get("path") != "/asr":
+                await self.app(scope, receive, send)
+                return
+            state.active_sessions += 1
+            state.sessions_total += 1
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                state.active_sessions -= 1
+
+    app.add_middleware(_SessionCounter)
+
+    async def health():
+        from fastapi.responses import JSONResponse
+
+        now = time.monotonic()
+        warm_at = _TIMELINE.warm_at
+        warm = warm_at is not None
+        rss = _rss_mb()
+        return JSONResponse(
+            {
+                "status": "ok" if warm else "starting",
+                "model_loaded": getattr(server, "transcription_engine", None) is not None,
+                "warmup_complete": warm,
+                "active_sessions": state.active_sessions,
+                "sessions_total": state.sessions_total,
+                "rss_mb": round(rss, 1) if rss is not None else None,
+                "uptime_sec": round(now - _LAUNCHED_AT, 2),
+                "startup_sec": round(warm_at - _LAUNCHED_AT, 2) if warm else None,
+                "startup_phases": _TIMELINE.ordered(),
+            },
+            status_code=200 if warm else 503,
+        )
+
+    app.add_api_route(HEALTH_PATH, health, methods=["GET"], include_in_schema=False)
 
 
 def main() -> None:
+    _install_import_hooks()
+    _ensure_upstream_on_path()
+    # Defer import until after patching and sys.path setup
+    basic_server = importlib.import_module("whisperlivekit.basic_server")
+    _TIMELINE.imported()
+    _install_health_route(basic_server)
     basic_server.main()
 
 
@@ -13,6 +13,7 @@ import audioop
 import json
 import queue
 import threading
+import urllib.request
 from typing import Optional
 from pathlib import Path
 import shutil
@@ -23,9 +24,11 @@ try:
 except Exception:
     keyring = None
 
+from . import launch
 from . import model_manager
 from . import preflight
 from wrapper.assets import get_packaged_warmup_file
+from wrapper.api import segments as segment_codec
 
 
 def _load_whisper_models() -> list[str]:
@@ -79,6 +82,9 @@ OLD_CONFIG_FILE = Path.home() / ".whisperlivekit-wrapper.json"
 LICENSE_FILE = Path(__file__).resolve().parents[2] / "LICENSE"
 THIRD_PARTY_LICENSES_FILE = Path(__file__).resolve().parents[1] / "licenses.json"
 HF_KEYRING_SERVICE = "WhisperLiveKit-Wrapper"
+# Startup readiness polling of the API's /healthz and /readyz
+READY_PROBE_INTERVAL_SEC = 0.25
+READY_PROBE_TIMEOUT_SEC = 3.0
 
 
 def _is_cuda_available() -> bool:
@@ -423,6 +429,8 @@ class WrapperGUI:
         self.ssl_certfile = tk.StringVar(value="")
         self.ssl_keyfile = tk.StringVar(value="")
         self.frame_threshold = tk.IntVar(value=25)
+        # Second, already warmed backend the API fails over to
+        self.standby_backend = tk.BooleanVar(value=os.getenv("WRAPPER_STANDBY_BACKEND") == "1")
 
         self.web_endpoint = tk.StringVar()
         self.ws_endpoint = tk.StringVar()
@@ -1003,12 +1011,16 @@ class WrapperGUI:
             pass
 
         self.backend_proc: subprocess.Popen | None = None
+        self.standby_proc: subprocess.Popen | None = None
         self.api_proc: subprocess.Popen | None = None
+        # Command line, env and start time per backend role, to respawn a standby
+        self._backend_launch: dict[str, tuple[list[str], dict[str, str]]] = {}
+        self._backend_started: dict[str, float] = {}
         self._log_threads: list[threading.Thread] = []
         self._api_ready: bool = False
         self._backend_ready: bool = False
-        self._backend_probe_thread: threading.Thread | None = None
-        self._backend_probe_stop: threading.Event | None = None
+        self._ready_probe_thread: threading.Thread | None = None
+        self._ready_probe_stop: threading.Event | None = None
 
         self._update_diarization_fields()
         self._update_hf_token_widgets()
@@ -1271,20 +1283,6 @@ class WrapperGUI:
                         self._relay_to_console(line, is_stderr)
                     except Exception:
                         pass
-                    if source == "api" and getattr(self, "_starting_api", False):
-                        try:
-                            low = line.lower()
-                        except Exception:
-                            low = ""
-                        if (
-                            ("application startup complete" in low)
-                            or ("uvicorn running on" in low)
-                            or ("started server process" in low)
-                        ):
-                            try:
-                                self.master.after(0, self._on_api_ready)
-                            except Exception:
-                                pass
                     try:
                         self.master.after(0, self._append_log, source, line, is_stderr)
                     except Exception:
@@ -1509,16 +1507,19 @@ class WrapperGUI:
         else:
             self._update_startup_status()
 
+    def _since_launch(self) -> float:
+        return time.monotonic() - getattr(self, "_launch_started_at", time.monotonic())
+
     def _finish_startup(self) -> None:
         self._cancel_starting_ui()
-        self._stop_backend_probe()
+        self._stop_ready_probe()
         try:
             self.status_var.set(self._t("running"))
         except Exception:
             pass
         self._set_running_state(True)
         try:
-            self._append_log("gui", "Startup complete; backend and API ready.\n")
+            self._append_log("gui", f"Startup complete; backend and API ready in {self._since_launch():.1f}s.\n")
         except Exception:
             pass
 
@@ -1529,7 +1530,7 @@ class WrapperGUI:
             return
         self._api_ready = True
         try:
-            self._append_log("gui", "Wrapper API reported ready.\n")
+            self._append_log("gui", f"Wrapper API healthy after {self._since_launch():.1f}s.\n")
         except Exception:
             pass
         self._maybe_finish_startup()
@@ -1541,78 +1542,58 @@ class WrapperGUI:
             return
         self._backend_ready = True
         try:
-            self._append_log("gui", "Backend readiness confirmed.\n")
+            self._append_log("gui", f"Backend ready (model loaded and warmed) after {self._since_launch():.1f}s.\n")
         except Exception:
             pass
         self._maybe_finish_startup()
 
-    def _start_backend_probe(self, url: str) -> None:
-        self._stop_backend_probe()
-        if not url:
-            self._backend_ready = True
-            self._maybe_finish_startup()
-            return
+    def _start_ready_probe(self, base_url: str) -> None:
+        """Poll the API's /healthz (API up) and /readyz (backend warmed) until both pass."""
+        self._stop_ready_probe()
+        self._api_ready = False
         self._backend_ready = False
         stop_event = threading.Event()
-        self._backend_probe_stop = stop_event
+        self._ready_probe_stop = stop_event
 
-        def _worker() -> None:
+        def _ok(path: str) -> bool:
             try:
-                from websockets.sync.client import connect
-            except Exception as exc:
-                def _skip() -> None:
-                    try:
-                        self._append_log("gui", f"Backend readiness probe skipped: {exc}\n")
-                    except Exception:
-                        pass
-                    self._backend_ready = True
-                    self._maybe_finish_startup()
-                self.master.after(0, _skip)
-                return
-            attempt = 0
-            while not stop_event.is_set():
-                if not getattr(self, "_starting_api", False):
+                with urllib.request.urlopen(base_url + path, timeout=READY_PROBE_TIMEOUT_SEC) as resp:
+                    return resp.status == 200
+            except Exception:
+                return False
+
+        def _worker() -> None:
+            api_up = False
+            while not stop_event.is_set() and getattr(self, "_starting_api", False):
+                if not api_up and _ok("/healthz"):
+                    api_up = True
+                    self.master.after(0, self._on_api_ready)
+                if api_up and _ok("/readyz"):
+                    self.master.after(0, self._on_backend_ready)
+                    return
+                if stop_event.wait(READY_PROBE_INTERVAL_SEC):
                     return
-                attempt += 1
-                try:
-                    with connect(url, open_timeout=10, close_timeout=3) as ws:
-                        try:
-                            ws.close()
-                        except Exception:
-                            pass
-                except Exception as exc:
-                    if stop_event.is_set() or not getattr(self, "_starting_api", False):
-                        return
-                    wait = min(1.5 ** min(attempt, 6), 5.0)
-                    if attempt == 1 or attempt % 3 == 0:
-                        self.master.after(0, lambda m=f"Backend not ready (attempt {attempt}): {exc}": self._append_log("gui", m + "\n"))
-                    self.master.after(0, self._update_startup_status)
-                    if stop_event.wait(wait):
-                        return
-                    continue
-                self.master.after(0, self._on_backend_ready)
-                return
 
         thread = threading.Thread(target=_worker, daemon=True)
-        self._backend_probe_thread = thread
+        self._ready_probe_thread = thread
         thread.start()
         self._update_startup_status()
 
-    def _stop_backend_probe(self) -> None:
-        stop_event = getattr(self, "_backend_probe_stop", None)
+    def _stop_ready_probe(self) -> None:
+        stop_event = getattr(self, "_ready_probe_stop", None)
         if stop_event is not None:
             try:
                 stop_event.set()
             except Exception:
                 pass
-        thread = getattr(self, "_backend_probe_thread", None)
+        thread = getattr(self, "_ready_probe_thread", None)
         if thread and thread.is_alive() and thread is not threading.current_thread():
             try:
                 thread.join(timeout=1.5)
             except Exception:
                 pass
-        self._backend_probe_thread = None
-        self._backend_probe_stop = None
+        self._ready_probe_thread = None
+        self._ready_probe_stop = None
 
     def start_api(self):
         if self.api_proc or self.backend_proc:
@@ -1622,7 +1603,7 @@ class WrapperGUI:
             return
         self._api_ready = False
         self._backend_ready = False
-        self._stop_backend_probe()
+        self._stop_ready_probe()
         self._begin_starting_ui()
         missing: list[str] = []
         model = self.model.get().strip()
@@ -1689,30 +1670,17 @@ class WrapperGUI:
         self._launch_server()
 
     def _launch_server(self) -> None:
-        b_host = self.backend_host.get()
-        b_port = self.backend_port.get()
         a_host = self.api_host.get()
         a_port = self.api_port.get()
 
         # Reflect 'starting' state in UI
         self._begin_starting_ui()
 
-        base_env = os.environ.copy()
-        base_env["WRAPPER_BACKEND_HOST"] = b_host
-        base_env["WRAPPER_BACKEND_PORT"] = b_port
-        base_env["WRAPPER_API_HOST"] = a_host
-        base_env["WRAPPER_API_PORT"] = a_port
-        queue_timeout = base_env.get("WRAPPER_BACKEND_QUEUE_TIMEOUT_SEC")
-        if not queue_timeout:
-            # 無制限待ちを既定とし、既存環境が値を指定している場合は尊重する
-            base_env["WRAPPER_BACKEND_QUEUE_TIMEOUT_SEC"] = "0"
-        base_env["HUGGINGFACE_HUB_CACHE"] = str(model_manager.HF_CACHE_DIR)
-        base_env["TORCH_HOME"] = str(model_manager.TORCH_CACHE_DIR)
-        # Ensure child Python processes flush output immediately so logs appear in real time
-        base_env["PYTHONUNBUFFERED"] = "1"
+        settings = self._settings_data()
+        diarization = bool(self.diarization.get() and self.hf_logged_in)
         # Propagate Hugging Face token to backend process if available
+        token: str | None = None
         try:
-            token: str | None = None
             # Prefer token from system keyring when available
             if self._keyring_available():
                 token = self._keyring_get_token()
@@ -1721,24 +1689,10 @@ class WrapperGUI:
                 t = (self.hf_token.get() or "").strip()
                 if t and t != "********":
                     token = t
-            # Fallback to huggingface_hub stored token
+            # Fallback to huggingface_hub stored token, then pre-set environment
             if not token:
-                try:
-                    from huggingface_hub import HfFolder  # type: ignore
-                    token = HfFolder.get_token()
-                except Exception:
-                    token = None
-            # Fallback to pre-set environment
-            if not token:
-                for k in ("HUGGING_FACE_HUB_TOKEN", "HUGGINGFACEHUB_API_TOKEN", "HF_TOKEN"):
-                    if os.getenv(k):
-                        token = os.getenv(k)
-                        break
+                token = launch.find_hf_token()
             if token:
-                # Set common aliases used by huggingface_hub/pyannote
-                base_env["HUGGING_FACE_HUB_TOKEN"] = token
-                base_env["HUGGINGFACEHUB_API_TOKEN"] = token
-                base_env["HF_TOKEN"] = token
                 # Also persist token to huggingface_hub store if not already present,
                 # because some libs pass use_auth_token=True which reads from HfFolder.
                 try:
@@ -1749,124 +1703,96 @@ class WrapperGUI:
                     pass
         except Exception:
             pass
-        cert = self.vad_certfile.get().strip()
-        if cert and Path(cert).is_file():
-            base_env["SSL_CERT_FILE"] = cert
-        # Fallback: if no SSL_CERT_FILE is provided, try to use certifi CA bundle
-        if "SSL_CERT_FILE" not in base_env:
-            try:
-                import certifi  # type: ignore
-                base_env["SSL_CERT_FILE"] = certifi.where()
-            except Exception:
-                pass
+        base_env = launch.base_env(settings, hf_token=token)
 
         # MSIX/Windows 対策: 起動前プリフライトでキャッシュ環境と symlink 実体化を整備
         try:
-            preflight.run(base_env)
+            preflight.run_cached(base_env)
         except Exception:
             # 起動は継続（ベストエフォート）
             pass
 
-        backend_cmd = [
-            sys.executable,
-            "-u",
-            "-m",
-            "wrapper.app.backend_launcher",
-            "--host",
-            b_host,
-            "--port",
-            b_port,
-        ]
-        # Share wrapper-managed cache directory with backend for consistency
-        backend_cmd += ["--model_cache_dir", str(model_manager.HF_CACHE_DIR)]
-        model = self.model.get().strip()
-        if model:
-            backend = self.backend.get().strip()
-            if backend == "simulstreaming":
-                backend_cmd += ["--model", model]
-                backend_cmd += [
-                    "--model_dir",
-                    str(model_manager.get_model_path(model, backend="simulstreaming")),
-                ]
-            elif backend == "faster-whisper":
-                backend_cmd += ["--model", model]
-                if model_manager.is_model_downloaded(model, backend="faster-whisper"):
-                    model_path = model_manager.get_model_path(model, backend="faster-whisper")
-                    if Path(model_path).exists():
-                        backend_cmd += ["--model_dir", str(model_path)]
-            else:
-                backend_cmd += ["--model_dir", str(model_manager.get_model_path(model))]
-        if self.diarization.get() and self.hf_logged_in:
-            backend_cmd.append("--diarization")
-            seg = self.segmentation_model.get().strip()
-            if seg:
-                backend_cmd += ["--segmentation-model", seg]
-            emb = self.embedding_model.get().strip()
-            if emb:
-                backend_cmd += ["--embedding-model", emb]
-            db = self.diarization_backend.get().strip()
-            if db:
-                backend_cmd += ["--diarization-backend", db]
-
-        warm = self.warmup_file.get().strip()
-        if warm:
-            backend_cmd += ["--warmup-file", warm]
-        if self.confidence_validation.get():
-            backend_cmd.append("--confidence-validation")
-        if self.punctuation_split.get():
-            backend_cmd.append("--punctuation-split")
-        backend_cmd += ["--min-chunk-size", str(self.min_chunk_size.get())]
-        backend_cmd += ["--language", self.language.get()]
-        backend_cmd += ["--task", self.task.get()]
-        backend_cmd += ["--backend", self.backend.get()]
-
-        # Disable VAC by default unless explicitly enabled to prevent torch.hub GitHub SSL failures
-        if self.use_vac.get():
-            backend_cmd += ["--vac-chunk-size", str(self.vac_chunk_size.get())]
-        else:
-            backend_cmd.append("--no-vac")
-
-        backend_cmd += ["--buffer_trimming", self.buffer_trimming.get()]
-        backend_cmd += ["--buffer_trimming_sec", str(self.buffer_trimming_sec.get())]
-        backend_cmd += ["--log-level", self.log_level.get()]
-        certfile = self.ssl_certfile.get().strip()
-        if certfile:
-            backend_cmd += ["--ssl-certfile", certfile]
-        keyfile = self.ssl_keyfile.get().strip()
-        if keyfile:
-            backend_cmd += ["--ssl-keyfile", keyfile]
-        backend_cmd += ["--frame-threshold", str(self.frame_threshold.get())]
-
         # Launch backend with propagated environment (includes HF token/cache paths)
-        backend_env = base_env.copy()
-        self.backend_proc = subprocess.Popen(
-            backend_cmd,
-            env=backend_env,
+        self._backend_launch = {
+            "backend": (launch.backend_command(settings, diarization=diarization), base_env.copy()),
+        }
+        standby_port = None
+        if settings["standby_backend"]:
+            used = {int(p) for p in (settings["backend_port"], a_port) if str(p).isdigit()}
+            standby_port = launch.find_free_port(exclude=used)
+            self._backend_launch["standby"] = (
+                launch.backend_command(settings, diarization=diarization, port=standby_port),
+                base_env.copy(),
+            )
+        self._launch_started_at = time.monotonic()
+        for role in self._backend_launch:
+            self._spawn_backend(role)
+        # The API starts alongside the backend; /readyz reports when the backend is warmed
+        api_env = launch.api_env(base_env, settings, diarization=diarization, standby_port=standby_port)
+
+        self._schedule_api_launch(api_env, a_host, a_port)
+        try:
+            self._start_ready_probe(f"http://{launch.connect_host(str(a_host))}:{a_port}")
+        except Exception:
+            pass
+        self._schedule_process_monitor()
+
+    def _spawn_backend(self, role: str) -> None:
+        """Start the backend process for ``role`` ("backend" or "standby")."""
+        cmd, env = self._backend_launch[role]
+        proc = subprocess.Popen(
+            cmd,
+            env=env,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
             bufsize=1,
         )
+        setattr(self, f"{role}_proc", proc)
+        self._backend_started[role] = time.monotonic()
         try:
-            self._start_log_reader(self.backend_proc, "backend")
+            self._start_log_reader(proc, role)
         except Exception:
             pass
+
+    def _fail_over_backend(self, source: str, code: int | None) -> bool:
+        """Keep serving from the surviving backend and respawn a standby.
+
+        The API already routes to the live one (see ``WRAPPER_BACKEND_STANDBY_URLS``);
+        the dead one is restarted as the new standby unless it crashed soon
+        after starting. Returns False when there is no live backend to keep.
+        """
+        survivor_role = "standby" if source == "backend" else "backend"
+        survivor = getattr(self, f"{survivor_role}_proc")
+        if survivor is None or survivor.poll() is not None:
+            return False
+        uptime = time.monotonic() - self._backend_started.get(source, 0.0)
+        if source == "backend":
+            # Promote the standby so backend_proc always holds a live process
+            self.backend_proc, self.standby_proc = survivor, None
+            launches = self._backend_launch
+            launches["backend"], launches["standby"] = launches["standby"], launches["backend"]
+            self._backend_started["backend"] = self._backend_started.get("standby", 0.0)
+        else:
+            self.standby_proc = None
         try:
-            self._start_backend_probe(self.ws_url.get())
+            self._append_log("gui", f"{source} exited with code {code}; serving from the other backend\n")
         except Exception:
             pass
-        # Defer API launch slightly to avoid blocking the GUI thread
-        api_env = base_env.copy()
-        use_key = bool(self.use_api_key.get()) and bool(self.api_key.get().strip())
-        api_env["WRAPPER_REQUIRE_API_KEY"] = "1" if use_key else "0"
-        if use_key:
-            api_env["WRAPPER_API_KEY"] = self.api_key.get().strip()
-        api_env["WRAPPER_BACKEND_SSL"] = (
-            "1" if (bool(self.ssl_certfile.get().strip()) and bool(self.ssl_keyfile.get().strip())) else "0"
-        )
-
-        self._schedule_api_launch(api_env, a_host, a_port)
-        self._schedule_process_monitor()
+        if uptime < 30.0:
+            try:
+                self._append_log("gui", f"{source} exited {uptime:.0f}s after start; standby not restarted\n")
+            except Exception:
+                pass
+            return True
+        try:
+            self._spawn_backend("standby")
+        except Exception as e:
+            try:
+                self._append_log("gui", f"Failed to restart standby backend: {e}\n")
+            except Exception:
+                pass
+        return True
 
     def _schedule_api_launch(self, env: dict[str, str], host: str, port: str) -> None:
         self._cancel_pending_api_launch()
@@ -1883,17 +1809,7 @@ class WrapperGUI:
             if backend_code is not None:
                 self._handle_process_exit("backend", backend_code)
                 return
-            api_cmd = [
-                sys.executable,
-                "-u",
-                "-m",
-                "uvicorn",
-                "wrapper.api.server:app",
-                "--host",
-                host,
-                "--port",
-                port,
-            ]
+            api_cmd = launch.api_command(host, port)
             try:
                 self.api_proc = subprocess.Popen(
                     api_cmd,
@@ -1917,7 +1833,7 @@ class WrapperGUI:
             self._schedule_process_monitor()
 
         try:
-            self._pending_api_start_id = self.master.after(2000, _start_api)
+            self._pending_api_start_id = self.master.after(0, _start_api)
         except Exception:
             _start_api()
 
@@ -1951,11 +1867,13 @@ class WrapperGUI:
         self._process_monitor_id = None
         if not (self.backend_proc or self.api_proc):
             return
-        for source, proc in (("backend", self.backend_proc), ("api", self.api_proc)):
+        for source, proc in (("backend", self.backend_proc), ("standby", self.standby_proc), ("api", self.api_proc)):
             if proc is None:
                 continue
             code = proc.poll()
             if code is not None:
+                if source != "api" and self._fail_over_backend(source, code):
+                    continue
                 self._handle_process_exit(source, code)
                 return
         self._schedule_process_monitor()
@@ -1963,7 +1881,7 @@ class WrapperGUI:
     def _handle_process_exit(self, source: str, code: int | None) -> None:
         if getattr(self, "_stopping_api", False):
             return
-        message_key = "Backend process exited unexpectedly" if source == "backend" else "API process exited unexpectedly"
+        message_key = "Backend process exited unexpectedly" if source != "api" else "API process exited unexpectedly"
         message = self._t(message_key)
         if code is not None:
             message = f"{message} (code {code})"
@@ -1971,20 +1889,20 @@ class WrapperGUI:
             self._append_log("gui", f"{source} exited with code {code}\n")
         except Exception:
             pass
-        other = self.api_proc if source == "backend" else self.backend_proc
-        if other and other.poll() is None:
-            try:
-                other.terminate()
+        for other in (self.api_proc, self.backend_proc, self.standby_proc):
+            if other and other.poll() is None:
                 try:
-                    other.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    other.kill()
-            except Exception:
-                pass
+                    other.terminate()
+                    try:
+                        other.wait(timeout=5)
+                    except subprocess.TimeoutExpired:
+                        other.kill()
+                except Exception:
+                    pass
         self._cleanup_processes(message)
 
     def _cleanup_processes(self, status_message: str) -> None:
-        self._stop_backend_probe()
+        self._stop_ready_probe()
         self._api_ready = False
         self._backend_ready = False
         self._cancel_pending_api_launch()
@@ -2001,6 +1919,7 @@ class WrapperGUI:
         self._stopping_api = False
         self.api_proc = None
         self.backend_proc = None
+        self.standby_proc = None
         try:
             self._set_running_state(False)
         except Exception:
@@ -2030,7 +1949,7 @@ class WrapperGUI:
         except Exception:
             pass
         self._cancel_pending_api_launch()
-        self._stop_backend_probe()
+        self._stop_ready_probe()
         self._api_ready = False
         self._backend_ready = False
         if not (self.api_proc or self.backend_proc):
@@ -2078,7 +1997,7 @@ class WrapperGUI:
             pass
         self._cancel_process_monitor()
         try:
-            for proc in [self.api_proc, self.backend_proc]:
+            for proc in [self.api_proc, self.backend_proc, self.standby_proc]:
                 if proc and proc.poll() is None:
                     proc.terminate()
                     try:
@@ -2182,6 +2101,7 @@ class WrapperGUI:
             self.ssl_certfile,
             self.ssl_keyfile,
             self.frame_threshold,
+            self.standby_backend,
             self.save_path,
             self.save_enabled,
             self.theme,
@@ -2776,13 +2696,14 @@ class WrapperGUI:
         self.ssl_certfile.set(data.get("ssl_certfile", self.ssl_certfile.get()))
         self.ssl_keyfile.set(data.get("ssl_keyfile", self.ssl_keyfile.get()))
         self.frame_threshold.set(data.get("frame_threshold", self.frame_threshold.get()))
+        self.standby_backend.set(data.get("standby_backend", self.standby_backend.get()))
         # 折りたたみ状態
         sc = data.get("settings_collapsed")
         if isinstance(sc, bool):
             self.settings_collapsed.set(sc)
 
-    def _save_settings(self) -> None:
-        data = {
+    def _settings_data(self) -> dict:
+        return {
             "backend_host": self.backend_host.get(),
             "backend_port": self.backend_port.get(),
             "api_host": self.api_host.get(),
@@ -2816,8 +2737,12 @@ class WrapperGUI:
             "ssl_certfile": self.ssl_certfile.get(),
             "ssl_keyfile": self.ssl_keyfile.get(),
             "frame_threshold": self.frame_threshold.get(),
+            "standby_backend": self.standby_backend.get(),
             "settings_collapsed": self.settings_collapsed.get(),
         }
+
+    def _save_settings(self) -> None:
+        data = self._settings_data()
         try:
             CONFIG_DIR.mkdir(parents=True, exist_ok=True)
             with open(CONFIG_FILE, "w", encoding="utf-8") as f:
@@ -2931,29 +2856,26 @@ class WrapperGUI:
                             return False
                         # 英数/CJK/かな/カナが1文字でも含まれているもののみ採用
                         return re.search(r"[A-Za-z0-9\u3040-\u30FF\u4E00-\u9FFF]", s) is not None
+                    parser = segment_codec.SnapshotParser()
                     while True:
                         try:
                             msg = websocket.recv()
                         except Exception:
                             break
                         try:
-                            data = json.loads(msg)
+                            data = segment_codec.loads(msg)
                             # 1) 確定結果スナップショット: 現在の全行（記号のみは除外）をそのまま描画
-                            # 発話者ラベルも保持
-                            lines_for_render: list[dict] = []
-                            for item in (data.get("lines", []) or []):
-                                if isinstance(item, dict):
-                                    t = (item.get("text") or "").strip()
-                                    if not _meaningful(t):
-                                        continue
-                                    spk = item.get("speaker")
-                                    # speaker -2 (silence) / 0 (loading) は表示しない
-                                    if isinstance(spk, int) and spk in (-2, 0):
-                                        continue
-                                    lines_for_render.append({
-                                        "speaker": spk,
-                                        "text": t,
-                                    })
+                            # 発話者ラベルも保持。speaker -2 (silence) / 0 (loading) は SnapshotParser が除外し、
+                            # 前回から変わっていない行は同じ Segment を再利用する
+                            segments = parser.parse(data.get("lines"))
+                            # 前回と同じスナップショット（長いセッションでは大半）は再描画しない
+                            if not parser.changed:
+                                continue
+                            lines_for_render: list[dict] = [
+                                {"speaker": seg.speaker, "text": seg.text}
+                                for seg in segments
+                                if _meaningful(seg.text)
+                            ]
                             # 2) buffer_transcription / buffer_diarization はノイズが多いため Transcript には反映しない
                             # 3) テキストは追記ではなく置換描画（重複増殖を防ぐ）
                             self.master.after(0, lambda lines=lines_for_render: self._render_transcript_lines(lines))
@@ -3537,6 +3459,8 @@ class BackendSettingsDialog(tk.Toplevel):
         r += 1
         ttk.Checkbutton(self, text="Use punctuation split", variable=gui.punctuation_split).grid(row=r, column=0, columnspan=2, sticky=tk.W)
         r += 1
+        ttk.Checkbutton(self, text="Warm standby backend (failover)", variable=gui.standby_backend).grid(row=r, column=0, columnspan=2, sticky=tk.W)
+        r += 1
         ttk.Label(self, text="Min chunk size").grid(row=r, column=0, sticky=tk.W)
         ttk.Entry(self, textvariable=gui.min_chunk_size, width=10).grid(row=r, column=1, sticky=tk.W)
         r += 1
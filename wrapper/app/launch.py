@@ -0,0 +1,252 @@
+"""Backend and API process command lines, shared by the GUI and ``wrapper.cli serve``.
+
+Everything here works on the plain settings dict stored in ``settings.json``
+(see ``DEFAULT_SETTINGS``), so the headless server builds exactly the same
+commands as the GUI without importing tkinter.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Optional
+
+from . import model_manager
+
+# Defaults of the GUI variables that shape the backend/API launch
+DEFAULT_SETTINGS: dict = {
+    "backend_host": "127.0.0.1",
+    "backend_port": "",
+    "api_host": "127.0.0.1",
+    "api_port": "",
+    "model": "large-v3",
+    "use_api_key": False,
+    "api_key": "",
+    "use_vac": False,
+    "vad_certfile": "",
+    "diarization": False,
+    "segmentation_model": "pyannote/segmentation-3.0",
+    "embedding_model": "pyannote/embedding",
+    "warmup_file": "",
+    "confidence_validation": False,
+    "punctuation_split": False,
+    "diarization_backend": "diart",
+    "min_chunk_size": 0.5,
+    "language": "auto",
+    "task": "transcribe",
+    "backend": "simulstreaming",
+    "vac_chunk_size": 0.04,
+    "buffer_trimming": "segment",
+    "buffer_trimming_sec": 15.0,
+    "log_level": "DEBUG",
+    "ssl_certfile": "",
+    "ssl_keyfile": "",
+    "frame_threshold": 25,
+    "standby_backend": False,
+}
+
+# Settings that do not shape a backend (kept out of WRAPPER_BACKEND_SETTINGS)
+_API_ONLY_KEYS = ("api_host", "api_port", "use_api_key", "api_key", "standby_backend")
+
+_HF_TOKEN_ENV = ("HUGGING_FACE_HUB_TOKEN", "HUGGINGFACEHUB_API_TOKEN", "HF_TOKEN")
+
+
+def load_settings(path: Path) -> dict:
+    """``DEFAULT_SETTINGS`` overlaid with a settings.json file (GUI format)."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object")
+    return {**DEFAULT_SETTINGS, **data}
+
+
+def find_free_port(exclude: set[int] | None = None) -> int:
+    while True:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("", 0))
+            port = s.getsockname()[1]
+        if exclude and port in exclude:
+            continue
+        return port
+
+
+def find_hf_token(environ: Optional[dict[str, str]] = None) -> Optional[str]:
+    """Hugging Face token from the huggingface_hub store or the environment."""
+    try:
+        from huggingface_hub import HfFolder  # type: ignore
+
+        token = HfFolder.get_token()
+    except Exception:
+        token = None
+    if token:
+        return token
+    environ = os.environ if environ is None else environ
+    for key in _HF_TOKEN_ENV:
+        if environ.get(key):
+            return environ[key]
+    return None
+
+
+def base_env(settings: dict, *, hf_token: Optional[str] = None, environ: Optional[dict[str, str]] = None) -> dict[str, str]:
+    """Environment shared by the backend and API processes."""
+    env = dict(os.environ if environ is None else environ)
+    env["WRAPPER_BACKEND_HOST"] = str(settings["backend_host"])
+    env["WRAPPER_BACKEND_PORT"] = str(settings["backend_port"])
+    env["WRAPPER_API_HOST"] = str(settings["api_host"])
+    env["WRAPPER_API_PORT"] = str(settings["api_port"])
+    if not env.get("WRAPPER_BACKEND_QUEUE_TIMEOUT_SEC"):
+        # 無制限待ちを既定とし、既存環境が値を指定している場合は尊重する
+        env["WRAPPER_BACKEND_QUEUE_TIMEOUT_SEC"] = "0"
+    env["HUGGINGFACE_HUB_CACHE"] = str(model_manager.HF_CACHE_DIR)
+    env["TORCH_HOME"] = str(model_manager.TORCH_CACHE_DIR)
+    # Ensure child Python processes flush output immediately so logs appear in real time
+    env["PYTHONUNBUFFERED"] = "1"
+    if hf_token:
+        # Set common aliases used by huggingface_hub/pyannote
+        for key in _HF_TOKEN_ENV:
+            env[key] = hf_token
+    cert = str(settings.get("vad_certfile") or "").strip()
+    if cert and Path(cert).is_file():
+        env["SSL_CERT_FILE"] = cert
+    # Fallback: if no SSL_CERT_FILE is provided, try to use certifi CA bundle
+    if "SSL_CERT_FILE" not in env:
+        try:
+            import certifi  # type: ignore
+
+            env["SSL_CERT_FILE"] = certifi.where()
+        except Exception:
+            pass
+    return env
+
+
+def backend_command(settings: dict, *, diarization: bool, port: Optional[int] = None) -> list[str]:
+    """``wrapper.app.backend_launcher`` command line.
+
+    ``diarization`` is the effective flag (the GUI also requires a
+    Hugging Face login). ``port`` overrides ``backend_port`` (warm standby).
+    """
+    cmd = [
+        sys.executable,
+        "-u",
+        "-m",
+        "wrapper.app.backend_launcher",
+        "--host",
+        str(settings["backend_host"]),
+        "--port",
+        str(settings["backend_port"] if port is None else port),
+    ]
+    # Share wrapper-managed cache directory with backend for consistency
+    cmd += ["--model_cache_dir", str(model_manager.HF_CACHE_DIR)]
+    model = str(settings.get("model") or "").strip()
+    backend = str(settings.get("backend") or "").strip()
+    if model:
+        if backend == "simulstreaming":
+            cmd += ["--model", model]
+            cmd += [
+                "--model_dir",
+                str(model_manager.get_model_path(model, backend="simulstreaming")),
+            ]
+        elif backend == "faster-whisper":
+            cmd += ["--model", model]
+            if model_manager.is_model_downloaded(model, backend="faster-whisper"):
+                model_path = model_manager.get_model_path(model, backend="faster-whisper")
+                if Path(model_path).exists():
+                    cmd += ["--model_dir", str(model_path)]
+        else:
+            cmd += ["--model_dir", str(model_manager.get_model_path(model))]
+    if diarization:
+        cmd.append("--diarization")
+        for key, flag in (
+            ("segmentation_model", "--segmentation-model"),
+            ("embedding_model", "--embedding-model"),
+            ("diarization_backend", "--diarization-backend"),
+        ):
+            value = str(settings.get(key) or "").strip()
+            if value:
+                cmd += [flag, value]
+
+    warm = str(settings.get("warmup_file") or "").strip()
+    if warm:
+        cmd += ["--warmup-file", warm]
+    if settings.get("confidence_validation"):
+        cmd.append("--confidence-validation")
+    if settings.get("punctuation_split"):
+        cmd.append("--punctuation-split")
+    cmd += ["--min-chunk-size", str(settings["min_chunk_size"])]
+    cmd += ["--language", str(settings["language"])]
+    cmd += ["--task", str(settings["task"])]
+    cmd += ["--backend", backend]
+
+    # Disable VAC by default unless explicitly enabled to prevent torch.hub GitHub SSL failures
+    if settings.get("use_vac"):
+        cmd += ["--vac-chunk-size", str(settings["vac_chunk_size"])]
+    else:
+        cmd.append("--no-vac")
+
+    cmd += ["--buffer_trimming", str(settings["buffer_trimming"])]
+    cmd += ["--buffer_trimming_sec", str(settings["buffer_trimming_sec"])]
+    cmd += ["--log-level", str(settings["log_level"])]
+    certfile = str(settings.get("ssl_certfile") or "").strip()
+    if certfile:
+        cmd += ["--ssl-certfile", certfile]
+    keyfile = str(settings.get("ssl_keyfile") or "").strip()
+    if keyfile:
+        cmd += ["--ssl-keyfile", keyfile]
+    cmd += ["--frame-threshold", str(settings["frame_threshold"])]
+    return cmd
+
+
+def connect_host(host: str) -> str:
+    # A wildcard bind address is reachable on loopback
+    return "127.0.0.1" if host in ("0.0.0.0", "::", "") else host
+
+
+def api_env(
+    env: dict[str, str], settings: dict, *, diarization: bool, standby_port: Optional[int] = None
+) -> dict[str, str]:
+    """API process environment on top of ``base_env``.
+
+    With ``standby_port`` the API routes to the backend and, on failover, to
+    the warm standby backend on that port.
+    """
+    env = env.copy()
+    if standby_port is not None:
+        host = connect_host(str(settings["backend_host"]))
+        standby = f"{host}:{standby_port}"
+        env["WRAPPER_BACKEND_URLS"] = f"{host}:{settings['backend_port']},{standby}"
+        env["WRAPPER_BACKEND_STANDBY_URLS"] = standby
+    api_key = str(settings.get("api_key") or "").strip()
+    use_key = bool(settings.get("use_api_key")) and bool(api_key)
+    env["WRAPPER_REQUIRE_API_KEY"] = "1" if use_key else "0"
+    if use_key:
+        env["WRAPPER_API_KEY"] = api_key
+    ssl = bool(str(settings.get("ssl_certfile") or "").strip()) and bool(str(settings.get("ssl_keyfile") or "").strip())
+    env["WRAPPER_BACKEND_SSL"] = "1" if ssl else "0"
+    # Backend settings that shape results (result cache key)
+    env["WRAPPER_MODEL"] = str(settings.get("model") or "").strip()
+    env["WRAPPER_ASR_BACKEND"] = str(settings.get("backend") or "").strip()
+    env["WRAPPER_LANGUAGE"] = str(settings.get("language") or "").strip()
+    env["WRAPPER_TASK"] = str(settings.get("task") or "").strip()
+    env["WRAPPER_DIARIZATION"] = "1" if diarization else "0"
+    # Launch settings for backends the API starts for other models (model routing)
+    env["WRAPPER_BACKEND_SETTINGS"] = json.dumps(
+        {key: settings[key] for key in DEFAULT_SETTINGS if key in settings and key not in _API_ONLY_KEYS}
+    )
+    return env
+
+
+def api_command(host: str, port: str) -> list[str]:
+    return [
+        sys.executable,
+        "-u",
+        "-m",
+        "uvicorn",
+        "wrapper.api.server:app",
+        "--host",
+        str(host),
+        "--port",
+        str(port),
+    ]
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import json
 import os
 import shutil
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 from . import model_manager
 
@@ -203,3 +204,47 @@ def run(env: dict[str, str]) -> None:
     ensure_pyannote_models()
     materialize_speechbrain_files(env)
     align_pyannote_cache_env(env)
+
+
+def _state(env: dict[str, str]) -> dict:
+    """Inputs and outcome of the preflight steps, cheap to recompute."""
+    sb_dir = _pyannote_cache_root(env) / "speechbrain"
+    return {
+        "hf_cache": str(model_manager.HF_CACHE_DIR),
+        "torch_home": env.get("TORCH_HOME", ""),
+        "pyannote_cache": env.get("PYANNOTE_CACHE", ""),
+        "pyannote_snapshot": _has_pyannote_snapshot(),
+        "speechbrain_files": all(
+            (sb_dir / name).is_file() and not (sb_dir / name).is_symlink() for name in _SPEECHBRAIN_FILES
+        ),
+    }
+
+
+def run_cached(env: dict[str, str], stamp: Optional[Path] = None) -> bool:
+    """``run`` unless the caches still look as the last full run left them.
+
+    The model download checks in ``run`` can take seconds (or a network
+    timeout) on every start; restarts reuse the result recorded in
+    ``stamp`` (default ``<cache root>/preflight.json``) as long as the cache
+    paths, pyannote snapshot and SpeechBrain files are unchanged. An
+    incomplete result (e.g. pyannote download refused before a Hugging Face
+    login) is never reused, so later starts retry as ``run`` always did.
+    Returns True when the previous result was reused.
+    """
+    if stamp is None:
+        stamp = Path(os.environ.get("WRAPPER_CACHE_DIR") or model_manager.HF_CACHE_DIR.parent) / "preflight.json"
+    configure_env_for_caches(env)
+    align_pyannote_cache_env(env)
+    try:
+        previous = json.loads(stamp.read_text(encoding="utf-8"))
+    except Exception:
+        previous = None
+    state = _state(env)
+    if previous == state and state["pyannote_snapshot"] and state["speechbrain_files"]:
+        return True
+    run(env)
+    try:
+        stamp.write_text(json.dumps(_state(env)), encoding="utf-8")
+    except Exception:
+        pass
+    return False
@@ -0,0 +1,272 @@
+"""Run the backend and API processes without the GUI and keep them up.
+
+A child that exits while the supervisor is running is restarted after an
+exponential backoff (``backoff_initial`` doubling up to ``backoff_max``);
+the backoff resets once a child has stayed up for ``stable_sec``. A child
+is ready when its ``ready_url`` answers 200 (the API's ``/readyz``, i.e.
+backend reachable and warmed), or without one when its port accepts TCP
+connections. Startup time (to every child ready) and crash recovery time
+(exit to ready again) are logged.
+
+SIGINT/SIGTERM are forwarded to the children, which get ``stop_timeout``
+seconds to exit before they are killed. SIGHUP is a rolling restart: the
+specs are rebuilt with ``reload`` (e.g. a changed model in settings.json)
+and the children restart one at a time in spec order, each waiting for the
+previous one to be ready, so with a warm standby backend the API keeps
+serving throughout. On POSIX the children run in their own session so a
+terminal Ctrl-C reaches them only through the supervisor.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+def log(message: str) -> None:
+    print(f"[wrapper.serve] {message}", file=sys.stderr, flush=True)
+
+
+@dataclass
+class ChildSpec:
+    name: str
+    cmd: list[str]
+    env: dict[str, str]
+    host: str
+    port: int
+    ready_url: Optional[str] = None
+
+
+class Child:
+    def __init__(self, spec: ChildSpec, backoff: float) -> None:
+        self.spec = spec
+        self.proc: Optional[subprocess.Popen] = None
+        self.started_at = 0.0
+        self.ready = False
+        self.restarts = 0
+        self.backoff = backoff
+        # Exit time of the crash being recovered from (recovery time is logged on ready)
+        self.crashed_at: Optional[float] = None
+        self.start_due: Optional[float] = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+
+def _port_open(host: str, port: int, timeout: float = 0.2) -> bool:
+    # A wildcard bind address is reachable on loopback
+    if host in ("0.0.0.0", "::", ""):
+        host = "127.0.0.1"
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def _url_ok(url: str, timeout: float = 0.5) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            return resp.status == 200
+    except Exception:
+        return False
+
+
+def _is_ready(spec: ChildSpec) -> bool:
+    if spec.ready_url:
+        return _url_ok(spec.ready_url)
+    return _port_open(spec.host, spec.port)
+
+
+class Supervisor:
+    def __init__(
+        self,
+        specs: list[ChildSpec],
+        *,
+        backoff_initial: float = 1.0,
+        backoff_max: float = 60.0,
+        stable_sec: float = 60.0,
+        stop_timeout: float = 10.0,
+        poll_sec: float = 0.2,
+        reload: Optional[Callable[[], list[ChildSpec]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.backoff_initial = backoff_initial
+        self.backoff_max = max(backoff_initial, backoff_max)
+        self.stable_sec = stable_sec
+        self.stop_timeout = stop_timeout
+        self.poll_sec = poll_sec
+        self._reload = reload
+        self._clock = clock
+        self.children = [Child(spec, backoff_initial) for spec in specs]
+        self._signal: Optional[int] = None
+        self._restart_all = False
+        # Rolling restart: children still to restart, the one being restarted
+        self._rolling: list[Child] = []
+        self._rolling_child: Optional[Child] = None
+        self._rolling_started = 0.0
+        self._started_at = 0.0
+        self._all_ready_logged = False
+
+    # -- signals --
+    def _on_signal(self, signum: int, _frame) -> None:
+        if signum == getattr(signal, "SIGHUP", None):
+            self._restart_all = True
+        else:
+            self._signal = signum
+
+    def _install_signal_handlers(self) -> None:
+        for name in ("SIGINT", "SIGTERM", "SIGHUP"):
+            signum = getattr(signal, name, None)
+            if signum is not None:
+                signal.signal(signum, self._on_signal)
+
+    # -- children --
+    def _start(self, child: Child) -> None:
+        spec = child.spec
+        try:
+            child.proc = subprocess.Popen(
+                spec.cmd,
+                env=spec.env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                start_new_session=os.name == "posix",
+            )
+        except OSError as exc:
+            log(f"{spec.name}: failed to start: {exc}")
+            self._schedule_restart(child)
+            return
+        child.started_at = self._clock()
+        child.ready = False
+        child.start_due = None
+        threading.Thread(target=self._pump, args=(spec.name, child.proc), daemon=True).start()
+        log(f"{spec.name}: started pid {child.proc.pid}")
+
+    @staticmethod
+    def _pump(name: str, proc: subprocess.Popen) -> None:
+        stream = proc.stdout
+        if stream is None:
+            return
+        for line in stream:
+            sys.stdout.write(f"[{name}] {line}")
+            sys.stdout.flush()
+
+    def _schedule_restart(self, child: Child) -> None:
+        child.start_due = self._clock() + child.backoff
+        log(f"{child.spec.name}: restarting in {child.backoff:.1f}s (restart #{child.restarts + 1})")
+        child.backoff = min(self.backoff_max, child.backoff * 2)
+
+    def _check(self, child: Child) -> None:
+        now = self._clock()
+        if child.proc is None:
+            if child.start_due is not None and now >= child.start_due:
+                if child.crashed_at is not None:
+                    child.restarts += 1
+                self._start(child)
+            return
+        code = child.proc.poll()
+        if code is not None:
+            log(f"{child.spec.name}: exited with code {code} after {now - child.started_at:.1f}s")
+            child.proc = None
+            child.ready = False
+            if child.crashed_at is None:
+                child.crashed_at = now
+            self._schedule_restart(child)
+            return
+        if not child.ready and _is_ready(child.spec):
+            child.ready = True
+            if child.crashed_at is not None:
+                log(
+                    f"{child.spec.name}: recovered in {now - child.crashed_at:.1f}s after crash "
+                    f"(ready {now - child.started_at:.1f}s after restart #{child.restarts})"
+                )
+                child.crashed_at = None
+            else:
+                log(f"{child.spec.name}: ready in {now - child.started_at:.1f}s on {child.spec.host}:{child.spec.port}")
+            if not self._all_ready_logged and all(c.ready for c in self.children):
+                self._all_ready_logged = True
+                log(f"startup complete: all processes ready {now - self._started_at:.1f}s after launch")
+        if child.ready and child.backoff != self.backoff_initial and now - child.started_at >= self.stable_sec:
+            child.backoff = self.backoff_initial
+
+    def _terminate(self, signum: int, children: Optional[list[Child]] = None) -> None:
+        live = [c for c in (self.children if children is None else children) if c.running]
+        for child in live:
+            try:
+                child.proc.send_signal(signum)
+            except ValueError:
+                child.proc.terminate()  # Windows only delivers SIGTERM this way
+            except OSError:
+                pass
+        deadline = self._clock() + self.stop_timeout
+        for child in live:
+            try:
+                child.proc.wait(timeout=max(0.0, deadline - self._clock()))
+            except subprocess.TimeoutExpired:
+                log(f"{child.spec.name}: did not exit within {self.stop_timeout:g}s; killing")
+                child.proc.kill()
+                child.proc.wait()
+
+    def _begin_rolling_restart(self) -> None:
+        if self._reload is not None:
+            try:
+                specs = {spec.name: spec for spec in self._reload()}
+            except Exception as exc:
+                log(f"SIGHUP: reload failed, keeping the current configuration: {exc}")
+            else:
+                for child in self.children:
+                    child.spec = specs.pop(child.spec.name, child.spec)
+                if specs:
+                    log(f"SIGHUP: new processes ({', '.join(specs)}) need a full restart; ignored")
+        log("SIGHUP: rolling restart of " + ", ".join(c.spec.name for c in self.children))
+        self._rolling = list(self.children)
+        self._rolling_child = None
+        self._rolling_started = self._clock()
+
+    def _roll(self) -> None:
+        current = self._rolling_child
+        if current is not None and not current.ready:
+            return
+        if not self._rolling:
+            if current is not None:
+                self._rolling_child = None
+                log(f"rolling restart complete in {self._clock() - self._rolling_started:.1f}s")
+            return
+        child = self._rolling_child = self._rolling.pop(0)
+        self._terminate(signal.SIGTERM, [child])
+        child.proc = None
+        child.ready = False
+        child.crashed_at = None
+        child.backoff = self.backoff_initial
+        self._start(child)
+
+    def run(self) -> int:
+        """Supervise until SIGINT/SIGTERM; returns the process exit code."""
+        self._install_signal_handlers()
+        self._started_at = self._clock()
+        for child in self.children:
+            self._start(child)
+        while self._signal is None:
+            if self._restart_all:
+                self._restart_all = False
+                self._begin_rolling_restart()
+            for child in self.children:
+                self._check(child)
+            if self._rolling or self._rolling_child is not None:
+                self._roll()
+            time.sleep(self.poll_sec)
+        signum = self._signal
+        log(f"received signal {signum}; stopping")
+        self._terminate(signum)
+        return 0
@@ -0,0 +1,17 @@
+import sys
+
+
+def main() -> None:
+    """``python -m wrapper.cli [serve ...]``: headless server, else the GUI."""
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        # Imported lazily so the headless path never loads tkinter
+        from wrapper.cli.serve import main as serve_main
+
+        raise SystemExit(serve_main(sys.argv[2:]))
+    from wrapper.cli.main import main as gui_main
+
+    gui_main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Headless server: backend + API under a supervisor, configured by settings.json.
+
+    python -m wrapper.cli serve --config settings.json
+
+Builds the same backend/API command lines as the GUI (``wrapper.app.launch``)
+without importing tkinter. Empty host/port settings fall back to
+``WRAPPER_BACKEND_HOST/PORT`` and ``WRAPPER_API_HOST/PORT``, then to
+127.0.0.1 and a free port.
+
+With ``standby_backend`` a second, warm backend runs on a free port and the
+API fails over to it (``WRAPPER_BACKEND_STANDBY_URLS``). SIGHUP re-reads the
+config and restarts standby, backend and API one at a time, so a model
+change is picked up without downtime while the standby serves. The API
+counts as ready once its ``/readyz`` passes (backend warmed).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shlex
+import time
+from pathlib import Path
+
+from wrapper.app import launch, preflight
+from wrapper.app.supervisor import ChildSpec, Supervisor, log
+
+
+def _resolve_addresses(settings: dict) -> None:
+    for key, env_name in (("backend_host", "WRAPPER_BACKEND_HOST"), ("api_host", "WRAPPER_API_HOST")):
+        settings[key] = str(settings.get(key) or os.getenv(env_name) or "127.0.0.1")
+    used: set[int] = set()
+    for key, env_name in (
+        ("backend_port", "WRAPPER_BACKEND_PORT"),
+        ("api_port", "WRAPPER_API_PORT"),
+        ("standby_port", "WRAPPER_STANDBY_PORT"),
+    ):
+        raw = str(settings.get(key) or os.getenv(env_name) or "")
+        port = int(raw) if raw else launch.find_free_port(exclude=used)
+        settings[key] = str(port)
+        used.add(port)
+
+
+def build_specs(settings: dict) -> list[ChildSpec]:
+    """Backend and API children for ``settings`` (preflight applied to their env)."""
+    token = launch.find_hf_token()
+    # As in the GUI, diarization needs a Hugging Face token
+    diarization = bool(settings.get("diarization")) and token is not None
+    if settings.get("diarization") and not diarization:
+        log("diarization is enabled in the settings but no Hugging Face token was found; disabled")
+    env = launch.base_env(settings, hf_token=token)
+    started = time.monotonic()
+    try:
+        reused = preflight.run_cached(env)
+    except Exception as exc:  # noqa: BLE001 - best effort, as in the GUI
+        log(f"preflight failed: {exc}")
+    else:
+        log(f"preflight {'reused' if reused else 'ran'} in {time.monotonic() - started:.2f}s")
+    specs: list[ChildSpec] = []
+    standby_port = None
+    if settings.get("standby_backend"):
+        standby_port = int(settings["standby_port"])
+        # Listed first so a rolling restart replaces it before the primary
+        specs.append(
+            ChildSpec(
+                "standby",
+                launch.backend_command(settings, diarization=diarization, port=standby_port),
+                env,
+                settings["backend_host"],
+                standby_port,
+            )
+        )
+    specs += [
+        ChildSpec(
+            "backend",
+            launch.backend_command(settings, diarization=diarization),
+            env,
+            settings["backend_host"],
+            int(settings["backend_port"]),
+        ),
+        ChildSpec(
+            "api",
+            launch.api_command(settings["api_host"], settings["api_port"]),
+            launch.api_env(env, settings, diarization=diarization, standby_port=standby_port),
+            settings["api_host"],
+            int(settings["api_port"]),
+            ready_url=f"http://{launch.connect_host(settings['api_host'])}:{settings['api_port']}/readyz",
+        ),
+    ]
+    return specs
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m wrapper.cli serve", description="Run backend and API without the GUI.")
+    ap.add_argument("--config", type=Path, required=True, help="settings.json (same format as the GUI's)")
+    ap.add_argument("--backoff-initial", type=float, default=1.0, help="first restart delay in seconds")
+    ap.add_argument("--backoff-max", type=float, default=60.0, help="restart delay cap in seconds")
+    ap.add_argument("--stable-sec", type=float, default=60.0, help="uptime after which the delay resets")
+    ap.add_argument("--stop-timeout", type=float, default=10.0, help="seconds to wait for children on shutdown")
+    ap.add_argument("--print-commands", action="store_true", help="print the commands and exit")
+    args = ap.parse_args(argv)
+
+    try:
+        settings = launch.load_settings(args.config)
+    except (OSError, ValueError) as exc:
+        ap.error(f"cannot read {args.config}: {exc}")
+    _resolve_addresses(settings)
+    specs = build_specs(settings)
+
+    def reload() -> list[ChildSpec]:
+        # Addresses stay as resolved at startup; everything else is re-read
+        fresh = launch.load_settings(args.config)
+        for key in ("backend_host", "backend_port", "api_host", "api_port", "standby_port"):
+            fresh[key] = settings[key]
+        return build_specs(fresh)
+
+    if args.print_commands:
+        for spec in specs:
+            print(f"{spec.name}: {shlex.join(spec.cmd)}")
+        return 0
+    return Supervisor(
+        specs,
+        backoff_initial=args.backoff_initial,
+        backoff_max=args.backoff_max,
+        stable_sec=args.stable_sec,
+        stop_timeout=args.stop_timeout,
+        reload=reload,
+    ).run()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Decode cost per audio minute for each ingestion path.
+
+Generates synthetic audio and times ``decode_to_pcm16`` on it: a 16 kHz mono
+16-bit WAV (passthrough), 44.1 kHz stereo 16-bit and 48 kHz stereo float WAVs
+(in-process downmix + resample), FLAC when ``soundfile`` is installed, and
+the FFmpeg pool on MP3-like input when ``ffmpeg`` is on PATH. Paths whose
+dependency is missing are reported as skipped.
+
+Usage:
+    python wrapper/scripts/benchmark_decode.py [--seconds 60] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import shutil
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import numpy as np
+
+from wrapper.api import decode
+
+
+def make_signal(seconds: float, rate: int, channels: int) -> np.ndarray:
+    """Speech-like test signal: a gliding tone with 1 s pauses, ``(frames, channels)``."""
+    t = np.arange(int(seconds * rate)) / rate
+    tone = 0.4 * np.sin(2 * np.pi * (200 + 100 * np.sin(t)) * t)
+    tone[(t.astype(int) % 3) == 2] = 0.0
+    return np.repeat(tone[:, None], channels, axis=1).astype(np.float32)
+
+
+def wav_bytes(samples: np.ndarray, rate: int, *, float32: bool = False) -> bytes:
+    channels = samples.shape[1]
+    if float32:
+        data, tag, bits = samples.astype("<f4").tobytes(), 3, 32
+    else:
+        data, tag, bits = (samples * 32767).astype("<i2").tobytes(), 1, 16
+    align = channels * bits // 8
+    fmt = struct.pack("<HHIIHH", tag, channels, rate, rate * align, align, bits)
+    body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt + b"data" + struct.pack("<I", len(data)) + data
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def flac_bytes(samples: np.ndarray, rate: int) -> Optional[bytes]:
+    if decode._soundfile is None:
+        return None
+    buf = io.BytesIO()
+    decode._soundfile.write(buf, samples, rate, format="FLAC")
+    return buf.getvalue()
+
+
+async def _ffmpeg_encode(data: bytes, *args: str) -> bytes:
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", "-i", "pipe:0", *args, "pipe:1",
+        stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+    )
+    out, _ = await proc.communicate(data)
+    return out
+
+
+def time_decode(data: bytes, filename: str, pool: Optional[decode.FFmpegPool], repeat: int) -> tuple[float, str]:
+    async def run() -> tuple[float, str]:
+        best = float("inf")
+        path = ""
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = await decode.decode_to_pcm16(data, filename, pool)
+            best = min(best, time.perf_counter() - started)
+            path = result.path
+        return best, path
+
+    return asyncio.run(run())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0, help="length of each test file")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case (best is reported)")
+    args = parser.parse_args()
+
+    minutes = args.seconds / 60.0
+    stereo44 = make_signal(args.seconds, 44100, 2)
+    cases: list[tuple[str, str, Callable[[], Optional[bytes]], bool]] = [
+        ("wav 16k mono s16", "a.wav", lambda: wav_bytes(make_signal(args.seconds, 16000, 1), 16000), False),
+        ("wav 44.1k stereo s16", "a.wav", lambda: wav_bytes(stereo44, 44100), False),
+        ("wav 48k stereo f32", "a.wav", lambda: wav_bytes(make_signal(args.seconds, 48000, 2), 48000, float32=True), False),
+        ("flac 44.1k stereo", "a.flac", lambda: flac_bytes(stereo44, 44100), False),
+    ]
+    have_ffmpeg = shutil.which("ffmpeg") is not None
+    if have_ffmpeg:
+        source = wav_bytes(stereo44, 44100)
+        cases.append((
+            "mp3 44.1k stereo (ffmpeg)",
+            "a.mp3",
+            lambda: asyncio.run(_ffmpeg_encode(source, "-f", "mp3", "-b:a", "128k")),
+            True,
+        ))
+
+    resampler = "scipy.resample_poly" if decode._resample_poly is not None else "numpy interp"
+    print(f"{args.seconds:.0f}s files, best of {args.repeat}, resampler: {resampler}")
+    print(f"{'case':<28} {'path':<12} {'ms/audio min':>13} {'x realtime':>11}")
+    for label, filename, build, uses_ffmpeg in cases:
+        data = build()
+        if data is None:
+            print(f"{label:<28} skipped (soundfile not installed)")
+            continue
+        pool = decode.FFmpegPool(1) if uses_ffmpeg else None
+        elapsed, path = time_decode(data, filename, pool, args.repeat)
+        print(f"{label:<28} {path:<12} {elapsed * 1000 / minutes:>13.1f} {args.seconds / elapsed:>10.0f}x")
+    if not have_ffmpeg:
+        print(f"{'mp3 (ffmpeg)':<28} skipped (ffmpeg not on PATH)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
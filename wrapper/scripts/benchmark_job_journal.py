@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Overhead of the durable job journal compared with in-memory async jobs.
+
+Replays the journal writes one async job causes (spool + insert on submit,
+result update + spool removal on completion) for ``--jobs`` uploads of
+``--audio-sec`` seconds of 16 kHz PCM, in a temporary directory, with the
+same in-memory ``JobStore`` bookkeeping as the baseline. Prints jobs per
+second for both and the added cost per job as a share of the backend
+processing time (``audio_sec * rtf``) that the journal runs beside.
+
+Usage:
+    python wrapper/scripts/benchmark_job_journal.py [--jobs 500] [--audio-sec 30]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from wrapper.api.job_journal import JobJournal
+from wrapper.api.jobs import COMPLETED, JobStore
+
+_LINES = [{"speaker": 1, "text": f"segment {i} " * 8, "beg": f"0:00:{i:02d}", "end": f"0:00:{i + 1:02d}"} for i in range(30)]
+
+
+def run(jobs: int, audio: bytes, journal: JobJournal | None) -> float:
+    store = JobStore(max_jobs=jobs + 1, ttl_sec=0)
+    started = time.perf_counter()
+    for i in range(jobs):
+        job = store.create(f"f{i}.wav", "json")
+        if journal is not None:
+            journal.add(job.id, job.filename, "json", {"priority": 0, "client": "bench"}, job.created_at, audio)
+        job.texts, job.lines = [line["text"] for line in _LINES], _LINES
+        store.mark_finished(job, COMPLETED)
+        if journal is not None:
+            journal.finish(
+                job.id,
+                COMPLETED,
+                finished_at=job.finished_at or 0.0,
+                duration_sec=len(audio) / 32000,
+                result={"texts": job.texts, "lines": job.lines, "headers": None},
+            )
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--audio-sec", type=float, default=30.0, help="length of each upload (16 kHz PCM16)")
+    parser.add_argument("--rtf", type=float, default=0.3, help="backend processing seconds per audio second")
+    args = parser.parse_args()
+
+    audio = os.urandom(int(args.audio_sec * 32000))
+    memory = run(args.jobs, audio, None)
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = JobJournal(Path(tmp))
+        try:
+            durable = run(args.jobs, audio, journal)
+        finally:
+            journal.close()
+    per_job_ms = (durable - memory) / args.jobs * 1000
+    processing_ms = args.audio_sec * args.rtf * 1000
+    print(f"{args.jobs} jobs of {args.audio_sec:.0f}s audio ({len(audio) / 1048576:.2f} MiB each)")
+    print(f"{'in-memory':<10} {args.jobs / memory:>10.0f} jobs/s")
+    print(f"{'durable':<10} {args.jobs / durable:>10.0f} jobs/s")
+    print(
+        f"journal overhead {per_job_ms:.2f} ms/job = {100 * per_job_ms / processing_ms:.3f}% of "
+        f"{processing_ms / 1000:.1f}s backend time (rtf={args.rtf})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Queue-wait simulation for the backend job scheduler policies.
+
+Replays the same synthetic arrival trace through ``JobScheduler`` with each
+policy using a simulated clock, so no backend is required. The workload mixes
+short clips, medium files and occasional hour-long recordings, and one
+"noisy" client submits a burst of long files. Prints p50/p99 queue wait
+overall, for short jobs and for clients other than the noisy one.
+
+Usage:
+    python wrapper/scripts/benchmark_scheduler.py [--jobs 2000] [--workers 2]
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from wrapper.api.scheduler import POLICIES, JobScheduler
+
+
+@dataclass
+class SimJob:
+    arrival: float
+    duration_sec: float
+    client: str
+    priority: int = 0
+    started: Optional[float] = None
+
+
+class SimClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_trace(n_jobs: int, workers: int, rtf: float, load: float, seed: int) -> list[SimJob]:
+    rng = random.Random(seed)
+    jobs: list[SimJob] = []
+    mix = [(0.80, 5.0, 20.0), (0.15, 60.0, 180.0), (0.05, 1800.0, 3600.0)]
+    noisy_batch, noisy_every, noisy_range = 5, 100, (600.0, 1800.0)
+    mean_audio = sum(p * (lo + hi) / 2 for p, lo, hi in mix)
+    mean_audio += noisy_batch / noisy_every * sum(noisy_range) / 2
+    mean_service = mean_audio * rtf
+    rate = load * workers / mean_service
+    t = 0.0
+    for i in range(n_jobs):
+        t += rng.expovariate(rate)
+        r = rng.random()
+        for p, lo, hi in mix:
+            if r < p:
+                duration = rng.uniform(lo, hi)
+                break
+            r -= p
+        client = f"client-{rng.randrange(8)}"
+        jobs.append(SimJob(arrival=t, duration_sec=duration, client=client))
+        # The noisy client dumps a batch of long files every ``noisy_every`` arrivals
+        if i % noisy_every == 0:
+            for _ in range(noisy_batch):
+                jobs.append(SimJob(arrival=t, duration_sec=rng.uniform(*noisy_range), client="noisy"))
+    return jobs
+
+
+def simulate(policy: str, trace: list[SimJob], workers: int, rtf: float) -> list[SimJob]:
+    clock = SimClock()
+    queue = JobScheduler(policy, clock=clock)
+    jobs = [SimJob(j.arrival, j.duration_sec, j.client) for j in trace]
+    # Event heap: (time, order, kind, job); kind 0 = worker frees up, 1 = arrival
+    events: list = [(j.arrival, i, 1, j) for i, j in enumerate(jobs)]
+    heapq.heapify(events)
+    order = len(events)
+    idle = workers
+    while events:
+        now, _o, kind, job = heapq.heappop(events)
+        clock.now = now
+        if kind == 1:
+            queue.put_nowait(job)
+        else:
+            idle += 1
+        while idle and not queue.empty():
+            nxt = queue.get_nowait()
+            nxt.started = now
+            idle -= 1
+            order += 1
+            heapq.heappush(events, (now + nxt.duration_sec * rtf, order, 0, None))
+    return jobs
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--rtf", type=float, default=0.3, help="processing seconds per audio second")
+    parser.add_argument("--load", type=float, default=0.85, help="target utilisation of the workers")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    trace = make_trace(args.jobs, args.workers, args.rtf, args.load, args.seed)
+    print(f"{len(trace)} jobs, {args.workers} workers, rtf={args.rtf}, load={args.load}")
+    print(f"{'policy':<6} {'p50':>9} {'p99':>9} {'short p50':>10} {'short p99':>10} {'others p99':>11}")
+    for policy in POLICIES:
+        done = simulate(policy, trace, args.workers, args.rtf)
+        waits = [j.started - j.arrival for j in done]
+        short = [j.started - j.arrival for j in done if j.duration_sec <= 30.0]
+        others = [j.started - j.arrival for j in done if j.client != "noisy"]
+        print(
+            f"{policy:<6} {percentile(waits, 50):>8.1f}s {percentile(waits, 99):>8.1f}s"
+            f" {percentile(short, 50):>9.1f}s {percentile(short, 99):>9.1f}s {percentile(others, 99):>10.1f}s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Cost of handling backend snapshots: plain dicts vs. reused segments.
+
+Builds the message trace of one live session (``--messages`` snapshots, a
+new line every ``--every`` messages, each message resending every line as the
+backend does), or reads a recorded one with ``--trace`` (one backend
+message per line), and processes it twice, the way the API receiver does:
+
+- ``dicts``: ``json.loads`` + a fresh cleaned dict per line per message, and
+  ``H:MM:SS`` parsed again wherever times are needed
+- ``segments``: ``wrapper.api.segments`` codec + ``SnapshotParser``, which
+  reuses unchanged lines and parses each time once
+
+Prints messages per second and peak traced memory for both.
+
+Usage:
+    python wrapper/scripts/benchmark_segments.py [--messages 3000] [--every 5]
+    python wrapper/scripts/benchmark_segments.py --trace session.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from wrapper.api import segments
+
+
+def _hms(sec: int) -> str:
+    return f"{sec // 3600}:{sec % 3600 // 60:02d}:{sec % 60:02d}"
+
+
+def build_trace(messages: int, every: int) -> list[str]:
+    trace = []
+    lines: list[dict] = []
+    for i in range(messages):
+        if i % every == 0:
+            n = len(lines)
+            lines.append({"speaker": 1 + n % 2, "text": f"line {n} " + "word " * 12, "beg": _hms(n * 4), "end": _hms(n * 4 + 3), "diff": None})
+        trace.append(json.dumps({"type": "transcript", "lines": lines, "buffer_transcription": "..."}))
+    return trace
+
+
+def _parse_legacy(value: str) -> float:
+    h, m, s = value.split(":")
+    return float(int(h) * 3600 + int(m) * 60 + int(s))
+
+
+def run_dicts(trace: list[str]) -> int:
+    seconds = 0
+    for message in trace:
+        data = json.loads(message)
+        snapshot = []
+        for item in data.get("lines") or []:
+            text = (item.get("text") or "").strip()
+            if not text or item.get("speaker") in (-2, 0):
+                continue
+            snapshot.append({"speaker": item.get("speaker"), "text": text, "beg": item.get("beg"), "end": item.get("end"), "diff": item.get("diff")})
+        # Consumers (SSE deltas, silence remap) read times on every snapshot
+        for item in snapshot:
+            seconds += _parse_legacy(item["end"]) - _parse_legacy(item["beg"])
+    return len(snapshot)
+
+
+def run_segments(trace: list[str]) -> int:
+    parser = segments.SnapshotParser()
+    seconds = 0.0
+    for message in trace:
+        data = segments.loads(message)
+        parsed = parser.parse(data.get("lines"))
+        if not parser.changed:
+            continue
+        snapshot = segments.as_dicts(parsed)
+        for seg in parsed:
+            seconds += seg.end_sec - seg.beg_sec
+    return len(snapshot)
+
+
+def measure(fn, trace: list[str]) -> tuple[float, int]:
+    fn(trace[:50])  # warm caches and imports
+    started = time.perf_counter()
+    fn(trace)
+    elapsed = time.perf_counter() - started
+    # Second pass under tracemalloc, which would distort the timing
+    tracemalloc.start()
+    fn(trace)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=3000)
+    parser.add_argument("--every", type=int, default=5, help="messages per new transcript line")
+    parser.add_argument("--trace", type=Path, help="recorded backend messages, one JSON message per line")
+    args = parser.parse_args()
+
+    if args.trace is not None:
+        trace = [line for line in args.trace.read_text(encoding="utf-8").splitlines() if line.strip()]
+    else:
+        trace = build_trace(args.messages, max(1, args.every))
+    size_mib = sum(len(m) for m in trace) / 1048576
+    print(f"{len(trace)} messages, {size_mib:.1f} MiB of JSON, codec={segments.JSON_CODEC}")
+    for name, fn in (("dicts", run_dicts), ("segments", run_segments)):
+        elapsed, peak = measure(fn, trace)
+        print(f"{name:<9} {len(trace) / elapsed:>10.0f} msg/s  peak {peak / 1048576:6.2f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
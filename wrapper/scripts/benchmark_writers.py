@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Time to first byte and peak memory of transcription response bodies.
+
+Formats a synthetic transcript of ``--segments`` lines (about 4 s each, so
+the default is a ~11 h recording) for each response format two ways:
+
+- ``joined``: the whole body built in memory first (what a non-streaming
+  response has to do before sending anything)
+- ``streamed``: ``wrapper.api.writers`` chunks, optionally gzip-encoded
+
+Prints the time until the first chunk is ready, the total time, and peak
+traced memory for both.
+
+Usage:
+    python wrapper/scripts/benchmark_writers.py [--segments 10000] [--gzip]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from wrapper.api import writers
+
+FORMATS = ("srt", "vtt", "verbose_json", "jsonl", "tsv")
+
+
+def _hms(sec: int) -> str:
+    return f"{sec // 3600}:{sec % 3600 // 60:02d}:{sec % 60:02d}"
+
+
+def build_lines(count: int) -> list[dict]:
+    return [
+        {"speaker": 1 + i % 3, "text": f"segment {i} " + "spoken words " * 6, "beg": _hms(i * 4), "end": _hms(i * 4 + 3), "diff": None}
+        for i in range(count)
+    ]
+
+
+def run(rf: str, texts: list[str], lines: list[dict], *, streamed: bool, encoding: str | None) -> tuple[float, float, int]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    chunks = writers.iter_response(rf, texts, lines)
+    if encoding is not None:
+        chunks = writers.encode(chunks, encoding)
+    first = None
+    if streamed:
+        for _chunk in chunks:
+            if first is None:
+                first = time.perf_counter() - started
+    else:
+        b"".join(chunks)  # peak memory still counts the whole body
+        first = time.perf_counter() - started
+    total = time.perf_counter() - started
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first or 0.0, total, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=10000)
+    parser.add_argument("--gzip", action="store_true", help="gzip-encode both bodies")
+    args = parser.parse_args()
+
+    lines = build_lines(args.segments)
+    texts = [line["text"].strip() for line in lines]
+    encoding = "gzip" if args.gzip else None
+    print(f"{args.segments} segments, encoding={encoding or 'identity'}")
+    print(f"{'format':<13}{'mode':<10}{'first ms':>10}{'total ms':>10}{'peak MiB':>10}")
+    for rf in FORMATS:
+        for mode in ("joined", "streamed"):
+            first, total, peak = run(rf, texts, lines, streamed=mode == "streamed", encoding=encoding)
+            print(f"{rf:<13}{mode:<10}{first * 1000:>10.1f}{total * 1000:>10.1f}{peak / 1048576:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())